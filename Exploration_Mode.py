@@ -1,14 +1,21 @@
 import pygame
 import sys
 import math
-import requests
-import io
-import time
-import os
-
-# --- Constants ---
-DENSITIES = {"Iron": 7800, "Rock": 3000, "Ice": 900}
-TNT_EQUIVALENT = 4.184e9
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Physics lives in impact_model (NumPy batch engine), shared with the batch tools
+from impact_model import assess_risks, simulate_impacts
+import assets
+from ensemble import run_ensemble
+from fixed_step import SIM_HZ, FixedTimestep, lerp
+from frame_profiler import FrameProfiler
+from impact_grid import load_impact_grid
+from particles import ParticleSystem, burst_size
+from result_cache import LRUCache, quantize
+from sprite_cache import RotationCache, SpriteAtlas
+from text_cache import TextCache, wrap_text
 
 
 # --- Color Palette & Theme (MODIFIED for Lighter Gray/New Purple Controls) ---
@@ -28,7 +35,7 @@ RED_EXP = (200, 40, 0)
 # --- Pygame Setup & Dimensions ---
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 800
-FPS = 60
+FPS = 60 # Drawing rate; the animation runs in fixed ticks (fixed_step.SIM_HZ)
 MARGIN = 20
 # Input panel remains at 280
 INPUT_PANEL_WIDTH = 280 
@@ -43,75 +50,108 @@ IMPACTED = 2
 # Graphics constants
 EARTH_SIZE = 350
 ASTEROID_BASE_SIZE = 70
-ASTEROID_SPEED = 8
-EXPLOSION_DURATION = 0.5
-
-# --- Backend calculations (Unchanged) ---
-def calculate_mass(diameter, material):
-    radius = diameter / 2
-    volume = (4/3) * math.pi * (radius**3)
-    density = DENSITIES.get(material, 3000)
-    return volume * density
-
-def impact_energy(diameter, velocity, material):
-    mass = calculate_mass(diameter, material)
-    velocity_m_s = velocity * 1000
-    energy_joules = 0.5 * mass * (velocity_m_s**2)
-    return energy_joules / TNT_EQUIVALENT
-
-def estimate_crater_size(diameter, velocity, angle, material, location):
-    energy = impact_energy(diameter, velocity, material)
-    angle_factor = math.sin(math.radians(angle))
-    effective_energy = energy * angle_factor
-    crater_diameter = (effective_energy ** (1/4)) * 1.2 if location == "Land" else 0
-    return crater_diameter, effective_energy
-
-def assess_risks(diameter, velocity, angle, material, location):
-    energy = impact_energy(diameter, velocity, material)
-    risks = []
-    if energy > 5000:
-        risks.append("Potential global climate impact - The impact could throw dust and smoke into the sky, blocking sunlight for months. This might cause food shortages and big changes to the world’s climate.")
-    if energy > 1000:
-        risks.append("Massive fires & regional shockwaves - The heat and force from the strike could set huge areas on fire. Strong shockwaves could knock down buildings and flatten forests.")
-    if location == "Ocean" and diameter > 100:
-        risks.append("Tsunami risk - If it lands in the sea, giant waves could form and travel far. These tsunamis could flood coastal cities and cause massive destruction.")
-    if location == "Land":
-        if angle < 20:
-            risks.append("Shallow impact - A low-angle hit would scatter rock and debris across the land. This could damage towns nearby and fill the air with dust.")
-        if angle > 70 and energy > 50:
-            risks.append("High-angle - A steep impact would shake the ground like a huge earthquake. Buildings and roads could be destroyed even far from the strike.")
-    if not risks:
-        risks.append("Localized impact - The asteroid would cause only small, local effects. Most of the world would not be affected.")
-    return risks
+ASTEROID_SPEED = 8         # pixels per tick
+EXPLOSION_DURATION = 0.5   # simulated seconds the longest-lived sparks last
+EARTH_SPIN = 0.2           # degrees per tick
+
+# Rotating Earth is drawn from pre-rendered, pre-masked frames
+EARTH_ROTATION_STEP = 0.2    # degrees between frames
+EARTH_CACHE_BYTES = 160 * 1024 ** 2
+# The asteroid turns 0.4 degrees per tick; its frames are 1 degree apart
+ASTEROID_ROTATIONS = 360
+
+# Live results while dragging sliders (interpolated from a precomputed grid
+# cached under assets/cache; Apply still runs the exact model)
+LIVE_PREVIEW = True
+
+# Fly the asteroid through the atmosphere before the crater estimate, so
+# small or weak bodies can airburst instead of reaching the ground
+ATMOSPHERIC_ENTRY = True
+
+# Scenario result cache (results + wrapped risk text), keyed per slider pixel
+RESULT_CACHE_SIZE = 512
+
+# Rendered text surfaces and wrapped layouts (LRU, bounded in bytes)
+TEXT_CACHE_BYTES = 16 * 1024 ** 2
+TEXT_CACHE = TextCache(max_bytes=TEXT_CACHE_BYTES)
+
+# Uncertainty ensemble (press E after Apply)
+ENSEMBLE_SAMPLES = 1_000_000
+ENSEMBLE_BAND = (5, 95)
+# Small chunks, so a cancelled run stops soon
+ENSEMBLE_CHUNK_SIZE = 100_000
+# This process runs pygame and threads: start the workers fresh, never fork
+ENSEMBLE_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# Where each frame's time goes (F3 shows it, F4 saves it; see frame_profiler)
+PROFILER = FrameProfiler("exploration", ("events", "update", "explosions", "text", "earth", "asteroid",
+                                         "profiler", "display", "wait"), fps=FPS)
+
+# --- Backend calculations ---
+def build_results(impact, inputs):
+    """results_data for the UI from one simulate_impacts()/grid result."""
+    d, v, a, m, l = inputs
+    # Energy released at the ground, or in the air for an airburst
+    airburst_energy = float(impact.get("airburst_energy", 0.0))
+    return {
+        "energy": float(impact["effective_energy"]) + airburst_energy,
+        "mass": float(impact["mass"]),
+        "crater": float(impact["crater"]),
+        "airburst_altitude": float(impact.get("airburst_altitude", 0.0)),
+        "location": l,
+        "risks": assess_risks(d, v, a, m, l, energy=float(impact["energy"])),
+        "inputs": inputs
+    }
+
+def get_scenario_results(cache, sliders, material, location, font, text_width, impact_grid=None):
+    """Cached results_data for the current inputs.
+
+    Keys are the slider positions quantized to one pixel plus material and
+    location. With impact_grid the interpolated preview is used on a miss;
+    without it the exact model runs and replaces any cached preview.
+    Entries also hold the wrapped risk-text lines for font/text_width.
+    """
+    key = tuple(quantize(s.value, s.min_val, s.resolution) for s in sliders) + (material, location)
+    exact = impact_grid is None
+    cached = cache.get(key)
+    if cached is not None and (cached["exact"] or not exact):
+        return cached
+
+    inputs = tuple(s.value for s in sliders) + (material, location)
+    impact = simulate_impacts(*inputs, entry=ATMOSPHERIC_ENTRY) if exact else impact_grid.lookup(*inputs)
+    results = build_results(impact, inputs)
+    results["exact"] = exact
+    results["risk_lines"] = [wrap_text(risk, font, text_width) for risk in results["risks"]]
+    cache.put(key, results)
+    return results
 
 # --- Pygame UI Helper Functions & Classes (Unchanged) ---
-def draw_text(surface, text, font, color, rect, aa=True, bkg=None):
+def draw_text_lines(surface, lines, font, color, rect, aa=True, bkg=None):
+    """Draw pre-wrapped lines top-down; returns how many fit inside rect."""
     y = rect.top
     line_spacing = -2
     font_height = font.size("Tg")[1]
-    
-    while text:
-        i = 1
+
+    for count, line in enumerate(lines):
         if y + font_height > rect.bottom:
-            break
-        while font.size(text[:i])[0] < rect.width and i < len(text):
-            i += 1
-        if i < len(text):
-            i = text.rfind(" ", 0, i) + 1
+            return count
         if bkg:
-            image = font.render(text[:i], 1, color, bkg)
-            image.set_colorkey(bkg)
+            image = TEXT_CACHE.render(font, line, color, 1, bkg)
         else:
-            image = font.render(text[:i], aa, color)
+            image = TEXT_CACHE.render(font, line, color, aa)
         surface.blit(image, (rect.left, y))
         y += font_height + line_spacing
-        text = text[i:]
-    return text
+    return len(lines)
+
+def draw_text(surface, text, font, color, rect, aa=True, bkg=None):
+    lines = TEXT_CACHE.wrap(font, text, rect.width)
+    drawn = draw_text_lines(surface, lines, font, color, rect, aa, bkg)
+    return "".join(lines[drawn:])
 
 def draw_shadowed_text(surface, text, font, color, position, shadow_color, shadow_offset=(1, 1)):
-    text_surf = font.render(text, True, shadow_color)
+    text_surf = TEXT_CACHE.render(font, text, shadow_color)
     surface.blit(text_surf, (position[0] + shadow_offset[0], position[1] + shadow_offset[1]))
-    text_surf = font.render(text, True, color)
+    text_surf = TEXT_CACHE.render(font, text, color)
     surface.blit(text_surf, position)
     
 # NEW HELPER FUNCTION FOR DRAWING RESULT BOXES
@@ -142,6 +182,11 @@ class Slider:
         self.handle_rad = h
         self.update_handle_pos()
 
+    @property
+    def resolution(self):
+        """Value change per pixel of slider travel."""
+        return (self.max_val - self.min_val) / self.rect.w
+
     def update_handle_pos(self):
         self.handle_pos = self.rect.x + (self.val - self.min_val) / (self.max_val - self.min_val) * self.rect.w
 
@@ -168,7 +213,7 @@ class Slider:
         pygame.draw.circle(surface, pygame.Color(PALE_CYAN_ACCENT_COLOR), (self.handle_pos, self.rect.centery), self.handle_rad // 2, 1)
         draw_shadowed_text(surface, self.label, font_label, pygame.Color(PALE_CYAN_ACCENT_COLOR), (self.rect.x, self.rect.y - 25), (0,0,0))
         val_text = f"{self.val:.0f}"
-        val_surf = font_val.render(val_text, True, pygame.Color(LIGHTER_CYAN_COLOR))
+        val_surf = TEXT_CACHE.render(font_val, val_text, pygame.Color(LIGHTER_CYAN_COLOR))
         surface.blit(val_surf, (self.rect.right - val_surf.get_width(), self.rect.y - 25))
 
 class Dropdown:
@@ -215,7 +260,7 @@ class Dropdown:
         draw_shadowed_text(surface, self.label, font_label, pygame.Color(PALE_CYAN_ACCENT_COLOR), (self.rect.x, self.rect.y - 25), (0,0,0))
         color = pygame.Color(LIGHTER_CYAN_COLOR)
         pygame.draw.rect(surface, color, self.rect, border_radius=5)
-        text_surf = self.font.render(self.selected_val, True, DEEP_BLUE_BACKGROUND_RGB)
+        text_surf = TEXT_CACHE.render(self.font, self.selected_val, DEEP_BLUE_BACKGROUND_RGB)
         surface.blit(text_surf, (self.rect.x + 10, self.rect.centery - text_surf.get_height() // 2))
         arrow_points = [
             (self.rect.right - 15, self.rect.centery - 5),
@@ -239,7 +284,7 @@ class Dropdown:
             
             pygame.draw.rect(surface, bg_color, option_rect)
             pygame.draw.rect(surface, PALE_CYAN_ACCENT_COLOR, option_rect, 1)
-            opt_surf = self.font.render(option, True, text_color)
+            opt_surf = TEXT_CACHE.render(self.font, option, pygame.Color(text_color))
             surface.blit(opt_surf, (option_rect.x + 10, option_rect.centery - opt_surf.get_height() // 2))
 
 class Button:
@@ -261,66 +306,25 @@ class Button:
         shadow_rect = self.rect.inflate(10, 10)
         pygame.draw.rect(surface, shadow_color, shadow_rect, border_radius=12)
         pygame.draw.rect(surface, color, self.rect, border_radius=8)
-        text_surf = font.render(self.text, True, DEEP_BLUE_BACKGROUND_RGB)
+        text_surf = TEXT_CACHE.render(font, self.text, DEEP_BLUE_BACKGROUND_RGB)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
 
 
-# --- Image Loading and Setup (FIXED to load all images locally) ---
-# ... (rest of the code remains the same until load_images)
-
-# --- Image Loading and Setup (MODIFIED to use Relative Paths) ---
+# --- Image Loading and Setup (scaled copies are cached by assets) ---
 def load_images():
-    # Base directory where your script is located
-    BASE_DIR = os.path.dirname(__file__)
-    # Join paths relative to your project folder
     images = {}
-    
-    # Paths for all images are now relative to the script's location
-    # NOTE: You must place these files in the same directory as the Python script.
-    
-    # 1. Background Image
-    # Assuming 'ai-generated-purple-galaxy-space-stars-in-outer-space-ai-generated-free-photo.jpg' 
-    # is directly inside Meteor_Madness folder
-    BG_PATH =os.path.join(BASE_DIR, "assets", "images", "Background.jpg")
-    
-    # 2. Earth Image
-    # Assuming 'download.png' is directly inside Meteor_Madness folder
-    EARTH_PATH =os.path.join(BASE_DIR, "assets", "images", "Earth2.png") 
-    
-    # 3. Asteroid Image
-    # Assuming '454791-Picsart-BackgroundRemover.jpg' is directly inside Meteor_Madness folder
-    ASTEROID_PATH =os.path.join(BASE_DIR, "assets", "images", "Asteroid.jpg") 
-    # 4. Font Files (Assumed to be in the same folder)
-    FONT_FILE = "Orbitron-Regular.ttf"
-    FONT_TITLE_FILE = "Orbitron-Bold.ttf"
-    
-    # 1. Background - Try local load
+
+    # 1. Background
     try:
-        bg_img = pygame.image.load(BG_PATH).convert()
-        images['background'] = pygame.transform.scale(bg_img, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        print(f"Successfully loaded background from relative path: {BG_PATH}")
-        
+        images['background'] = assets.image("Background.jpg", (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False)
     except (pygame.error, FileNotFoundError) as e:
         print(f"Error loading background image: {e}")
         images['background'] = None
-        
-    # 2. Earth image (Load, scale and center onto a fixed square surface)
+
+    # 2. Earth image, scaled to a fixed square (stable under rotation)
     try:
-        earth_img = pygame.image.load(EARTH_PATH).convert_alpha()
-        
-        # Create a stable square surface for rotation
-        final_square_surface = pygame.Surface((EARTH_SIZE, EARTH_SIZE), pygame.SRCALPHA)
-        
-        # Scale the loaded image to fit the fixed square size
-        scaled_earth_img = pygame.transform.scale(earth_img, (EARTH_SIZE, EARTH_SIZE))
-        
-        # Blit the scaled image onto the fixed square surface
-        final_square_surface.blit(scaled_earth_img, (0, 0))
-        
-        images['earth'] = final_square_surface # Store the stable, square image
-        print(f"Successfully loaded Earth image from relative path: {EARTH_PATH}")
-        
+        images['earth'] = assets.image("Earth2.png", (EARTH_SIZE, EARTH_SIZE))
     except (pygame.error, FileNotFoundError) as e:
         print(f"Error loading Earth image: {e}. Using fallback circle.")
         images['earth'] = pygame.Surface((EARTH_SIZE, EARTH_SIZE), pygame.SRCALPHA)
@@ -328,9 +332,7 @@ def load_images():
 
     # 3. Asteroid image
     try:
-        asteroid_img = pygame.image.load(ASTEROID_PATH).convert_alpha()
-        images['asteroid'] = pygame.transform.scale(asteroid_img, (ASTEROID_BASE_SIZE, ASTEROID_BASE_SIZE))
-        print(f"Successfully loaded asteroid image from relative path: {ASTEROID_PATH}")
+        images['asteroid'] = assets.image("Asteroid.jpg", (ASTEROID_BASE_SIZE, ASTEROID_BASE_SIZE))
     except (pygame.error, FileNotFoundError) as e:
         print(f"Error loading asteroid image: {e}. Using fallback circle.")
         images['asteroid'] = pygame.Surface((ASTEROID_BASE_SIZE, ASTEROID_BASE_SIZE), pygame.SRCALPHA)
@@ -346,60 +348,17 @@ def main():
     clock = pygame.time.Clock()
 
     images = load_images()
-    BASE_DIR = os.path.dirname(__file__)
-
-    # --- Fonts (MODIFIED: Font loading also uses relative paths) ---
-    FONT_FILE = os.path.join(BASE_DIR, "assets", "fonts", "Orbitron-Regular.ttf")  
-    FONT_TITLE_FILE =os.path.join(BASE_DIR, "assets", "fonts", "Orbitron-Bold.ttf")
-    
-    try:
-        # Attempt to load fonts using relative paths (files expected in Meteor_Madness folder)
-        font_prominent_result = pygame.font.Font(FONT_TITLE_FILE, 28)
-        font_prominent_result_small = pygame.font.Font(FONT_TITLE_FILE, 22) 
-        font_title = pygame.font.Font(FONT_TITLE_FILE, 53) 
-    except pygame.error:
-        try:
-            # Fallback for font files (using Regular if Bold fails)
-            font_prominent_result = pygame.font.Font(FONT_FILE, 28)
-            font_prominent_result_small = pygame.font.Font(FONT_FILE, 22) 
-            font_title = pygame.font.Font(FONT_FILE, 53)
-        except pygame.error:
-            # Final fallback to Pygame default
-            font_prominent_result = pygame.font.Font(None, 28)
-            font_prominent_result_small = pygame.font.Font(None, 22)
-            font_title = pygame.font.Font(None, 53)
-            print("Warning: Could not load custom fonts. Falling back to default Pygame font.")
-
-
-        
-    try:
-        # Load body fonts
-        font_header = pygame.font.Font(FONT_TITLE_FILE, 20) 
-        font_label = pygame.font.Font(FONT_FILE, 18)
-        font_body = pygame.font.Font(FONT_FILE, 14)
-    except pygame.error:
-        font_header = pygame.font.Font(None, 20) 
-        font_label = pygame.font.Font(None, 18)
-        font_body = pygame.font.Font(None, 14)
-        print("Warning: Could not load body fonts. Falling back to default Pygame font.")
-        
-# ... (rest of the main function remains the same)
-
-
-        
-    try:
-        font_header = pygame.font.Font(FONT_TITLE_FILE, 20) 
-        font_label = pygame.font.Font(FONT_FILE, 18)
-        # MODIFIED: Increased font_body size from 12 to 14 for better risk text readability
-        font_body = pygame.font.Font(FONT_FILE, 14)
-    except pygame.error:
-        font_header = pygame.font.Font(None, 20) 
-        font_label = pygame.font.Font(None, 18)
-        font_body = pygame.font.Font(None, 14)
-        print("Warning: Could not load body fonts. Falling back to default Pygame font.")
 
+    # --- Fonts (Bold for titles and headers; assets falls back to Regular, then the default font) ---
+    FONT_FILE = "Orbitron-Regular.ttf"
+    FONT_TITLE_FILE = "Orbitron-Bold.ttf"
+    font_prominent_result = assets.font(FONT_TITLE_FILE, 28)
+    font_prominent_result_small = assets.font(FONT_TITLE_FILE, 22)
+    font_title = assets.font(FONT_TITLE_FILE, 53)
+    font_header = assets.font(FONT_TITLE_FILE, 20)
+    font_label = assets.font(FONT_FILE, 18)
+    font_body = assets.font(FONT_FILE, 14)
 
-            
     # --- UI Elements Positioning ---
     
     # 1. INPUT PANEL (Left Sidebar)
@@ -457,6 +416,10 @@ def main():
     MAJOR_RISKS_HEIGHT = SCREEN_HEIGHT - MAJOR_RISKS_Y - MARGIN 
     RISKS_RECT = pygame.Rect(MAJOR_RISKS_X, MAJOR_RISKS_Y, MAJOR_RISKS_WIDTH, MAJOR_RISKS_HEIGHT)
 
+    # Boxes 1 & 2 use the current RESULTS_LEFT_PANEL_WIDTH = 370
+    ENERGY_RECT = pygame.Rect(RESULTS_LEFT_PANEL_X_START, RESULTS_LEFT_PANEL_Y_START, RESULTS_LEFT_PANEL_WIDTH, SMALL_BOX_H)
+    CRATER_RECT = pygame.Rect(RESULTS_LEFT_PANEL_X_START, RESULTS_LEFT_PANEL_Y_START + SMALL_BOX_H + MARGIN, RESULTS_LEFT_PANEL_WIDTH, SMALL_BOX_H)
+
 
     # --- Game State ---
     running = True
@@ -465,27 +428,229 @@ def main():
     # Asteroid/Animation state
     animation_state = PRE_IMPACT
     asteroid_pos = pygame.Vector2(0, 0)
+    asteroid_prev = pygame.Vector2(0, 0) # Position at the previous tick (drawing interpolates)
     target_pos = pygame.Vector2(0, 0)
     velocity_vec = pygame.Vector2(0, 0)
     
     # Rotation and Explosion variables
     earth_angle = 0.0
-    explosion_start_time = 0
+    particles = ParticleSystem(colors=(RED_EXP, ORANGE_EXP, YELLOW_EXP))
+    sim = FixedTimestep()
     
     # Pre-render a circular mask surface for efficiency
     EARTH_RADIUS = EARTH_SIZE // 2
     circle_mask = pygame.Surface((EARTH_SIZE, EARTH_SIZE), pygame.SRCALPHA)
     # The mask is a white circle on a transparent background
     pygame.draw.circle(circle_mask, (255, 255, 255, 255), (EARTH_RADIUS, EARTH_RADIUS), EARTH_RADIUS)
+    earth_frames = None
+    if images.get('earth'):
+        earth_frames = RotationCache(images['earth'], EARTH_ROTATION_STEP, mask=circle_mask,
+                                     max_bytes=EARTH_CACHE_BYTES)
+    asteroid_atlas = SpriteAtlas(images['asteroid'], [ASTEROID_BASE_SIZE], ASTEROID_ROTATIONS)
+
+    result_cache = LRUCache(RESULT_CACHE_SIZE)
+    RISK_TEXT_WIDTH = RISKS_RECT.width - 30
+
+    # Built once, then loaded from disk on later startups
+    impact_grid = load_impact_grid(entry=ATMOSPHERIC_ENTRY) if LIVE_PREVIEW else None
+
+    # Ensembles run on a background thread (which drives the process pool)
+    # so the window keeps animating while the samples are crunched
+    ensemble_executor = ThreadPoolExecutor(max_workers=1)
+    ensemble_future = None
+    ensemble_cancel = threading.Event()     # stops the run behind ensemble_future
 
     # MODIFIED: Adjusted for the new font_body (14pt)
     RISK_LINE_HEIGHT = 60 # Increased safe increment for a wrapping paragraph (~3 lines of font_body)
 
+    # --- Static layer ---
+    # Background, title, input panel and result boxes are drawn into
+    # static_layer only when a widget or the results change; each frame just
+    # the moving parts (Earth, asteroid, explosion) are redrawn and only the
+    # rectangles that changed are sent to the display
+    def draw_background(surface):
+        surface.fill(DEEP_BLUE_BACKGROUND_RGB)
+        if images.get('background'):
+            surface.blit(images['background'], (0, 0))
+
+    def draw_input_panel(surface):
+        # ----------------------------------------------------------------------
+        # --- Draw UI Panels (Input Panel) ---
+        # ----------------------------------------------------------------------
+        # Draw Left Sidebar Input Panel 
+        panel_rect = pygame.Rect(INPUT_PANEL_X, INPUT_PANEL_Y, INPUT_PANEL_WIDTH, INPUT_PANEL_HEIGHT)
+        panel_surf = pygame.Surface(panel_rect.size, pygame.SRCALPHA)
+        panel_surf.fill(DEEP_BLUE_BACKGROUND_RGBA)
+
+        
+        # Blit the panel background first
+        surface.blit(panel_surf, panel_rect.topleft)
+
+        
+        # --- Draw a bold line only on the right edge of the panel (on the main surface) ---
+        border_color = pygame.Color(PALE_CYAN_ACCENT_COLOR)
+        shadow_color = pygame.Color(CYAN_SHADOW_RGBA)
+        
+        # 1. Draw the shadow line (slightly offset)
+        shadow_x = INPUT_PANEL_X + INPUT_PANEL_WIDTH + 2
+        pygame.draw.line(surface, shadow_color, (shadow_x, INPUT_PANEL_Y), (shadow_x, INPUT_PANEL_Y + INPUT_PANEL_HEIGHT), 8)
+
+        # 2. Draw the main border line
+        border_x = INPUT_PANEL_X + INPUT_PANEL_WIDTH
+        pygame.draw.line(surface, border_color, (border_x, INPUT_PANEL_Y), (border_x, INPUT_PANEL_Y + INPUT_PANEL_HEIGHT), 3)
+
+        # Draw the SIMULATION INPUTS header
+        draw_shadowed_text(surface, "SIMULATION INPUTS", font_header, pygame.Color(LIGHTER_CYAN_COLOR), (INPUT_PANEL_X + MARGIN, INPUT_PANEL_Y + 90), (0,0,0))
+        
+
+        for element in slider_elements:
+            element.draw(surface, font_label, font_label)
+        
+        for element in dropdown_elements:
+            element.draw(surface, font_label, font_label)
+            
+        impact_button.draw(surface, font_label)
+        quit_button.draw(surface, font_label)
+
+    def draw_result_boxes(surface):
+        # ------------------------------------------------------------------
+        # --- Draw Energy/Impact Result (Between Panel and Earth) ---
+        # ------------------------------------------------------------------
+        if not results_data:
+            return
+
+        # ------------------------------------------------------------------
+        # DRAW BOX 1: ENERGY
+        # ------------------------------------------------------------------
+        cx, cy = draw_result_box(surface, ENERGY_RECT, "IMPACT ENERGY", font_header, font_label)
+        
+        # Energy Value (Mega-tons TNT) - Using font size 28 or 22
+        energy_text = f"{results_data['energy']:,.2f} Mt"
+        
+        # --- DYNAMIC FONT SELECTION ---
+        # Check length to prevent overflow (Max length around 12 characters is safe for 28pt)
+        if len(energy_text) > 12:
+            current_font = font_prominent_result_small # 22pt
+        else:
+            current_font = font_prominent_result # 28pt
+
+        # Calculate new Y position for better centering
+        text_height = current_font.size("Tg")[1]
+        y_center_offset = cy + ((SMALL_BOX_H - 10) - cy + ENERGY_RECT.y) // 2 - (text_height // 2)
+        
+        # Use the selected font
+        draw_shadowed_text(surface, energy_text, current_font, pygame.Color(PALE_CYAN_ACCENT_COLOR), (cx, y_center_offset), (0,0,0))
+
+        # Uncertainty band (bottom of the box)
+        if ensemble_future is not None:
+            band_text = "Running ensemble..."
+        elif "ensemble" in results_data and results_data["ensemble"] is None:
+            band_text = "Ensemble unavailable (press E to retry)"
+        elif "ensemble" in results_data:
+            band_key = "airburst_energy" if results_data['airburst_altitude'] else "effective_energy"
+            low, high = results_data["ensemble"][band_key]["percentiles"].values()
+            band_text = f"P{ENSEMBLE_BAND[0]}-P{ENSEMBLE_BAND[1]}: {low:.3g} - {high:.3g} Mt"
+        else:
+            band_text = "Press E for uncertainty band"
+        band_surf = TEXT_CACHE.render(font_body, band_text, pygame.Color(LIGHTER_CYAN_COLOR))
+        surface.blit(band_surf, (cx, ENERGY_RECT.bottom - band_surf.get_height() - 6))
+
+
+        # ------------------------------------------------------------------
+        # DRAW BOX 2: CRATER / TSUNAMI
+        # ------------------------------------------------------------------
+        cx_crater, cy_crater = draw_result_box(surface, CRATER_RECT, "IMPACT RESULT", font_header, font_label)
+        
+        # Dynamic Label and Value based on location
+        result_label = "Crater Diameter" if results_data['location'] == 'Land' else "Tsunami Risk"
+        result_value = f"{results_data['crater']:.2f} km" if results_data['location'] == 'Land' else "HIGH"
+        if results_data['airburst_altitude'] > 0:
+            result_label = "Airburst Altitude"
+            result_value = f"{results_data['airburst_altitude']:.1f} km"
+
+        # Result Label (18pt)
+        draw_shadowed_text(surface, result_label, font_label, pygame.Color(PALE_CYAN_ACCENT_COLOR), (cx_crater, cy_crater), (0,0,0))
+        
+        # Calculate new Y position for better centering in the taller box
+        text_height_prominent = font_prominent_result.size("Tg")[1]
+        header_end_y = cy_crater + font_label.size("Tg")[1] + 5 
+        remaining_height = CRATER_RECT.bottom - header_end_y - 10 
+        y_center_offset_crater = header_end_y + remaining_height // 2 - (text_height_prominent // 2)
+        
+        # Result Value (28pt)
+        draw_shadowed_text(surface, result_value, font_prominent_result, pygame.Color(LIGHTER_CYAN_COLOR), (cx_crater, y_center_offset_crater), (0,0,0))
+
+        if results_data.get("ensemble") and results_data['location'] == 'Land' and not results_data['airburst_altitude']:
+            low, high = results_data["ensemble"]["crater"]["percentiles"].values()
+            band_surf = TEXT_CACHE.render(font_body, f"P{ENSEMBLE_BAND[0]}-P{ENSEMBLE_BAND[1]} {low:.0f}-{high:.0f} km", pygame.Color(LIGHTER_CYAN_COLOR))
+            surface.blit(band_surf, (CRATER_RECT.right - band_surf.get_width() - 10, cy_crater + 3))
+
+        
+        # ------------------------------------------------------------------
+        # DRAW BOX 3: MAJOR RISKS (Bottom, fills the width under Earth)
+        # ------------------------------------------------------------------
+        cx_risk, cy_risk = draw_result_box(surface, RISKS_RECT, "MAJOR RISKS", font_header, font_label)
+        
+        # Dynamic display of risk list
+        risk_y_start = cy_risk + 5
+        
+        for risk_lines in results_data['risk_lines']:
+            # Draw a small bullet point (font_body 14pt)
+            draw_text(surface, "•", font_body, pygame.Color(PALE_CYAN_ACCENT_COLOR), pygame.Rect(cx_risk, risk_y_start, 10, 15))
+            
+            # Draw the risk text, offset for the bullet point
+            text_rect = pygame.Rect(cx_risk + 15, risk_y_start, RISK_TEXT_WIDTH, RISKS_RECT.height - (risk_y_start - RISKS_RECT.y) - 10) 
+            
+            # Lines were wrapped (14pt font_body) when the results were cached
+            draw_text_lines(surface, risk_lines, font_body, pygame.Color(PALE_CYAN_ACCENT_COLOR), text_rect)
+            
+            # Advance the Y position using the safe fixed increment (60)
+            risk_y_start += RISK_LINE_HEIGHT
+
+    def draw_static(surface):
+        draw_background(surface)
+
+        # Draw Main Title (Centered in the RIGHT section)
+        MAIN_TITLE_START_X = INPUT_PANEL_WIDTH + MARGIN 
+        MAIN_TITLE_WIDTH = SCREEN_WIDTH - MAIN_TITLE_START_X - MARGIN
+        TITLE_TEXT_WIDTH = font_title.size("ASTEROID IMPACT EXPLORER")[0]
+        TITLE_X = MAIN_TITLE_START_X + (MAIN_TITLE_WIDTH // 2) - (TITLE_TEXT_WIDTH // 2)
+
+        draw_shadowed_text(surface, "ASTEROID IMPACT EXPLORER", font_title, pygame.Color(PALE_CYAN_ACCENT_COLOR), 
+                           (TITLE_X, 70), (0,0,0))
+
+        draw_input_panel(surface)
+        draw_result_boxes(surface)
+
+        # Draw Dropdown Options (Drawn LAST)
+        for element in dropdown_elements:
+             element.draw_options(surface)
+
+    static_layer = pygame.Surface(screen.get_size()).convert()
+    SCREEN_RECT = screen.get_rect()
+    PANEL_DIRTY_RECT = pygame.Rect(INPUT_PANEL_X, INPUT_PANEL_Y, INPUT_PANEL_WIDTH + 10, INPUT_PANEL_HEIGHT)
+    RESULT_DIRTY_RECTS = [rect.inflate(4, 4) for rect in (ENERGY_RECT, CRATER_RECT, RISKS_RECT)]
+    EARTH_RECT = pygame.Rect(0, 0, EARTH_SIZE, EARTH_SIZE)
+    EARTH_RECT.center = EARTH_CENTER
+    shown_panel_state = shown_results = shown_results_state = shown_earth_index = None
+    moving_rects = []
+    full_redraw = True
+
     while running:
+        PROFILER.begin_frame()
         # --- Event Handling (Unchanged) ---
         for event in pygame.event.get():
+            if PROFILER.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 running = False
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_e and results_data and ensemble_future is None:
+                ensemble_cancel = threading.Event()
+                ensemble_future = ensemble_executor.submit(
+                    run_ensemble, *results_data["inputs"], ENSEMBLE_SAMPLES, percentiles=ENSEMBLE_BAND,
+                    chunk_size=ENSEMBLE_CHUNK_SIZE, entry=ATMOSPHERIC_ENTRY,
+                    mp_context=ENSEMBLE_MP_CONTEXT, cancel=ensemble_cancel)
             
             dropdown_clicked = False
             for dropdown in dropdown_elements:
@@ -499,28 +664,32 @@ def main():
                             if other_dropdown is not dropdown:
                                 other_dropdown.is_open = False
             
+            inputs_changed = dropdown_clicked
             for element in slider_elements:
-                element.handle_event(event)
+                if element.handle_event(event):
+                    inputs_changed = True
+
+            # Live preview: O(1) grid interpolation on every slider/dropdown change
+            if inputs_changed and impact_grid is not None:
+                previous = results_data
+                results_data = get_scenario_results(result_cache, slider_elements, material_dropdown.value,
+                                                    location_dropdown.value, font_body, RISK_TEXT_WIDTH, impact_grid)
+                if results_data is not previous:
+                    # Stop the stale run so the next one doesn't queue behind it
+                    ensemble_cancel.set()
+                    ensemble_future = None
             
             if impact_button.handle_event(event) and animation_state != IN_FLIGHT:
-                # Calculate Results
-                d = diameter_slider.value
-                v = velocity_slider.value
-                a = angle_slider.value
-                m = material_dropdown.value
-                l = location_dropdown.value
-
-                crater, energy = estimate_crater_size(d, v, a, m, l)
-                risks = assess_risks(d, v, a, m, l)
-                mass = calculate_mass(d, m)
-                
-                results_data = {
-                    "energy": energy,
-                    "mass": mass,
-                    "crater": crater,
-                    "location": l,
-                    "risks": risks
-                }
+                # Calculate Results (exact model, reused from the cache on repeats)
+                previous = results_data
+                results_data = get_scenario_results(result_cache, slider_elements, material_dropdown.value,
+                                                    location_dropdown.value, font_body, RISK_TEXT_WIDTH)
+                d, v, a, m, l = results_data["inputs"]
+
+                # Any running ensemble belongs to the previous scenario
+                if results_data is not previous:
+                    ensemble_cancel.set()
+                    ensemble_future = None
 
                 # Start Animation
                 animation_state = IN_FLIGHT
@@ -529,6 +698,7 @@ def main():
                 start_x = SCREEN_WIDTH - MARGIN # Start at the far right
                 start_y = EARTH_CENTER[1] # Start vertically aligned with the Earth center
                 asteroid_pos.x, asteroid_pos.y = start_x, start_y
+                asteroid_prev.update(asteroid_pos)
                 
                 earth_radius_half = EARTH_SIZE / 2
                 
@@ -548,213 +718,140 @@ def main():
             if quit_button.handle_event(event):
                 running=False
 
-        # --- Update Animation ---
-        if animation_state == IN_FLIGHT:
-            distance_to_target = (target_pos - asteroid_pos).length()
-            
-            if distance_to_target < velocity_vec.length():
-                animation_state = IMPACTED
-                explosion_start_time = time.time()
-                asteroid_pos.x = -100 # Hide asteroid
-            else:
-                asteroid_pos += velocity_vec
-            
-        elif animation_state == IMPACTED:
-            if time.time() - explosion_start_time > EXPLOSION_DURATION:
-                animation_state = PRE_IMPACT
-                
-        # Earth rotation update: smooth rotation
-        earth_angle = (earth_angle + 0.2) % 360
-
-        # --- Drawing ---
-        screen.fill(DEEP_BLUE_BACKGROUND_RGB)
-        if images.get('background'):
-            screen.blit(images['background'], (0, 0))
-            
-        # Draw Main Title (Centered in the RIGHT section)
-        MAIN_TITLE_START_X = INPUT_PANEL_WIDTH + MARGIN 
-        MAIN_TITLE_WIDTH = SCREEN_WIDTH - MAIN_TITLE_START_X - MARGIN
-        TITLE_TEXT_WIDTH = font_title.size("ASTEROID IMPACT EXPLORER")[0]
-        TITLE_X = MAIN_TITLE_START_X + (MAIN_TITLE_WIDTH // 2) - (TITLE_TEXT_WIDTH // 2)
-
-        draw_shadowed_text(screen, "ASTEROID IMPACT EXPLORER", font_title, pygame.Color(PALE_CYAN_ACCENT_COLOR), 
-                           (TITLE_X, 70), (0,0,0))
+        # --- Collect finished ensemble ---
+        if ensemble_future is not None and ensemble_future.done():
+            if results_data:
+                # A failed run (a worker dying, a bad scenario) shows as
+                # unavailable instead of ending the UI
+                try:
+                    results_data["ensemble"] = ensemble_future.result()
+                except Exception as e:
+                    print(f"Warning: uncertainty ensemble failed: {e!r}")
+                    results_data["ensemble"] = None
+            ensemble_future = None
+        PROFILER.mark("events")
+
+        # --- Update Animation (fixed ticks) ---
+        for _ in sim.steps():
+            asteroid_prev.update(asteroid_pos)
+            if animation_state == IN_FLIGHT:
+                distance_to_target = (target_pos - asteroid_pos).length()
+
+                if distance_to_target < velocity_vec.length():
+                    animation_state = IMPACTED
+                    # Bigger impacts throw more sparks, further
+                    energy = results_data.get('energy', 0)
+                    reach = 50 + min(energy / 100, 200)
+                    particles.emit(target_pos.x, target_pos.y, burst_size(energy),
+                                   speed=reach * (1 - particles.drag), life=EXPLOSION_DURATION * SIM_HZ)
+                    asteroid_pos.x = -100 # Hide asteroid
+                else:
+                    asteroid_pos += velocity_vec
 
+            # Earth rotation update: smooth rotation
+            earth_angle = (earth_angle + EARTH_SPIN) % 360
+            PROFILER.mark("update")
 
-          # --- Draw Rotating Earth (PERFECT STABILITY FIX) ---
-        if images.get('earth'):
-            
-            # 1. Rotate the stable, pre-scaled square image (images['earth'])
-            rotated_earth_full = pygame.transform.rotate(images['earth'], earth_angle)
-            
-            # 2. Create the final output surface, which is always the fixed size
-            final_earth_surface = pygame.Surface((EARTH_SIZE, EARTH_SIZE), pygame.SRCALPHA)
-            
-            # 3. Blit the rotated image onto the final surface, using the center 
-            # of the rotated image's bounding box to calculate the offset.
-            rotated_rect = rotated_earth_full.get_rect(center=(EARTH_SIZE // 2, EARTH_SIZE // 2))
-            final_earth_surface.blit(rotated_earth_full, rotated_rect)
+            particles.update()
+            if animation_state == IMPACTED and not particles.count:
+                animation_state = PRE_IMPACT
+            PROFILER.mark("explosions")
 
-            # 4. Apply the circular mask directly to the final, fixed-size surface
-            final_earth_surface.blit(circle_mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-            
-            # 5. Draw the result to the screen at the fixed center
-            earth_rect = final_earth_surface.get_rect(center=EARTH_CENTER)
-            screen.blit(final_earth_surface, earth_rect)
+        # Drawn state lies between the last two ticks
+        blend = sim.alpha
+        drawn_earth_angle = (earth_angle - EARTH_SPIN * (1 - blend)) % 360
 
-        
-        # --- Draw Asteroid/Explosion (Unchanged) ---
+        # --- Drawing ---
+        dirty = []
+        panel_state = ([(s.handle_pos, f"{s.val:.0f}") for s in slider_elements],
+                       [(d.selected_val, d.is_open) for d in dropdown_elements])
+        results_state = (ensemble_future is None, bool(results_data) and "ensemble" in results_data)
+        panel_changed = panel_state != shown_panel_state
+        results_changed = results_data is not shown_results or results_state != shown_results_state
+        if full_redraw or panel_changed or results_changed:
+            draw_static(static_layer)
+            if full_redraw:
+                changed = [SCREEN_RECT]
+            else:
+                changed = ([PANEL_DIRTY_RECT] if panel_changed else []) + (RESULT_DIRTY_RECTS if results_changed else [])
+            for rect in changed:
+                screen.blit(static_layer, rect, rect)
+            dirty.extend(changed)
+            shown_panel_state, shown_results, shown_results_state = panel_state, results_data, results_state
+
+        # Erase last frame's moving parts
+        for rect in moving_rects:
+            screen.blit(static_layer, rect, rect)
+        dirty.extend(moving_rects)
+        PROFILER.mark("text")
+
+        # --- Asteroid/Explosion sprites for this frame ---
+        sprites = []
         if animation_state == IN_FLIGHT:
             if images.get('asteroid'):
-                 asteroid_angle = earth_angle * 2
-                 rotated_asteroid = pygame.transform.rotate(images['asteroid'], asteroid_angle)
-                 asteroid_rect = rotated_asteroid.get_rect(center=(int(asteroid_pos.x), int(asteroid_pos.y)))
-                 screen.blit(rotated_asteroid, asteroid_rect)
-                 
-        elif animation_state == IMPACTED:
-            # Draw Explosion/Flash effect
-            time_elapsed = time.time() - explosion_start_time
-            time_ratio = time_elapsed / EXPLOSION_DURATION
-            frame = int(time_ratio * 10)
-            
-            colors = [YELLOW_EXP, ORANGE_EXP, RED_EXP]
-            color = colors[min(frame // 2, 2)]
-            
-            max_radius = 50 + min(results_data.get('energy', 0) / 100, 200)
-            radius = int(20 + frame * (max_radius/10))
-            
-            alpha = max(0, 255 - frame * 25)
-            
-            exp_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(exp_surface, (*color, alpha), (radius, radius), radius)
-            
-            screen.blit(exp_surface, (target_pos.x - radius, target_pos.y - radius))
-
-        # ----------------------------------------------------------------------
-        # --- Draw UI Panels (Input Panel) ---
-        # ----------------------------------------------------------------------
-        # Draw Left Sidebar Input Panel 
-        panel_rect = pygame.Rect(INPUT_PANEL_X, INPUT_PANEL_Y, INPUT_PANEL_WIDTH, INPUT_PANEL_HEIGHT)
-        panel_surf = pygame.Surface(panel_rect.size, pygame.SRCALPHA)
-        panel_surf.fill(DEEP_BLUE_BACKGROUND_RGBA)
-
-        
-        # Blit the panel background first
-        screen.blit(panel_surf, panel_rect.topleft)
-
-        
-        # --- Draw a bold line only on the right edge of the panel (on the main screen) ---
-        border_color = pygame.Color(PALE_CYAN_ACCENT_COLOR)
-        shadow_color = pygame.Color(CYAN_SHADOW_RGBA)
-        
-        # 1. Draw the shadow line (slightly offset)
-        shadow_x = INPUT_PANEL_X + INPUT_PANEL_WIDTH + 2
-        pygame.draw.line(screen, shadow_color, (shadow_x, INPUT_PANEL_Y), (shadow_x, INPUT_PANEL_Y + INPUT_PANEL_HEIGHT), 8)
-
-        # 2. Draw the main border line
-        border_x = INPUT_PANEL_X + INPUT_PANEL_WIDTH
-        pygame.draw.line(screen, border_color, (border_x, INPUT_PANEL_Y), (border_x, INPUT_PANEL_Y + INPUT_PANEL_HEIGHT), 3)
-
-        # Draw the SIMULATION INPUTS header
-        draw_shadowed_text(screen, "SIMULATION INPUTS", font_header, pygame.Color(LIGHTER_CYAN_COLOR), (INPUT_PANEL_X + MARGIN, INPUT_PANEL_Y + 90), (0,0,0))
-        
-
-        for element in slider_elements:
-            element.draw(screen, font_label, font_label)
-        
-        for element in dropdown_elements:
-            element.draw(screen, font_label, font_label)
-            
-        impact_button.draw(screen, font_label)
-        quit_button.draw(screen, font_label)
-        
-        # ------------------------------------------------------------------
-        # --- Draw Energy/Impact Result (Between Panel and Earth) ---
-        # ------------------------------------------------------------------
-        if results_data:
-            # Boxes 1 & 2 use the current RESULTS_LEFT_PANEL_WIDTH = 370
-            ENERGY_RECT = pygame.Rect(RESULTS_LEFT_PANEL_X_START, RESULTS_LEFT_PANEL_Y_START, RESULTS_LEFT_PANEL_WIDTH, SMALL_BOX_H)
-            CRATER_RECT = pygame.Rect(RESULTS_LEFT_PANEL_X_START, RESULTS_LEFT_PANEL_Y_START + SMALL_BOX_H + MARGIN, RESULTS_LEFT_PANEL_WIDTH, SMALL_BOX_H)
-            
-            # ------------------------------------------------------------------
-            # DRAW BOX 1: ENERGY
-            # ------------------------------------------------------------------
-            cx, cy = draw_result_box(screen, ENERGY_RECT, "IMPACT ENERGY", font_header, font_label)
-            
-            # Energy Value (Mega-tons TNT) - Using font size 28 or 22
-            energy_text = f"{results_data['energy']:,.2f} Mt"
-            
-            # --- DYNAMIC FONT SELECTION ---
-            # Check length to prevent overflow (Max length around 12 characters is safe for 28pt)
-            if len(energy_text) > 12:
-                current_font = font_prominent_result_small # 22pt
-            else:
-                current_font = font_prominent_result # 28pt
-
-            # Calculate new Y position for better centering
-            text_height = current_font.size("Tg")[1]
-            y_center_offset = cy + ((SMALL_BOX_H - 10) - cy + ENERGY_RECT.y) // 2 - (text_height // 2)
-            
-            # Use the selected font
-            draw_shadowed_text(screen, energy_text, current_font, pygame.Color(PALE_CYAN_ACCENT_COLOR), (cx, y_center_offset), (0,0,0))
-
-
-            # ------------------------------------------------------------------
-            # DRAW BOX 2: CRATER / TSUNAMI
-            # ------------------------------------------------------------------
-            cx_crater, cy_crater = draw_result_box(screen, CRATER_RECT, "IMPACT RESULT", font_header, font_label)
-            
-            # Dynamic Label and Value based on location
-            result_label = "Crater Diameter" if results_data['location'] == 'Land' else "Tsunami Risk"
-            result_value = f"{results_data['crater']:.2f} km" if results_data['location'] == 'Land' else "HIGH"
-
-            # Result Label (18pt)
-            draw_shadowed_text(screen, result_label, font_label, pygame.Color(PALE_CYAN_ACCENT_COLOR), (cx_crater, cy_crater), (0,0,0))
-            
-            # Calculate new Y position for better centering in the taller box
-            text_height_prominent = font_prominent_result.size("Tg")[1]
-            header_end_y = cy_crater + font_label.size("Tg")[1] + 5 
-            remaining_height = CRATER_RECT.bottom - header_end_y - 10 
-            y_center_offset_crater = header_end_y + remaining_height // 2 - (text_height_prominent // 2)
-            
-            # Result Value (28pt)
-            draw_shadowed_text(screen, result_value, font_prominent_result, pygame.Color(LIGHTER_CYAN_COLOR), (cx_crater, y_center_offset_crater), (0,0,0))
-
-            
-            # ------------------------------------------------------------------
-            # DRAW BOX 3: MAJOR RISKS (Bottom, fills the width under Earth)
-            # ------------------------------------------------------------------
-            cx_risk, cy_risk = draw_result_box(screen, RISKS_RECT, "MAJOR RISKS", font_header, font_label)
-            
-            # Dynamic display of risk list
-            risk_y_start = cy_risk + 5
-            
-            for risk in results_data['risks']:
-                # Draw a small bullet point (font_body 14pt)
-                draw_text(screen, "•", font_body, pygame.Color(PALE_CYAN_ACCENT_COLOR), pygame.Rect(cx_risk, risk_y_start, 10, 15))
-                
-                # Draw the risk text, offset for the bullet point
-                text_rect = pygame.Rect(cx_risk + 15, risk_y_start, RISKS_RECT.width - 30, RISKS_RECT.height - (risk_y_start - RISKS_RECT.y) - 10) 
-                
-                # Use draw_text for wrapping with the 14pt font_body
-                draw_text(screen, risk, font_body, pygame.Color(PALE_CYAN_ACCENT_COLOR), text_rect)
-                
-                # Advance the Y position using the safe fixed increment (60)
-                risk_y_start += RISK_LINE_HEIGHT 
-
-        # ------------------------------------------------------------------
-        
-        # Draw Dropdown Options (Drawn LAST)
-        for element in dropdown_elements:
-             element.draw_options(screen)
-        
+                 asteroid_angle = drawn_earth_angle * 2
+                 rotated_asteroid = asteroid_atlas.frame(ASTEROID_BASE_SIZE, asteroid_angle)
+                 drawn_pos = (int(lerp(asteroid_prev.x, asteroid_pos.x, blend)), int(lerp(asteroid_prev.y, asteroid_pos.y, blend)))
+                 asteroid_rect = rotated_asteroid.get_rect(center=drawn_pos)
+                 sprites.append((rotated_asteroid, asteroid_rect.topleft))
+
+        # Blits round float positions, so pad their rects by a pixel
+        sprite_rects = [surf.get_rect(topleft=pos).inflate(2, 2) for surf, pos in sprites]
+        explosion_rect = particles.bounds(blend)
+        if explosion_rect is not None:
+            sprite_rects.append(explosion_rect)
+
+        # --- Draw Rotating Earth ---
+        # Only when its frame changes or something moved across it
+        if earth_frames is not None:
+            earth_index = earth_frames.index(drawn_earth_angle)
+            if (full_redraw or earth_index != shown_earth_index
+                    or EARTH_RECT.collidelist(moving_rects + sprite_rects) != -1):
+                # The globe is partly translucent, so start from the layer below
+                screen.blit(static_layer, EARTH_RECT, EARTH_RECT)
+                earth_frames.blit(screen, drawn_earth_angle, EARTH_CENTER)
+                dirty.append(EARTH_RECT)
+                shown_earth_index = earth_index
+        PROFILER.mark("earth")
+
+        for surf, pos in sprites:
+            screen.blit(surf, pos)
+        PROFILER.mark("asteroid")
+        if explosion_rect is not None:
+            particles.draw(screen, blend)
+            # The risks box sits above the explosion: recompose the overlap
+            # in the original order (background, explosion, box)
+            overlap = explosion_rect.clip(RISKS_RECT)
+            if overlap:
+                screen.set_clip(overlap)
+                draw_background(screen)
+                particles.draw(screen, blend)
+                draw_result_boxes(screen)
+                screen.set_clip(None)
+        PROFILER.mark("explosions")
+
+        # The overlay is erased and redrawn like a sprite
+        overlay_rect = PROFILER.draw(screen)
+        if overlay_rect is not None:
+            sprite_rects.append(overlay_rect)
+        PROFILER.mark("profiler")
+
+        moving_rects = [rect.clip(SCREEN_RECT) for rect in sprite_rects]
+        dirty.extend(moving_rects)
+        full_redraw = False
 
         # --- Update Display ---
-        pygame.display.flip()
+        pygame.display.update(dirty)
+        PROFILER.mark("display")
         clock.tick(FPS)
+        PROFILER.mark("wait")
+        PROFILER.end_frame()
 
-    pygame.quit()
-    sys.exit()
+    # Returns with the window still open, so another scene can reuse it
+    ensemble_cancel.set()
+    ensemble_executor.shutdown(wait=False, cancel_futures=True)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
+    pygame.quit()
+    sys.exit()
\ No newline at end of file
@@ -1,22 +1,29 @@
 import pygame
-import random
-import sys
+import argparse
 import math
-import os
+import sys
+
+import assets
+import game_sim
+from fixed_step import FixedTimestep
+from frame_profiler import FrameProfiler
+from game_sim import BIG, HEIGHT, MEDIUM, SMALL, WIDTH, GameState
+from particles import ParticleSystem
+from replay import Replay, int64, numbered_path
+from waves import load_waves
+from sprite_cache import RotationCache, SpriteAtlas
 
-# --- Step 1: Setup Base Directory for Assets ---
-BASE_DIR = os.path.dirname(__file__)
-ASSETS_DIR = os.path.join(BASE_DIR, "assets")
-IMAGES_DIR = os.path.join(ASSETS_DIR, "images")
-FONTS_DIR = os.path.join(ASSETS_DIR, "fonts")
+# The window, fonts and images are set up by setup() on first use, so
+# importing this module (for its constants, or to drive game_sim) opens no
+# display; the playfield size comes from game_sim
+screen = None
+earth_frames = None
+meteor_atlas = meteor_keyed_atlas = None
 
-# Initialize pygame
-pygame.init()
 
-# Screen settings
-WIDTH, HEIGHT = 900, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Asteroid Assault - Save the Earth!")
+class QuitGame(Exception):
+    """Raised by the screens when the window is closed or QUIT is pressed."""
+
 
 # Colors
 BLACK = (0, 0, 0)
@@ -25,250 +32,301 @@ YELLOW = (255, 220, 50)
 ORANGE = (255, 140, 0)
 RED = (200, 40, 0)
 
-# --- Fonts with fallback ---
-def load_font(filename, size):
-    font_path = os.path.join(FONTS_DIR, filename)
-    if os.path.exists(font_path):
-        return pygame.font.Font(font_path, size)
-    else:
-        print(f"⚠ Font {filename} not found, using default.")
-        return pygame.font.Font(None, size)
+# Earth settings
+earth_radius = game_sim.EARTH_RADIUS
+earth_x, earth_y = game_sim.EARTH_X, game_sim.EARTH_Y
 
-play_font = load_font("Orbitron-Medium.ttf", 40)    # Play/Restart/Quit
-title_font = load_font("Orbitron-Bold.ttf", 72)     # Game titles
-sub_font = load_font("Orbitron-Regular.ttf", 24)    # Subtitles
-score_font = load_font("Orbitron-SemiBold.ttf", 40) # Score
+# Game rules and meteors live in game_sim; state is the game being played
+state = None
+spawn_interval = 2000   # ms
 
-# Earth settings
-earth_radius = 300
-earth_x, earth_y = WIDTH // 2, HEIGHT + 80
+particles = ParticleSystem(colors=(RED, ORANGE, YELLOW))  # explosion sparks
 
-# Asteroid settings
-asteroids = []  # [x, y, speed, hp, radius]
-spawn_event = pygame.USEREVENT + 1
-spawn_interval = 2000
-pygame.time.set_timer(spawn_event, spawn_interval)
+# The simulation runs in fixed ticks (fixed_step.SIM_HZ) whatever the frame
+# rate: speeds are pixels per tick, spawns and difficulty follow simulated
+# time, and drawing interpolates between the last two ticks
+RENDER_FPS = 60
+EARTH_SPIN = 0.2        # degrees per tick
+EXPLOSION_TICKS = 20        # lifetime of the longest-lived sparks
+EXPLOSION_PARTICLES = 300   # for a SMALL meteor; scales with meteor mass
+EXPLOSION_REACH = 2         # how far the sparks fly, in meteor radii
 
-explosions = []  # [x, y, frame]
+# Where each frame's time goes (F3 shows it, F4 saves it; see frame_profiler)
+profiler = FrameProfiler("game", ("events", "sim", "explosions", "background", "earth", "meteors", "text",
+                                  "profiler", "flip", "wait"), fps=RENDER_FPS)
 
-# --- Load assets (images) ---
+# --- Load assets (images; fonts and images are cached by assets) ---
 def load_image(filename, scale=None, alpha=True):
-    path = os.path.join(IMAGES_DIR, filename)
-    if not os.path.exists(path):
+    try:
+        return assets.image(filename, scale, alpha)
+    except FileNotFoundError:
         print(f"❌ ERROR: Missing image {filename} in assets/")
         pygame.quit()
         sys.exit()
-    img = pygame.image.load(path).convert_alpha() if alpha else pygame.image.load(path).convert()
-    if scale:
-        img = pygame.transform.scale(img, scale)
-    return img
-
-earth_img = load_image("Earth1.png", (earth_radius * 2, earth_radius * 2))
-meteor_img = load_image("meteor.png")
-meteor_base_size = 40
-galaxy_bg = load_image("stars_minimal.jpg", (WIDTH, HEIGHT), alpha=False)
 
-# Asteroid types
-SMALL = (1, 24)
-MEDIUM = (2, 36)
-BIG = (3, 48)
+# Only the part of the Earth above the bottom edge is ever seen
+earth_top = earth_y - earth_radius
+# Every meteor size at METEOR_ROTATIONS angles, each scaled and rotated once.
+# Up to METEOR_BLEND_LIMIT meteors are drawn with soft (per-pixel alpha)
+# edges; above that, blending thousands of overlapping sprites costs more
+# than a frame, and colour-keyed frames with hard edges are drawn instead
+METEOR_ROTATIONS = 120
+METEOR_BLEND_LIMIT = 500
+
+
+def setup():
+    """Open the window (or resize it to ours) and load fonts and images (once).
+
+    Another mode may have used the window in between (see scenes.py).
+    """
+    global screen, play_font, title_font, sub_font, score_font
+    global earth_img, earth_frames, meteor_img, galaxy_bg, meteor_atlas, meteor_keyed_atlas
+    screen = pygame.display.get_surface()
+    if screen is None or screen.get_size() != (WIDTH, HEIGHT):
+        pygame.init()
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Asteroid Assault - Save the Earth!")
+    if meteor_atlas is not None:
+        return
+
+    play_font = assets.font("Orbitron-Medium.ttf", 40)    # Play/Restart/Quit
+    title_font = assets.font("Orbitron-Bold.ttf", 72)     # Game titles
+    sub_font = assets.font("Orbitron-Regular.ttf", 24)    # Subtitles
+    score_font = assets.font("Orbitron-SemiBold.ttf", 40) # Score
+
+    earth_img = load_image("Earth1.png", (earth_radius * 2, earth_radius * 2))
+    # Pre-rotated Earth frames
+    earth_frames = RotationCache(earth_img, step=0.2, max_bytes=160 * 1024 ** 2,
+                                 clip=(0, 0, earth_radius * 2, min(HEIGHT - earth_top, earth_radius * 2)))
+    meteor_img = load_image("meteor.png")
+    galaxy_bg = load_image("stars_minimal.jpg", (WIDTH, HEIGHT), alpha=False)
+    meteor_sizes = [2 * radius for _, radius in (SMALL, MEDIUM, BIG)]
+    meteor_atlas = SpriteAtlas(meteor_img, meteor_sizes, METEOR_ROTATIONS)
+    meteor_keyed_atlas = SpriteAtlas(meteor_img, meteor_sizes, METEOR_ROTATIONS, colorkey=True)
+
+
+def free_caches():
+    """Drop the pre-rotated Earth frames while another mode runs.
+
+    They are rendered again as the Earth turns in the next game.
+    """
+    if earth_frames is not None:
+        earth_frames.clear()
+
+
+# --- Menu screens ---
+# The start and game-over screens are still pictures: each is composed once
+# into a layer, and the loop sleeps in pygame.event.wait() until there is
+# input instead of redrawing as fast as the CPU allows. Only a hovered
+# button animates, at no more than HOVER_FPS.
+HOVER_FPS = 30          # 0 for a still highlight (no redraws while hovering)
+HOVER_PULSE_HZ = 1.5
+BUTTON_FILL = (20, 20, 40)
+BUTTON_HOVER_FILL = (60, 60, 120)
+REDRAW_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+start_layer = None      # (layer, buttons) of the start screen, composed once
+
+
+def draw_title(surface, text):
+    title_shadow = title_font.render(text, True, (30, 30, 30))
+    title = title_font.render(text, True, WHITE)
+    surface.blit(title_shadow, title_shadow.get_rect(center=(WIDTH // 2 + 2, HEIGHT // 2 - 118)))
+    surface.blit(title, title.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 120)))
+
+
+def make_button(rect, text):
+    return pygame.Rect(rect), play_font.render(text, True, WHITE)
+
+
+def draw_button(surface, rect, label, hover=0.0):
+    """hover (0 to 1) blends the fill toward BUTTON_HOVER_FILL."""
+    fill = [round(a + (b - a) * hover) for a, b in zip(BUTTON_FILL, BUTTON_HOVER_FILL)]
+    pygame.draw.rect(surface, fill, rect, border_radius=15)
+    pygame.draw.rect(surface, WHITE, rect, border_radius=15, width=3)
+    surface.blit(label, label.get_rect(center=rect.center))
+
+
+def menu_loop(layer, buttons):
+    """Show layer until one of buttons ((rect, label) pairs) is clicked; returns its index."""
+    frame_ms = 1000 // HOVER_FPS if HOVER_FPS else 0
+    hovered, redraw, next_frame = None, True, 0
+    while True:
+        animating = hovered is not None and frame_ms
+        now = pygame.time.get_ticks()
+        if animating and now >= next_frame:
+            redraw, next_frame = True, now + frame_ms
+        if redraw:
+            screen.blit(layer, (0, 0))
+            if hovered is not None:
+                pulse = math.cos(now / 1000 * 2 * math.pi * HOVER_PULSE_HZ) if animating else 1
+                draw_button(screen, *buttons[hovered], hover=0.75 + 0.25 * pulse)
+            pygame.display.flip()
+            redraw = False
+
+        # Sleep until input (or the next hover frame)
+        first = pygame.event.wait(max(1, next_frame - now) if animating else 0)
+        for event in [first] + pygame.event.get():
+            if event.type == pygame.QUIT:
+                raise QuitGame
+            if event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN):
+                pos = pygame.mouse.get_pos()
+                over = next((i for i, (rect, _) in enumerate(buttons) if rect.collidepoint(pos)), None)
+                if event.type == pygame.MOUSEBUTTONDOWN and over is not None:
+                    return over
+                if over != hovered:
+                    hovered, redraw = over, True
+            elif event.type in REDRAW_EVENTS:
+                redraw = True
 
 
 def start_screen():
     """Start Menu"""
-    waiting = True
-    button_width, button_height = 180, 60
-    button_x = WIDTH // 2 - button_width // 2
-    button_y = HEIGHT // 2 + 80
-
-    earth_display = pygame.transform.scale(earth_img, (earth_radius * 2, earth_radius * 2))
-    earth_rect = earth_display.get_rect(center=(WIDTH // 2, HEIGHT + 100))
-
-    while waiting:
-        screen.blit(galaxy_bg, (0, 0))
+    global start_layer
+    setup()
+    if start_layer is None:
+        layer = galaxy_bg.copy()
 
         # Glow behind Earth
         glow_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
         pygame.draw.circle(glow_surface, (50, 100, 255, 60), (WIDTH // 2, HEIGHT + 100), 350)
-        screen.blit(glow_surface, (0, 0))
-
-        screen.blit(earth_display, earth_rect)
-
-        # Title
-        title_text = "Asteroid Assault"
-        title_shadow = title_font.render(title_text, True, (30, 30, 30))
-        title = title_font.render(title_text, True, WHITE)
-        shadow_rect = title_shadow.get_rect(center=(WIDTH // 2 + 2, HEIGHT // 2 - 118))
-        title_rect = title.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 120))
-        screen.blit(title_shadow, shadow_rect)
-        screen.blit(title, title_rect)
+        layer.blit(glow_surface, (0, 0))
+        layer.blit(earth_img, earth_img.get_rect(center=(WIDTH // 2, HEIGHT + 100)))
 
-        # Subtitle
+        draw_title(layer, "Asteroid Assault")
         slogan = sub_font.render("Click to flick the meteors away!", True, (180, 180, 255))
-        slogan_rect = slogan.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 50))
-        screen.blit(slogan, slogan_rect)
+        layer.blit(slogan, slogan.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 50)))
 
-        # Play button
-        pygame.draw.rect(screen, (20, 20, 40), (button_x, button_y, button_width, button_height), border_radius=15)
-        pygame.draw.rect(screen, WHITE, (button_x, button_y, button_width, button_height), border_radius=15, width=3)
-        play_text = play_font.render("PLAY", True, WHITE)
-        play_rect = play_text.get_rect(center=(button_x + button_width // 2, button_y + button_height // 2))
-        screen.blit(play_text, play_rect)
-
-        pygame.display.flip()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mx, my = pygame.mouse.get_pos()
-                if button_x <= mx <= button_x + button_width and button_y <= my <= button_y + button_height:
-                    waiting = False
+        play = make_button((WIDTH // 2 - 90, HEIGHT // 2 + 80, 180, 60), "PLAY")
+        draw_button(layer, *play)
+        start_layer = layer, [play]
+    menu_loop(*start_layer)
 
 
 def game_over_screen(final_score):
-    """Game Over Menu"""
-    waiting = True
-    button_width, button_height = 240, 60
-    restart_x = WIDTH // 2 - button_width - 20
-    quit_x = WIDTH // 2 + 20
-    button_y = HEIGHT // 2 + 20
-
-    while waiting:
-        screen.blit(galaxy_bg, (0, 0))
-
-        # Title
-        title_text = "GAME OVER"
-        title_shadow = title_font.render(title_text, True, (30, 30, 30))
-        title = title_font.render(title_text, True, WHITE)
-        shadow_rect = title_shadow.get_rect(center=(WIDTH // 2 + 2, HEIGHT // 2 - 118))
-        title_rect = title.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 120))
-        screen.blit(title_shadow, shadow_rect)
-        screen.blit(title, title_rect)
+    """Game Over Menu (returns on RETRY)"""
+    setup()
+    layer = galaxy_bg.copy()
+    draw_title(layer, "GAME OVER")
+    score_text = score_font.render(f"Final Score: {final_score}", True, (180, 180, 255))
+    layer.blit(score_text, score_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 60)))
 
-        # Score
-        score_text = score_font.render(f"Final Score: {final_score}", True, (180, 180, 255))
-        score_rect = score_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 60))
-        screen.blit(score_text, score_rect)
-
-        # Retry button
-        pygame.draw.rect(screen, (20, 20, 40), (restart_x, button_y, button_width, button_height), border_radius=15)
-        pygame.draw.rect(screen, WHITE, (restart_x, button_y, button_width, button_height), border_radius=15, width=3)
-        restart_text = play_font.render("RETRY", True, WHITE)
-        restart_rect = restart_text.get_rect(center=(restart_x + button_width // 2, button_y + button_height // 2))
-        screen.blit(restart_text, restart_rect)
-
-        # Quit button
-        pygame.draw.rect(screen, (20, 20, 40), (quit_x, button_y, button_width, button_height), border_radius=15)
-        pygame.draw.rect(screen, WHITE, (quit_x, button_y, button_width, button_height), border_radius=15, width=3)
-        quit_text = play_font.render("QUIT", True, WHITE)
-        quit_rect = quit_text.get_rect(center=(quit_x + button_width // 2, button_y + button_height // 2))
-        screen.blit(quit_text, quit_rect)
-
-        pygame.display.flip()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mx, my = pygame.mouse.get_pos()
-                if restart_x <= mx <= restart_x + button_width and button_y <= my <= button_y + button_height:
-                    waiting = False
-                if quit_x <= mx <= quit_x + button_width and button_y <= my <= button_y + button_height:
-                    pygame.quit()
-                    sys.exit()
-
-
-def run_game():
-    """Main Game"""
-    global asteroids
-    asteroids = []
-    score = 0
-    start_ticks = pygame.time.get_ticks()
-    running = True
+    button_y = HEIGHT // 2 + 20
+    retry = make_button((WIDTH // 2 - 260, button_y, 240, 60), "RETRY")
+    quit_ = make_button((WIDTH // 2 + 20, button_y, 240, 60), "QUIT")
+    for button in (retry, quit_):
+        draw_button(layer, *button)
+    if menu_loop(layer, [retry, quit_]) == 1:
+        raise QuitGame
+
+
+def run_game(seed=None, record=None, waves=None):
+    """Main Game; returns the final score at game over.
+
+    seed fixes the meteors (random if None); record is a path to save the
+    game's replay to when it ends; waves is a wave definition (see
+    waves.py; the classic rules if None).
+    """
+    global state
+    setup()
+    state = GameState(seed, spawn_interval / 1000, waves)
+    replay = Replay.start(state)
+    particles.clear()
     clock = pygame.time.Clock()
+    sim = FixedTimestep()
     earth_angle = 0
+    clicks = []
 
-    while running:
-        screen.blit(galaxy_bg, (0, 0))
-
-        # Rotating Earth
-        earth_angle = (earth_angle + 0.2) % 360
-        rotated_earth = pygame.transform.rotate(earth_img, earth_angle)
-        earth_rect = rotated_earth.get_rect(center=(earth_x, earth_y))
-        screen.blit(rotated_earth, earth_rect)
-
-        elapsed_time = (pygame.time.get_ticks() - start_ticks) / 1000
+    def end_replay():
+        if record:
+            replay.finish(state)
+            replay.save(record)
 
+    while True:
+        profiler.begin_frame()
         for event in pygame.event.get():
+            if profiler.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == spawn_event:
-                x = random.randint(meteor_base_size, WIDTH - meteor_base_size)
-                y = 0
-                if elapsed_time < 15:
-                    asteroid_type = SMALL
-                elif elapsed_time < 30:
-                    asteroid_type = random.choice([SMALL, MEDIUM])
-                else:
-                    asteroid_type = random.choice([SMALL, MEDIUM, BIG])
-                hp, radius = asteroid_type
-                speed = random.uniform(1, 1.5 + elapsed_time * 0.03)
-                asteroids.append([x, y, speed, hp, radius])
+                end_replay()
+                raise QuitGame
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                mx, my = pygame.mouse.get_pos()
-                for a in asteroids[:]:
-                    ax, ay, speed, hp, radius = a
-                    if (mx - ax) ** 2 + (my - ay) ** 2 < radius ** 2:
-                        a[3] -= 1
-                        if a[3] <= 0:
-                            asteroids.remove(a)
-                            score += 10
-                            explosions.append([ax, ay, 0])
-                        break
-
-        # Move asteroids
-        for a in asteroids[:]:
-            ax, ay, speed, hp, radius = a
-            dx, dy = earth_x - ax, earth_y - ay
-            dist = math.sqrt(dx ** 2 + dy ** 2)
-            if dist == 0:
-                continue
-            ax += dx / dist * speed
-            ay += dy / dist * speed
-            a[0], a[1] = ax, ay
-            if dist < earth_radius + radius:
-                running = False
-                game_over_screen(score)
-            meteor_size = radius * 2
-            scaled_meteor = pygame.transform.scale(meteor_img, (meteor_size, meteor_size))
-            meteor_rect = scaled_meteor.get_rect(center=(int(ax), int(ay)))
-            screen.blit(scaled_meteor, meteor_rect)
-
-        # Explosions
-        for exp in explosions[:]:
-            x, y, frame = exp
-            colors = [YELLOW, ORANGE, RED]
-            color = colors[min(frame // 2, 2)]
-            radius = 15 + frame * 3
-            alpha = max(255 - frame * 25, 0)
-            exp_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(exp_surface, (*color, alpha), (radius, radius), radius)
-            screen.blit(exp_surface, (x - radius, y - radius))
-            exp[2] += 1
-            if exp[2] > 10:
-                explosions.remove(exp)
+                # Applied on the next tick
+                clicks.append(pygame.mouse.get_pos())
+        profiler.mark("events")
+
+        for _ in sim.steps():
+            replay.record(state.ticks + 1, clicks)
+            destroyed = state.tick(clicks)
+            clicks.clear()
+
+            # Rotating Earth
+            earth_angle = (earth_angle + EARTH_SPIN) % 360
+            profiler.mark("sim")
+
+            # Explosions
+            for x, y, radius in destroyed:
+                particles.emit(x, y, EXPLOSION_PARTICLES * (radius / SMALL[1]) ** 3,
+                               speed=EXPLOSION_REACH * radius * (1 - particles.drag),
+                               life=EXPLOSION_TICKS)
+            particles.update()
+            profiler.mark("explosions")
+
+            if state.game_over:
+                end_replay()
+                return state.score
+
+        # --- Drawing (between the last two ticks) ---
+        blend = sim.alpha
+        screen.blit(galaxy_bg, (0, 0))
+        profiler.mark("background")
+        earth_frames.blit(screen, earth_angle - EARTH_SPIN * (1 - blend), (earth_x, earth_y))
+        profiler.mark("earth")
+
+        meteors = state.meteors
+        drawn_x, drawn_y, drawn_angle = meteors.interpolated(blend)
+        atlas = meteor_atlas if len(meteors) <= METEOR_BLEND_LIMIT else meteor_keyed_atlas
+        screen.blits(atlas.items(2 * meteors.radius, drawn_angle, drawn_x, drawn_y), doreturn=False)
+        profiler.mark("meteors")
+
+        particles.draw(screen, blend)
+        profiler.mark("explosions")
 
         # Score
-        score_text = score_font.render(f"Score: {score}", True, WHITE)
+        score_text = score_font.render(f"Score: {state.score}", True, WHITE)
         screen.blit(score_text, (15, 15))
+        profiler.mark("text")
+
+        profiler.draw(screen)
+        profiler.mark("profiler")
 
         pygame.display.flip()
-        clock.tick(60)
+        profiler.mark("flip")
+        clock.tick(RENDER_FPS)
+        profiler.mark("wait")
+        profiler.end_frame()
 
 
 # --- Main loop ---
-while True:
-    start_screen()
-    run_game()
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Asteroid Assault")
+    parser.add_argument("--seed", type=int64, help="play the same meteors every game")
+    parser.add_argument("--record", metavar="PATH", help="save each game's replay, numbered: PATH last.mmr "
+                                                         "writes last-1.mmr, last-2.mmr, ... (see replay.py)")
+    parser.add_argument("--waves", metavar="PATH", help="wave file to spawn meteors from (e.g. assets/waves/swarm.json)")
+    parser.add_argument("--profile", metavar="PATH", help="save frame timings here (.json or .csv) on quitting, and on F4")
+    args = parser.parse_args()
+    waves = load_waves(args.waves) if args.waves else None
+    if args.profile:
+        profiler.path = args.profile
+    try:
+        game = 0
+        while True:
+            start_screen()
+            game += 1
+            record = numbered_path(args.record, game) if args.record else None
+            game_over_screen(run_game(args.seed, record, waves))
+    except QuitGame:
+        if args.profile and profiler.frames:
+            profiler.save()
+        pygame.quit()
+        sys.exit()
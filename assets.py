@@ -0,0 +1,108 @@
+"""Fonts and images for both game modes, loaded once per process.
+
+font() and image() load an asset the first time it is asked for and keep
+it, so every screen and mode asking for the same font or image size shares
+one object. Importing this module touches neither the display nor the disk.
+
+Decoding the full-size PNG/JPG sources and scaling them down is most of the
+startup work, so image() also keeps the scaled pixels on disk, under
+assets/cache/images, as raw RGB(A) .npy arrays named after a hash of the
+source file and the target size. A later launch reads those bytes straight
+into a surface. Editing a source image changes its hash, so a stale entry
+is never used (it is just left behind).
+
+Surfaces are shared: callers must not draw onto them.
+
+    title_font = assets.font("Orbitron-Bold.ttf", 72)
+    background = assets.image("stars_minimal.jpg", (900, 600), alpha=False)
+"""
+import hashlib
+import io
+import os
+
+import numpy as np
+import pygame
+
+BASE_DIR = os.path.dirname(__file__)
+ASSETS_DIR = os.path.join(BASE_DIR, "assets")
+IMAGES_DIR = os.path.join(ASSETS_DIR, "images")
+FONTS_DIR = os.path.join(ASSETS_DIR, "fonts")
+CACHE_DIR = os.path.join(ASSETS_DIR, "cache", "images")
+CACHE_VERSION = 1
+# Used when a font file is missing, before pygame's default font
+FALLBACK_FONT = "Orbitron-Regular.ttf"
+
+_fonts = {}     # (filename, size) -> Font
+_images = {}    # (filename, size, alpha) -> converted Surface
+
+
+def font(filename, size):
+    """assets/fonts/filename at size, falling back to FALLBACK_FONT, then pygame's default."""
+    key = (filename, size)
+    if key not in _fonts:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        for name in dict.fromkeys((filename, FALLBACK_FONT)):
+            try:
+                _fonts[key] = pygame.font.Font(os.path.join(FONTS_DIR, name), size)
+                break
+            except (pygame.error, OSError):
+                print(f"Warning: could not load font {name}")
+        else:
+            _fonts[key] = pygame.font.Font(None, size)
+    return _fonts[key]
+
+
+def image(filename, size=None, alpha=True):
+    """assets/images/filename scaled to size (w, h), converted for the display.
+
+    Raises FileNotFoundError if the file is missing and pygame.error if it
+    can't be decoded. Before the display is set up the surface can't be
+    converted, and is returned without being kept in memory.
+    """
+    key = (filename, None if size is None else tuple(size), alpha)
+    surface = _images.get(key)
+    if surface is None:
+        surface = _load(*key)
+        if pygame.display.get_surface() is not None:
+            surface = _images[key] = surface.convert_alpha() if alpha else surface.convert()
+    return surface
+
+
+def clear():
+    """Forget the loaded fonts and images (the disk cache stays)."""
+    _fonts.clear()
+    _images.clear()
+
+
+def _load(filename, size, alpha):
+    fmt = "RGBA" if alpha else "RGB"
+    with open(os.path.join(IMAGES_DIR, filename), "rb") as f:
+        source = f.read()
+    digest = hashlib.sha1(source)
+    digest.update(repr((CACHE_VERSION, size, fmt)).encode())
+    stem = os.path.splitext(filename)[0]
+    cache_path = os.path.join(CACHE_DIR, f"{stem}-{digest.hexdigest()[:16]}.npy")
+    try:
+        pixels = np.load(cache_path)
+    except (OSError, ValueError, EOFError):
+        surface = pygame.image.load(io.BytesIO(source), filename)
+        if size is not None:
+            surface = pygame.transform.scale(surface, size)
+        width, height = surface.get_size()
+        pixels = np.frombuffer(pygame.image.tobytes(surface, fmt), np.uint8).reshape(height, width, len(fmt))
+        _store(cache_path, pixels)
+    height, width = pixels.shape[:2]
+    # frombuffer shares the array's memory; converting (in image()) copies it
+    return pygame.image.frombuffer(pixels, (width, height), fmt)
+
+
+def _store(path, pixels):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so a crash never leaves a truncated entry behind
+        tmp_path = path + ".tmp.npy"
+        np.save(tmp_path, pixels)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: could not cache image at {path}: {e}")
@@ -0,0 +1,207 @@
+"""Headless bulk scenario evaluation.
+
+Streams scenarios from CSV or JSONL (a file or stdin) through the impact
+model and risk assessment in fixed-size batches and streams the results
+back out, so memory use does not grow with the input. Importing this module
+does not touch pygame, a display or any image.
+
+Input fields: diameter (m) and velocity (km/s) are required; angle (deg),
+material and location default to the Exploration Mode slider defaults.
+Any other fields (e.g. an id) are passed through unchanged. Rows with a
+non-finite or non-positive diameter or velocity, an angle outside
+[0, 90] or a material or location that isn't a string are skipped and
+reported.
+
+    python batch_cli.py scenarios.csv -o results.jsonl
+    cat scenarios.jsonl | python batch_cli.py --output-format csv > out.csv
+"""
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+from impact_model import RISK_MESSAGES, risk_flags, simulate_impacts
+
+DEFAULT_BATCH_SIZE = 10_000
+DEFAULTS = {"angle": 45.0, "material": "Rock", "location": "Land"}
+NUMERIC_FIELDS = ("diameter", "velocity", "angle")
+RESULT_FIELDS = ("mass", "energy", "effective_energy", "crater", "risks")
+ENTRY_FIELDS = ("airburst_altitude", "airburst_energy")
+
+
+# --- Readers (generators: one record at a time) ---
+def read_jsonl(stream):
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if line:
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, e
+
+
+def read_csv(stream):
+    # Line numbers count the header as line 1
+    for line_no, row in enumerate(csv.DictReader(stream), 2):
+        yield line_no, row
+
+
+def sniff_format(stream):
+    """Peek at the first non-blank character: '{' means JSONL, else CSV."""
+    first = stream.buffer.peek(64)[:64] if hasattr(stream, "buffer") else b""
+    return "jsonl" if first.lstrip().startswith(b"{") else "csv"
+
+
+# --- Writers ---
+class JsonlWriter:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, row):
+        self.stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+class CsvWriter:
+    def __init__(self, stream):
+        self.stream = stream
+        self.writer = None
+
+    def write(self, row):
+        if self.writer is None:
+            # Columns are fixed by the first row; later extras are dropped
+            self.writer = csv.DictWriter(self.stream, fieldnames=list(row), extrasaction="ignore")
+            self.writer.writeheader()
+        self.writer.writerow(row)
+
+
+# --- Batch evaluation ---
+def _parse(record):
+    """Validated scenario values for one input record."""
+    if isinstance(record, Exception):
+        raise ValueError(f"invalid JSON: {record}")
+    values = {}
+    for field in NUMERIC_FIELDS:
+        raw = record.get(field)
+        if raw in (None, ""):
+            if field not in DEFAULTS:
+                raise ValueError(f"missing {field}")
+            raw = DEFAULTS[field]
+        if isinstance(raw, bool):
+            raise ValueError(f"{field} must be a number, got {raw!r}")
+        values[field] = value = float(raw)
+        if not math.isfinite(value):
+            raise ValueError(f"{field} must be finite, got {raw!r}")
+    for field in ("diameter", "velocity"):
+        if values[field] <= 0:
+            raise ValueError(f"{field} must be positive, got {values[field]:g}")
+    if not 0 <= values["angle"] <= 90:
+        raise ValueError(f"angle must be in [0, 90] degrees, got {values['angle']:g}")
+    # A number here would be taken as a density or a land mask downstream
+    for field in ("material", "location"):
+        raw = record.get(field)
+        if raw in (None, ""):
+            raw = DEFAULTS[field]
+        elif not isinstance(raw, str):
+            raise ValueError(f"{field} must be a string, got {raw!r}")
+        values[field] = raw
+    return values
+
+
+def evaluate_batch(records, entry=False):
+    """Run one batch of parsed scenario dicts; returns per-row result dicts.
+
+    entry=True adds the atmospheric entry stage (and the airburst fields).
+    """
+    columns = {field: np.array([r[field] for r in records]) for field in NUMERIC_FIELDS}
+    material = np.array([r["material"] for r in records])
+    location = np.array([r["location"] for r in records])
+
+    impact = simulate_impacts(columns["diameter"], columns["velocity"], columns["angle"], material, location,
+                              entry)
+    flags = risk_flags(columns["diameter"], columns["angle"], location, impact["energy"])
+
+    # Convert columns to Python lists once per batch, not per value
+    fields = RESULT_FIELDS + ENTRY_FIELDS if entry else RESULT_FIELDS
+    out = {key: impact[key].tolist() for key in fields if key != "risks"}
+    flag_lists = {code: flags[code].tolist() for code in RISK_MESSAGES}
+    out["risks"] = [[code for code in RISK_MESSAGES if flag_lists[code][i]] for i in range(len(records))]
+    return [{key: out[key][i] for key in fields} for i in range(len(records))]
+
+
+def run(in_stream, out_stream, input_format, output_format, batch_size=DEFAULT_BATCH_SIZE,
+        risk_text=False, entry=False, errors=sys.stderr):
+    """Stream in_stream -> out_stream. Returns (rows written, rows skipped)."""
+    reader = read_jsonl(in_stream) if input_format == "jsonl" else read_csv(in_stream)
+    writer = JsonlWriter(out_stream) if output_format == "jsonl" else CsvWriter(out_stream)
+    written = skipped = 0
+
+    while True:
+        chunk = list(itertools.islice(reader, batch_size))
+        if not chunk:
+            break
+        records, parsed = [], []
+        for line_no, record in chunk:
+            try:
+                parsed.append(_parse(record))
+                records.append(record)
+            except (ValueError, TypeError, AttributeError) as e:
+                skipped += 1
+                print(f"line {line_no}: skipped ({e})", file=errors)
+        if not parsed:
+            continue
+
+        for record, values, result in zip(records, parsed, evaluate_batch(parsed, entry)):
+            risks = result.pop("risks")
+            if risk_text:
+                risks = [RISK_MESSAGES[code] for code in risks]
+            # Pass-through fields, then the scenario as evaluated (defaults filled in)
+            row = dict(record)
+            row.update(values)
+            row.update(result)
+            # CSV has no lists; JSONL keeps them
+            row["risks"] = risks if output_format == "jsonl" else ";".join(risks)
+            writer.write(row)
+        written += len(parsed)
+        out_stream.flush()
+    return written, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate impact scenarios from CSV/JSONL in batches.")
+    parser.add_argument("input", nargs="?", default="-", help="CSV or JSONL file, '-' for stdin (default)")
+    parser.add_argument("-o", "--output", default="-", help="output file, '-' for stdout (default)")
+    parser.add_argument("--input-format", choices=("csv", "jsonl"), help="default: from extension or content")
+    parser.add_argument("--output-format", choices=("csv", "jsonl"), help="default: from extension, else input format")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--risk-text", action="store_true", help="write full risk messages instead of codes")
+    parser.add_argument("--entry", action="store_true",
+                        help="simulate atmospheric entry first (adds airburst_altitude/airburst_energy)")
+    args = parser.parse_args(argv)
+
+    def format_of(path):
+        ext = os.path.splitext(path)[1].lower()
+        return {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(ext)
+
+    in_stream = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    out_stream = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        input_format = args.input_format or format_of(args.input) or sniff_format(in_stream)
+        output_format = args.output_format or format_of(args.output) or input_format
+        written, skipped = run(in_stream, out_stream, input_format, output_format,
+                               args.batch_size, args.risk_text, args.entry)
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+        if out_stream is not sys.stdout:
+            out_stream.close()
+    print(f"{written} scenarios evaluated, {skipped} skipped", file=sys.stderr)
+    return 1 if skipped and not written else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
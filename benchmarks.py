@@ -0,0 +1,528 @@
+"""Headless benchmarks: physics throughput and per-frame timing.
+
+Physics: scalar calls per second of calculate_mass, impact_energy,
+estimate_crater_size and assess_risks, and scenarios per second through the
+batch engine (simulate_impacts / risk_flags) at a few batch sizes.
+
+Particles: update and draw time of a full 50k-particle explosion pool.
+
+Startup: wall time from launching a fresh interpreter to the first frame
+shown by each mode, with an empty image cache and then a warm one.
+
+Scene switches: time from a switch request to the first frame of the other
+mode, both hosted by one scenes.SceneManager.
+
+Swarm: assets/waves/swarm.json, which ramps up to 10k+ meteors on screen,
+with per-tick simulation time (game_sim alone) and per-frame time (Game
+Mode drawing it), by meteor count.
+
+Frames: Exploration_Mode.main and Game_Mode.run_game run under the SDL
+dummy video driver with scripted input (slider drags and Apply clicks;
+clicking the meteor closest to Earth). The frame clock is uncapped, so a
+frame time is the work done between two clock.tick() calls, and the
+fixed-timestep simulation is driven one tick per frame so every run plays
+the same game.
+
+    python benchmarks.py --json bench.json
+    python benchmarks.py --only frames --frames 600 --compare bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+# Must be set before pygame is imported anywhere
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+import fixed_step
+import impact_model
+from impact_model import (assess_risks, calculate_mass, estimate_crater_size, impact_energy,
+                          risk_flags, simulate_impacts)
+
+BATCH_SIZES = (1_000, 100_000, 1_000_000)
+WARMUP_FRAMES = 10
+PERCENTILES = (50, 95, 99)
+SWARM_WAVES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "waves", "swarm.json")
+SWARM_BUCKETS = ((0, 1_000, "under_1k"), (1_000, 5_000, "1k_5k"), (5_000, 10_000, "5k_10k"),
+                 (10_000, None, "10k_plus"))
+# Metrics where a bigger number is better (everything else is a time)
+HIGHER_IS_BETTER = ("per_s",)
+
+
+# --- Physics ---
+def _rate(fn, n):
+    """Calls of fn per second over n calls (best of three)."""
+    best = 0.0
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(n):
+            fn()
+        best = max(best, n / (time.perf_counter() - start))
+    return best
+
+
+def bench_physics(scalar_calls=20_000, batch_sizes=BATCH_SIZES, seed=0):
+    scalar = {
+        "calculate_mass": lambda: calculate_mass(500, "Rock"),
+        "impact_energy": lambda: impact_energy(500, 25, "Rock"),
+        "estimate_crater_size": lambda: estimate_crater_size(500, 25, 45, "Rock", "Land"),
+        "assess_risks": lambda: assess_risks(500, 25, 45, "Rock", "Land"),
+    }
+    results = {"scalar_calls_per_s": {name: _rate(fn, scalar_calls) for name, fn in scalar.items()}}
+
+    rng = np.random.default_rng(seed)
+    batch = {}
+    for size in batch_sizes:
+        d = rng.uniform(50, 10000, size)
+        v = rng.uniform(5, 70, size)
+        a = rng.uniform(0, 90, size)
+        m = rng.choice(list(impact_model.DENSITIES), size)
+        loc = rng.choice(["Land", "Ocean"], size)
+        repeats = max(1, 2_000_000 // size)
+        impact = simulate_impacts(d, v, a, m, loc)
+        batch[size] = {
+            "simulate_impacts_per_s": _rate(lambda: simulate_impacts(d, v, a, m, loc), repeats) * size,
+            "risk_flags_per_s": _rate(lambda: risk_flags(d, a, loc, impact["energy"]), repeats) * size,
+        }
+        if size <= 100_000:
+            batch[size]["simulate_impacts_entry_per_s"] = (
+                _rate(lambda: simulate_impacts(d, v, a, m, loc, entry=True), 1) * size)
+    results["batch_scenarios_per_s"] = batch
+    return results
+
+
+# --- Frame timing ---
+class _ScriptedRun:
+    """Patches pygame so a game loop runs headless, uncapped and scripted.
+
+    script(frame) is called before every display flip; it may post events
+    and move the (virtual) cursor. After `frames` timed frames a QUIT event
+    is posted.
+    """
+
+    def __init__(self, pygame, frames, script):
+        self.pygame = pygame
+        self.frames = frames
+        self.script = script
+        self.cursor = (0, 0)
+        self.ticks = []
+        self.flips = 0
+
+    def __enter__(self):
+        pg = self.pygame
+        run = self
+        self._saved = (pg.time.Clock, pg.display.flip, pg.display.update, pg.mouse.get_pos)
+        real_flip, real_update = pg.display.flip, pg.display.update
+
+        class BenchClock:
+            def tick(self, framerate=0):
+                run.ticks.append(time.perf_counter())
+                if len(run.ticks) == run.frames + WARMUP_FRAMES + 1:
+                    pg.event.post(pg.event.Event(pg.QUIT))
+                return 0
+
+            def get_fps(self):
+                return 0.0
+
+        def before_flip():
+            run.flips += 1
+            run.script(run, len(run.ticks))
+
+        pg.time.Clock = BenchClock
+        pg.display.flip = lambda: (before_flip(), real_flip())[1]
+        pg.display.update = lambda *args: (before_flip(), real_update(*args))[1]
+        pg.mouse.get_pos = lambda: run.cursor
+        return self
+
+    def __exit__(self, *exc):
+        pg = self.pygame
+        pg.time.Clock, pg.display.flip, pg.display.update, pg.mouse.get_pos = self._saved
+        return False
+
+    def click(self, pos, button=1):
+        pg = self.pygame
+        self.cursor = pos
+        pg.event.post(pg.event.Event(pg.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0)))
+        pg.event.post(pg.event.Event(pg.MOUSEBUTTONDOWN, pos=pos, button=button))
+        pg.event.post(pg.event.Event(pg.MOUSEBUTTONUP, pos=pos, button=button))
+
+    def drag(self, start, end):
+        pg = self.pygame
+        pg.event.post(pg.event.Event(pg.MOUSEBUTTONDOWN, pos=start, button=1))
+        pg.event.post(pg.event.Event(pg.MOUSEMOTION, pos=end, rel=(end[0] - start[0], end[1] - start[1]),
+                                     buttons=(1, 0, 0)))
+        pg.event.post(pg.event.Event(pg.MOUSEBUTTONUP, pos=end, button=1))
+        self.cursor = end
+
+    def sim_clock(self):
+        """Virtual time for FixedTimestep: one simulation tick per frame."""
+        return len(self.ticks) / fixed_step.SIM_HZ
+
+    def fixed_timestep(self, *args, **kwargs):
+        return fixed_step.FixedTimestep(*args, clock=self.sim_clock, **kwargs)
+
+    def frame_times_ms(self):
+        ticks = np.array(self.ticks[WARMUP_FRAMES:])
+        return np.diff(ticks) * 1000
+
+
+def _summary(frame_ms):
+    summary = {f"p{q}_ms": float(np.percentile(frame_ms, q)) for q in PERCENTILES}
+    summary.update({
+        "mean_ms": float(frame_ms.mean()),
+        "max_ms": float(frame_ms.max()),
+        "frames": int(len(frame_ms)),
+        "fps": float(1000 / frame_ms.mean()),
+    })
+    return summary
+
+
+def bench_exploration(frames=300):
+    import pygame
+    import Exploration_Mode as E
+
+    # Widgets are built inside main(); track them to script against their rects
+    widgets = {"sliders": [], "buttons": {}}
+
+    class TrackedSlider(E.Slider):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            widgets["sliders"].append(self)
+
+    class TrackedButton(E.Button):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            widgets["buttons"][self.text] = self
+
+    rng = random.Random(0)
+
+    def script(run, frame):
+        if frame % 3 == 0 and widgets["sliders"]:
+            # Drag a slider handle somewhere new (live preview path)
+            slider = rng.choice(widgets["sliders"])
+            y = slider.rect.centery
+            run.drag((int(slider.handle_pos), y), (rng.randrange(slider.rect.left, slider.rect.right), y))
+        if frame % 60 == 5 and "Apply" in widgets["buttons"]:
+            run.click(widgets["buttons"]["Apply"].rect.center)
+
+    saved = E.Slider, E.Button, E.FixedTimestep
+    with _ScriptedRun(pygame, frames, script) as run:
+        E.Slider, E.Button, E.FixedTimestep = TrackedSlider, TrackedButton, run.fixed_timestep
+        try:
+            E.main()
+        except SystemExit:
+            pass
+        finally:
+            E.Slider, E.Button, E.FixedTimestep = saved
+    return _summary(run.frame_times_ms())
+
+
+def bench_game(frames=600, spawn_every=20):
+    import pygame
+    import Game_Mode as G
+
+    random.seed(0)
+    play_button = (G.WIDTH // 2, G.HEIGHT // 2 + 110)
+    retry_button = (G.WIDTH // 2 - 140, G.HEIGHT // 2 + 50)
+    state = {"in_game": False}
+
+    def script(run, frame):
+        if not run.ticks or not state["in_game"]:
+            # Start screen (or game over): press PLAY / RETRY
+            run.click(play_button if not run.ticks else retry_button)
+            state["in_game"] = True
+            return
+        meteors = G.state.meteors
+        if frame % 4 == 0 and len(meteors):
+            # Click the meteor closest to Earth
+            i = int(np.argmax(meteors.y))
+            run.click((int(meteors.x[i]), int(meteors.y[i])))
+
+    saved = G.FixedTimestep, G.spawn_interval
+    with _ScriptedRun(pygame, frames, script) as run:
+        G.FixedTimestep = run.fixed_timestep
+        G.spawn_interval = spawn_every * 1000 / fixed_step.SIM_HZ
+        try:
+            while True:
+                G.start_screen()
+                score = G.run_game()
+                state["in_game"] = False
+                G.game_over_screen(score)
+        except G.QuitGame:
+            pass
+        finally:
+            G.FixedTimestep, G.spawn_interval = saved
+    return _summary(run.frame_times_ms())
+
+
+def bench_particles(frames=300, count=50_000, size=(1280, 800), seed=0):
+    """update() + draw() of a full particle pool filling most of the screen."""
+    import pygame
+    from particles import ParticleSystem
+
+    pygame.init()
+    screen = pygame.display.set_mode(size)
+    particles = ParticleSystem(capacity=count, seed=seed)
+    # Long-lived, so the pool stays full for the whole run
+    particles.emit(size[0] / 2, size[1] / 2, count, speed=min(size) / 2 * (1 - particles.drag),
+                   life=10 * (frames + WARMUP_FRAMES))
+    ticks = []
+    for _ in range(frames + WARMUP_FRAMES + 1):
+        screen.fill((0, 0, 0))
+        particles.update()
+        particles.draw(screen, 0.5)
+        ticks.append(time.perf_counter())
+    summary = _summary(np.diff(ticks[WARMUP_FRAMES:]) * 1000)
+    summary["particles"] = particles.count
+    return summary
+
+
+# --- Startup ---
+# Run in a fresh interpreter; exits as soon as the mode shows its first frame
+_FIRST_FRAME = """
+import os, sys
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+import pygame
+import assets
+assets.CACHE_DIR = sys.argv[2]
+pygame.display.flip = pygame.display.update = lambda *args: os._exit(0)
+if sys.argv[1] == "game":
+    import Game_Mode
+    Game_Mode.start_screen()
+else:
+    import Exploration_Mode
+    Exploration_Mode.main()
+"""
+
+
+def bench_startup(runs=3):
+    """Seconds from process launch to first frame, per mode."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for mode in ("game", "exploration"):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            times = []
+            for _ in range(runs + 1):
+                start = time.perf_counter()
+                subprocess.run([sys.executable, "-c", _FIRST_FRAME, mode, cache_dir], cwd=here, check=True,
+                               stdout=subprocess.DEVNULL)
+                times.append(time.perf_counter() - start)
+        results[mode] = {"cold_cache_s": times[0], "warm_cache_s": min(times[1:])}
+    return results
+
+
+def bench_scene_switch(switches=10, frames_per_scene=1):
+    """Request to first frame, alternating Exploration and the Game Mode menu.
+
+    The menu draws a single frame and then waits for input, so with it in
+    the rotation frames_per_scene must stay 1.
+    """
+    import pygame
+    import scenes
+
+    manager = scenes.SceneManager(seed=0)
+    order = ("exploration", "game_menu")
+    times = []
+    pending = {"scene": None, "since": 0.0, "frames": 0}
+
+    def script(run, frame):
+        if pending["scene"] is not None:
+            if manager.current != pending["scene"]:
+                return      # the last frame of the scene being left
+            times.append((time.perf_counter() - pending["since"]) * 1000)
+            pending["scene"] = None
+        pending["frames"] += 1
+        if pending["frames"] < frames_per_scene:
+            return
+        pending["frames"] = 0
+        if len(times) == switches:
+            manager.request(scenes.QUIT)
+            return
+        pending["scene"], pending["since"] = order[len(times) % 2], time.perf_counter()
+        manager.request(pending["scene"])
+
+    with _ScriptedRun(pygame, sys.maxsize, script):
+        manager.run("game_menu")
+    # The first switch to Exploration also loads it
+    return {"first_exploration_ms": times[0], "switch_p50_ms": float(np.median(times[1:])),
+            "switch_max_ms": max(times[1:]), "switches": len(times)}
+
+
+def _by_meteor_count(counts, times_ms):
+    counts, times_ms = np.asarray(counts), np.asarray(times_ms)
+    buckets = {}
+    for low, high, name in SWARM_BUCKETS:
+        inside = (counts >= low) & (counts < (high or np.inf))
+        if inside.any():
+            buckets[name] = float(np.median(times_ms[inside]))
+    return buckets
+
+
+def bench_swarm(ticks=1000, seed=0):
+    """p50 tick and frame times by meteor count under the swarm waves."""
+    import pygame
+    import Game_Mode as G
+    from game_sim import GameState
+    from waves import load_waves
+
+    waves = load_waves(SWARM_WAVES)
+    state = GameState(seed, waves=waves)
+    counts, tick_ms = [], []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        state.tick()
+        tick_ms.append((time.perf_counter() - start) * 1000)
+        counts.append(len(state.meteors))
+
+    frame_counts = []
+
+    def script(run, frame):
+        if G.state is not None:
+            frame_counts.append(len(G.state.meteors))
+
+    saved = G.FixedTimestep
+    with _ScriptedRun(pygame, ticks - WARMUP_FRAMES, script) as run:
+        G.FixedTimestep = run.fixed_timestep
+        try:
+            G.run_game(seed, waves=waves)
+        except G.QuitGame:
+            pass
+        finally:
+            G.FixedTimestep = saved
+    frame_ms = run.frame_times_ms()
+    frame_counts = frame_counts[WARMUP_FRAMES:WARMUP_FRAMES + len(frame_ms)]
+    return {"max_meteors": max(counts), "tick_p50_ms": _by_meteor_count(counts, tick_ms),
+            "frame_p50_ms": _by_meteor_count(frame_counts, frame_ms[:len(frame_counts)])}
+
+
+# --- Reporting ---
+def _flatten(data, prefix=""):
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + "."))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(current, baseline, tolerance):
+    """Print changes vs a baseline run; returns the regressed metric names."""
+    now, before = _flatten(current), _flatten(baseline)
+    regressions = []
+    for name in sorted(now.keys() & before.keys()):
+        if name.startswith("meta.") or name.endswith("frames") or not before[name]:
+            continue
+        change = now[name] / before[name] - 1
+        higher_is_better = name.endswith(HIGHER_IS_BETTER) or name.endswith("fps")
+        worse = -change if higher_is_better else change
+        flag = "REGRESSION" if worse > tolerance else ""
+        if flag:
+            regressions.append(name)
+        print(f"  {name:<60} {before[name]:>14.4g} -> {now[name]:>14.4g}  {change:+7.1%} {flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Physics and frame-time benchmarks (headless)")
+    parser.add_argument("--only", choices=("physics", "particles", "startup", "scenes", "swarm", "exploration",
+                                           "game", "frames"))
+    parser.add_argument("--frames", type=int, default=300, help="timed frames per game loop")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against an earlier --json file")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    run_physics = args.only in (None, "physics")
+    run_particles = args.only in (None, "particles")
+    run_startup = args.only in (None, "startup")
+    run_scenes = args.only in (None, "scenes")
+    run_swarm = args.only in (None, "swarm")
+    run_exploration = args.only in (None, "frames", "exploration")
+    run_game = args.only in (None, "frames", "game")
+
+    import numpy
+    results = {"meta": {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "platform": platform.platform(),
+        "video_driver": os.environ["SDL_VIDEODRIVER"],
+    }}
+    if run_physics:
+        results["physics"] = bench_physics()
+        print("Scalar calls/s:")
+        for name, rate in results["physics"]["scalar_calls_per_s"].items():
+            print(f"  {name:<22} {rate:>14,.0f}")
+        print("Batch scenarios/s:")
+        for size, rates in results["physics"]["batch_scenarios_per_s"].items():
+            line = "  ".join(f"{name[:-6]} {rate:,.0f}" for name, rate in rates.items())
+            print(f"  n={size:<10,} {line}")
+
+    if run_particles:
+        results["particles"] = bench_particles()
+        s = results["particles"]
+        print(f"Particles: {s['particles']:,} live  p50 {s['p50_ms']:.2f} ms  p95 {s['p95_ms']:.2f} ms  "
+              f"({s['fps']:.0f} fps)")
+
+    if run_startup:
+        results["startup"] = bench_startup()
+        print("Startup to first frame (s):")
+        for mode, s in results["startup"].items():
+            print(f"  {mode:<12} cold cache {s['cold_cache_s']:.3f}  warm cache {s['warm_cache_s']:.3f}")
+
+    if run_scenes:
+        results["scenes"] = bench_scene_switch()
+        s = results["scenes"]
+        print(f"Scene switches: p50 {s['switch_p50_ms']:.1f} ms  max {s['switch_max_ms']:.1f} ms  "
+              f"(first Exploration {s['first_exploration_ms']:.1f} ms, {s['switches']} switches)")
+
+    if run_swarm:
+        results["swarm"] = bench_swarm()
+        s = results["swarm"]
+        print(f"Swarm (up to {s['max_meteors']:,} meteors), p50 ms:")
+        for _, _, name in SWARM_BUCKETS:
+            if name in s["tick_p50_ms"]:
+                print(f"  {name:<10} tick {s['tick_p50_ms'][name]:6.2f}  "
+                      f"frame {s['frame_p50_ms'].get(name, float('nan')):6.2f}")
+
+    frames = {}
+    if run_exploration:
+        frames["exploration"] = bench_exploration(args.frames)
+    if run_game:
+        frames["game"] = bench_game(args.frames)
+    if frames:
+        import pygame
+        results["meta"]["pygame"] = pygame.version.ver
+        results["frames"] = frames
+        print("Frame times (ms):")
+        for name, s in frames.items():
+            print(f"  {name:<12} p50 {s['p50_ms']:6.2f}  p95 {s['p95_ms']:6.2f}  p99 {s['p99_ms']:6.2f}  "
+                  f"max {s['max_ms']:6.2f}  ({s['frames']} frames, {s['fps']:.0f} fps uncapped)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"Wrote {args.json}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.compare}:")
+        if compare(json.loads(json.dumps(results, default=str)), baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""Global damage raster for one impact point.
+
+The globe is an equirectangular grid (row 0 at the north pole, column 0 at
+180 W) split into square tiles. For an impact of a given energy at a
+lat/lon point, every cell gets a damage level 0-3 for each hazard in
+HAZARDS: blast overpressure, thermal fluence and ground shaking. Only tiles
+whose bounding cap overlaps the damage cap around the point are evaluated;
+everything else is undamaged and never touched.
+
+Tiles are cached on (energy, burst altitude, tile row, point cell relative
+to the tile), so moving the point only evaluates tiles whose geometry
+relative to the point actually changed, and moving it back is free.
+
+    python damage_raster.py --energy 1e9 --lat 40.7 --lon -74 -o damage.npz
+"""
+import argparse
+import math
+import sys
+import time
+
+import numpy as np
+
+from impact_model import TNT_EQUIVALENT
+from result_cache import LRUCache
+
+EARTH_RADIUS_KM = 6371.0
+DEFAULT_RESOLUTION = 0.1   # degrees per cell
+DEFAULT_TILE_SIZE = 150    # cells per tile side
+DEFAULT_CACHE_SIZE = 2048  # tiles
+
+# --- Damage physics (Collins et al. 2005, "Earth Impact Effects Program") ---
+KILOTON = 4.184e12               # J
+PEAK_OVERPRESSURE = 75000.0      # Pa, at CROSSOVER_RANGE for a 1 kt burst
+CROSSOVER_RANGE = 0.290          # km
+LUMINOUS_EFFICIENCY = 3e-3       # fraction of the energy radiated as heat
+FIREBALL_RADIUS = 0.002          # m per J^(1/3)
+
+# Thresholds for damage levels 1, 2, 3 per hazard
+HAZARDS = {
+    # Pa: windows shatter, houses collapse, concrete buildings collapse
+    "overpressure": (6.9e3, 2.8e4, 1.4e5),
+    # J/m^2: first-degree burns, third-degree burns, clothing/grass ignites
+    "thermal": (1.3e5, 4.2e5, 1.0e6),
+    # effective Richter magnitude: felt, damage to weak buildings, widespread damage
+    "seismic": (4.0, 5.5, 7.0),
+}
+
+
+def overpressure(distance_km, energy_j, burst_altitude_km=0.0):
+    """Peak overpressure (Pa), scaled from a 1 kt reference burst."""
+    slant = np.hypot(distance_km, burst_altitude_km)
+    scaled = np.maximum(slant, 1e-3) / (energy_j / KILOTON) ** (1 / 3)
+    ratio = CROSSOVER_RANGE / scaled
+    return PEAK_OVERPRESSURE * ratio / 4 * (1 + 3 * ratio ** 1.3)
+
+
+def thermal_fluence(distance_km, energy_j, burst_altitude_km=0.0):
+    """Radiant energy per unit area (J/m^2) at the given distance.
+
+    Zero beyond the horizon of the fireball top (burst altitude plus
+    fireball radius).
+    """
+    slant_m = np.maximum(np.hypot(distance_km, burst_altitude_km), 1e-3) * 1000
+    fluence = LUMINOUS_EFFICIENCY * energy_j / (2 * math.pi * slant_m ** 2)
+    top_km = burst_altitude_km + FIREBALL_RADIUS * energy_j ** (1 / 3) / 1000
+    horizon_km = EARTH_RADIUS_KM * math.acos(EARTH_RADIUS_KM / (EARTH_RADIUS_KM + top_km))
+    return np.where(distance_km <= horizon_km, fluence, 0.0)
+
+
+def seismic_magnitude(distance_km, energy_j, burst_altitude_km=0.0):
+    """Effective Richter magnitude felt at the given distance.
+
+    Airbursts do not couple into the ground, so they give no shaking.
+    """
+    distance_km = np.asarray(distance_km, dtype=np.float64)
+    if burst_altitude_km > 0:
+        return np.zeros(distance_km.shape)
+    magnitude = 0.67 * math.log10(energy_j) - 5.87
+    distance_deg = distance_km / (EARTH_RADIUS_KM * math.pi / 180)
+    near = magnitude - 0.0238 * distance_km
+    mid = magnitude - 0.0048 * distance_km - 1.1644
+    far = magnitude - 1.66 * np.log10(np.maximum(distance_deg, 1e-9)) - 6.399
+    return np.where(distance_km < 60, near, np.where(distance_km < 700, mid, far))
+
+
+HAZARD_FUNCTIONS = {
+    "overpressure": overpressure,
+    "thermal": thermal_fluence,
+    "seismic": seismic_magnitude,
+}
+
+
+def damage_radii(energy, burst_altitude_km=0.0):
+    """Surface distance (km) out to which each hazard reaches each level.
+
+    energy is in the units of simulate_impacts()["energy"]. Returns
+    {hazard: (r1, r2, r3)}; 0 where the level is never reached.
+    """
+    energy_j = energy * TNT_EQUIVALENT
+    distances = np.concatenate(([0.0], np.geomspace(1e-3, math.pi * EARTH_RADIUS_KM, 4000)))
+    radii = {}
+    for hazard, thresholds in HAZARDS.items():
+        # All three hazards fall off monotonically with distance
+        profile = HAZARD_FUNCTIONS[hazard](distances, energy_j, burst_altitude_km)
+        radii[hazard] = tuple(float(distances[profile >= t].max(initial=0.0)) for t in thresholds)
+    return radii
+
+
+# --- Raster ---
+class DamageRaster:
+    """Tiled equirectangular damage raster with a per-tile result cache."""
+
+    def __init__(self, resolution=DEFAULT_RESOLUTION, tile_size=DEFAULT_TILE_SIZE,
+                 cache_size=DEFAULT_CACHE_SIZE):
+        self.resolution = resolution
+        self.tile_size = tile_size
+        self.shape = (round(180 / resolution), round(360 / resolution))
+        if self.shape[0] % tile_size or self.shape[1] % tile_size:
+            raise ValueError(f"tile_size {tile_size} does not divide the {self.shape} grid")
+        self.tile_rows = self.shape[0] // tile_size
+        self.tile_cols = self.shape[1] // tile_size
+        self.cache = LRUCache(cache_size)
+        self.stats = {"tiles_tested": 0, "tiles_in_cap": 0, "tiles_evaluated": 0}
+
+        # Cell-center coordinates in radians
+        self.lat = np.radians(90 - (np.arange(self.shape[0]) + 0.5) * resolution)
+        self.lon = np.radians(-180 + (np.arange(self.shape[1]) + 0.5) * resolution)
+        self._cos_lat = np.cos(self.lat)
+
+        # Bounding cap of every tile: center unit vector + angular radius
+        # reaching its farthest corner (the farthest point of a lat/lon box)
+        edges_lat = np.radians(90 - np.arange(self.tile_rows + 1) * tile_size * resolution)
+        edges_lon = np.radians(-180 + np.arange(self.tile_cols + 1) * tile_size * resolution)
+        center_lat = (edges_lat[:-1] + edges_lat[1:])[:, None] / 2
+        center_lon = (edges_lon[:-1] + edges_lon[1:])[None, :] / 2
+        self._tile_centers = _unit_vectors(center_lat, center_lon)
+        radius = np.zeros((self.tile_rows, self.tile_cols))
+        for lat_edge in (edges_lat[:-1], edges_lat[1:]):
+            for lon_edge in (edges_lon[:-1], edges_lon[1:]):
+                corner = _unit_vectors(lat_edge[:, None], lon_edge[None, :])
+                radius = np.maximum(radius, _angle_between(self._tile_centers, corner))
+        self._tile_radius = radius
+
+    def cell_index(self, lat, lon):
+        """Row and column of the cell containing lat/lon (degrees)."""
+        i = min(int((90 - lat) / self.resolution), self.shape[0] - 1)
+        j = int(((lon + 180) % 360) / self.resolution) % self.shape[1]
+        return max(i, 0), j
+
+    def tiles_in_cap(self, lat, lon, radius_km):
+        """(row, col) of every tile whose bounding cap overlaps the cap of
+        radius_km around lat/lon."""
+        point = _unit_vectors(np.radians(lat), np.radians(lon))
+        separation = _angle_between(self._tile_centers, point)
+        hit = separation <= radius_km / EARTH_RADIUS_KM + self._tile_radius
+        self.stats["tiles_tested"] += hit.size
+        return [(int(row), int(col)) for row, col in np.argwhere(hit)]
+
+    def evaluate(self, energy, lat, lon, burst_altitude_km=0.0):
+        """Damage levels around an impact at lat/lon (degrees).
+
+        energy is in the units of simulate_impacts()["energy"]. The point is
+        snapped to the center of its cell. Returns {(row, col): tile} for
+        the damaged tiles only, where tile maps each hazard to an int8
+        array of levels 0-3 (tile_size x tile_size).
+        """
+        i, j = self.cell_index(lat, lon)
+        lat, lon = math.degrees(self.lat[i]), math.degrees(self.lon[j])
+        radii = damage_radii(energy, burst_altitude_km)
+        reach = max(r[0] for r in radii.values())
+        if reach <= 0:
+            return {}
+
+        tiles = {}
+        for row, col in self.tiles_in_cap(lat, lon, reach):
+            self.stats["tiles_in_cap"] += 1
+            # Tiles in a row only differ by a longitude shift, so the tile
+            # depends on the point only through its row and column offset
+            offset = (j - col * self.tile_size) % self.shape[1]
+            key = (energy, burst_altitude_km, row, i, offset)
+            tile = self.cache.get_or_compute(
+                key, lambda: self._evaluate_tile(row, col, i, j, energy, burst_altitude_km))
+            if tile is not None:
+                tiles[row, col] = tile
+        return tiles
+
+    def _evaluate_tile(self, row, col, i, j, energy, burst_altitude_km):
+        self.stats["tiles_evaluated"] += 1
+        rows = slice(row * self.tile_size, (row + 1) * self.tile_size)
+        cols = slice(col * self.tile_size, (col + 1) * self.tile_size)
+        lat = self.lat[rows, None]
+        dlon = self.lon[None, cols] - self.lon[j]
+        # Haversine distance from the point to every cell center
+        a = (np.sin((lat - self.lat[i]) / 2) ** 2
+             + self._cos_lat[rows, None] * self._cos_lat[i] * np.sin(dlon / 2) ** 2)
+        distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+        energy_j = energy * TNT_EQUIVALENT
+        tile = {}
+        for hazard, thresholds in HAZARDS.items():
+            value = HAZARD_FUNCTIONS[hazard](distance, energy_j, burst_altitude_km)
+            level = np.zeros(distance.shape, dtype=np.int8)
+            for threshold in thresholds:
+                level += value >= threshold
+            tile[hazard] = level
+        # The cap test is conservative; a tile can still come out undamaged
+        if not any(level.any() for level in tile.values()):
+            return None
+        return tile
+
+    def mosaic(self, tiles, hazard):
+        """Full-size int8 level raster for one hazard from evaluate() tiles."""
+        raster = np.zeros(self.shape, dtype=np.int8)
+        size = self.tile_size
+        for (row, col), tile in tiles.items():
+            raster[row * size:(row + 1) * size, col * size:(col + 1) * size] = tile[hazard]
+        return raster
+
+    def zone_areas(self, tiles):
+        """Area (km^2) at or above each level, per hazard."""
+        # Cell areas only depend on the row
+        lat_top = np.radians(90 - np.arange(self.shape[0]) * self.resolution)
+        lat_bottom = lat_top - math.radians(self.resolution)
+        row_area = (EARTH_RADIUS_KM ** 2 * math.radians(self.resolution)
+                    * (np.sin(lat_top) - np.sin(lat_bottom)))
+        areas = {hazard: [0.0, 0.0, 0.0] for hazard in HAZARDS}
+        size = self.tile_size
+        for (row, _), tile in tiles.items():
+            weights = row_area[row * size:(row + 1) * size, None]
+            for hazard, level in tile.items():
+                for k in range(3):
+                    areas[hazard][k] += float((weights * (level > k)).sum())
+        return areas
+
+
+def _unit_vectors(lat, lon):
+    cos_lat = np.cos(lat)
+    return np.stack(np.broadcast_arrays(cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)), axis=-1)
+
+
+def _angle_between(a, b):
+    """Angle (radians) between unit vectors along the last axis."""
+    cross = np.linalg.norm(np.cross(a, b), axis=-1)
+    return np.arctan2(cross, (a * b).sum(axis=-1))
+
+
+# --- Command line ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiled global damage raster for one impact")
+    parser.add_argument("--energy", type=float, required=True, help="impact energy, as simulate_impacts() reports it")
+    parser.add_argument("--lat", type=float, required=True)
+    parser.add_argument("--lon", type=float, required=True)
+    parser.add_argument("--burst-altitude", type=float, default=0.0, help="km, 0 for a ground impact")
+    parser.add_argument("--resolution", type=float, default=DEFAULT_RESOLUTION, help="degrees per cell")
+    parser.add_argument("--tile-size", type=int, default=DEFAULT_TILE_SIZE)
+    parser.add_argument("-o", "--output", help="write the full level rasters to this .npz")
+    args = parser.parse_args(argv)
+
+    raster = DamageRaster(args.resolution, args.tile_size)
+    start = time.perf_counter()
+    tiles = raster.evaluate(args.energy, args.lat, args.lon, args.burst_altitude)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"{len(tiles)} of {raster.tile_rows * raster.tile_cols} tiles damaged, "
+          f"{raster.stats['tiles_evaluated']} evaluated in {elapsed_ms:.1f} ms")
+    radii = damage_radii(args.energy, args.burst_altitude)
+    for hazard, areas in raster.zone_areas(tiles).items():
+        levels = "  ".join(f"L{k + 1}: {radii[hazard][k]:,.1f} km / {area:,.0f} km^2"
+                           for k, area in enumerate(areas))
+        print(f"{hazard:>12}  {levels}")
+    if args.output:
+        np.savez_compressed(args.output, **{hazard: raster.mosaic(tiles, hazard) for hazard in HAZARDS})
+        print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
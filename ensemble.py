@@ -0,0 +1,218 @@
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from impact_model import DENSITIES, simulate_impacts
+
+# --- Ensemble settings ---
+# Spread around the slider values: diameter is log-normal (relative sigma),
+# velocity is normal (relative sigma), angle is normal (sigma in degrees).
+DEFAULT_SPREAD = {"diameter": 0.2, "velocity": 0.1, "angle": 10.0}
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+DEFAULT_CHUNK_SIZE = 500_000
+
+# Same limits as the Exploration Mode sliders
+VELOCITY_RANGE = (5, 70)
+ANGLE_RANGE = (0, 90)
+
+# Streaming percentiles: every chunk is reduced to a fixed log10 histogram,
+# so memory stays constant however many samples are drawn.
+# ~0.3% relative resolution per bin.
+HIST_BINS = 8192
+HIST_RANGES = {
+    "energy": (-4.0, 20.0),          # log10 Mt
+    "effective_energy": (-4.0, 20.0),
+    "crater": (-2.0, 6.0),           # log10 km
+}
+# Extra bands when the atmospheric entry stage runs
+ENTRY_HIST_RANGES = {
+    "airburst_altitude": (-3.0, 3.0),  # log10 km
+    "airburst_energy": (-4.0, 20.0),   # log10 Mt
+}
+
+
+def _hist_ranges(entry):
+    return {**HIST_RANGES, **ENTRY_HIST_RANGES} if entry else HIST_RANGES
+
+
+def _as_weights(value, names):
+    """Turn "Rock" or {"Rock": 0.7, "Iron": 0.3} into aligned probabilities."""
+    if isinstance(value, str):
+        value = {value: 1.0}
+    weights = np.array([float(value.get(n, 0.0)) for n in names])
+    if weights.sum() <= 0:
+        raise ValueError(f"No probability mass on any of {names}: {value!r}")
+    return weights / weights.sum()
+
+
+def _histogram(values, lo, hi):
+    """Counts of log10(values) over HIST_BINS bins; values <= 0 go in bin 0."""
+    scale = HIST_BINS / (hi - lo)
+    with np.errstate(divide="ignore"):
+        logs = np.log10(values)
+    idx = (logs - lo) * scale
+    np.nan_to_num(idx, copy=False, nan=0.0, neginf=0.0, posinf=HIST_BINS - 1)
+    idx = np.clip(idx, 0, HIST_BINS - 1).astype(np.intp)
+    return np.bincount(idx, minlength=HIST_BINS)
+
+
+def _run_chunk(task):
+    """Sample one chunk, push it through the impact model and reduce it."""
+    seed, n, center, spread, material_p, land_p, entry = task
+    rng = np.random.default_rng(seed)
+
+    diameter = center["diameter"] * np.exp(rng.normal(0.0, spread["diameter"], n))
+    velocity = rng.normal(center["velocity"], spread["velocity"] * center["velocity"], n)
+    np.clip(velocity, *VELOCITY_RANGE, out=velocity)
+    angle = rng.normal(center["angle"], spread["angle"], n)
+    np.clip(angle, *ANGLE_RANGE, out=angle)
+
+    density = rng.choice(np.array(list(DENSITIES.values()), dtype=np.float64), size=n, p=material_p)
+    on_land = rng.random(n) < land_p
+
+    result = simulate_impacts(diameter, velocity, angle, density, on_land, entry)
+    summary = {"n": n}
+    for key, (lo, hi) in _hist_ranges(entry).items():
+        values = result[key]
+        summary[key] = {
+            "hist": _histogram(values, lo, hi),
+            "sum": float(values.sum()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+        }
+    return summary
+
+
+def _merge(total, part):
+    if total is None:
+        return part
+    total["n"] += part["n"]
+    for key in part.keys() - {"n"}:
+        t, p = total[key], part[key]
+        t["hist"] += p["hist"]
+        t["sum"] += p["sum"]
+        t["min"] = min(t["min"], p["min"])
+        t["max"] = max(t["max"], p["max"])
+    return total
+
+
+def _percentile(hist, lo, hi, q, vmin, vmax):
+    """Percentile q (0-100) from a log10 histogram, interpolated in log space."""
+    cdf = np.cumsum(hist)
+    target = q / 100 * cdf[-1]
+    b = int(np.searchsorted(cdf, target))
+    b = min(b, HIST_BINS - 1)
+    below = cdf[b - 1] if b > 0 else 0
+    frac = (target - below) / hist[b] if hist[b] else 0.0
+    width = (hi - lo) / HIST_BINS
+    value = 10 ** (lo + (b + frac) * width)
+    # Bin 0 also collects zeros (e.g. ocean craters, 0 degree impacts)
+    if b == 0 and vmin <= 0:
+        return 0.0
+    return float(min(max(value, vmin), vmax))
+
+
+def run_ensemble(diameter, velocity, angle, material, location, n_samples=1_000_000,
+                 spread=None, percentiles=DEFAULT_PERCENTILES, chunk_size=DEFAULT_CHUNK_SIZE,
+                 workers=None, seed=None, entry=False, mp_context=None, cancel=None):
+    """Monte Carlo ensemble around one scenario.
+
+    material may be a name or a dict of name -> probability, location may be
+    "Land", "Ocean" or a dict of the two. Samples are drawn and reduced in
+    chunks on a process pool; only the per-chunk histograms are kept.
+    entry=True runs the atmospheric entry stage before the crater estimate.
+    Returns {"n", "energy", "effective_energy", "crater"} (plus
+    "airburst_altitude" and "airburst_energy" with entry), each band being
+    {"mean", "min", "max", "percentiles": {q: value}}.
+
+    mp_context is the multiprocessing context of the pool (the default start
+    method if None; callers with threads, like the pygame UI, should pass a
+    "spawn" one, as forking a threaded process is unsafe). cancel is an
+    optional threading.Event: once set, chunks not yet started are dropped
+    and None is returned.
+    """
+    if n_samples < 1:
+        raise ValueError(f"n_samples must be at least 1, got {n_samples}")
+    spread = {**DEFAULT_SPREAD, **(spread or {})}
+    center = {"diameter": float(diameter), "velocity": float(velocity), "angle": float(angle)}
+    material_p = _as_weights(material, list(DENSITIES))
+    land_p = float(_as_weights(location, ["Land", "Ocean"])[0])
+
+    n_chunks = max(1, math.ceil(n_samples / chunk_size))
+    # Spawned seeds make the result independent of the worker count
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    sizes = [chunk_size] * (n_chunks - 1) + [n_samples - chunk_size * (n_chunks - 1)]
+    tasks = [(s, n, center, spread, material_p, land_p, entry) for s, n in zip(seeds, sizes)]
+
+    workers = workers or os.cpu_count() or 1
+    total = None
+    if workers == 1 or n_chunks == 1:
+        for task in tasks:
+            if cancel is not None and cancel.is_set():
+                return None
+            total = _merge(total, _run_chunk(task))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, n_chunks), mp_context=mp_context) as pool:
+            for part in pool.map(_run_chunk, tasks):
+                if cancel is not None and cancel.is_set():
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    return None
+                total = _merge(total, part)
+
+    bands = {"n": total["n"]}
+    for key, (lo, hi) in _hist_ranges(entry).items():
+        stats = total[key]
+        bands[key] = {
+            "mean": stats["sum"] / total["n"],
+            "min": stats["min"],
+            "max": stats["max"],
+            "percentiles": {q: _percentile(stats["hist"], lo, hi, q, stats["min"], stats["max"])
+                            for q in percentiles},
+        }
+    return bands
+
+
+# --- Command line ---
+def _parse_weights(text):
+    """"Rock" or "Rock=0.7,Iron=0.3" -> name or dict."""
+    if "=" not in text:
+        return text
+    return {k: float(v) for k, v in (part.split("=") for part in text.split(","))}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo impact uncertainty bands")
+    parser.add_argument("--diameter", type=float, default=500, help="m")
+    parser.add_argument("--velocity", type=float, default=25, help="km/s")
+    parser.add_argument("--angle", type=float, default=45, help="degrees")
+    parser.add_argument("--material", default="Rock", help='e.g. "Rock" or "Rock=0.7,Iron=0.3"')
+    parser.add_argument("--location", default="Land", help='e.g. "Land" or "Land=0.3,Ocean=0.7"')
+    parser.add_argument("-n", "--samples", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--entry", action="store_true", help="simulate atmospheric entry first")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    bands = run_ensemble(args.diameter, args.velocity, args.angle,
+                         _parse_weights(args.material), _parse_weights(args.location),
+                         n_samples=args.samples, chunk_size=args.chunk_size,
+                         workers=args.workers, seed=args.seed, entry=args.entry)
+    elapsed = time.perf_counter() - start
+
+    print(f"{bands['n']:,} samples in {elapsed:.2f} s ({bands['n'] / elapsed:,.0f}/s)")
+    units = {"energy": "Mt", "effective_energy": "Mt", "crater": "km",
+             "airburst_altitude": "km", "airburst_energy": "Mt"}
+    for key in _hist_ranges(args.entry):
+        unit = units[key]
+        pct = "  ".join(f"P{q}={v:.4g}" for q, v in bands[key]["percentiles"].items())
+        print(f"{key:>16} ({unit}): {pct}  mean={bands[key]['mean']:.4g}")
+
+
+if __name__ == "__main__":
+    main()
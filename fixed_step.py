@@ -0,0 +1,66 @@
+"""Fixed-timestep game loop helper.
+
+The simulation advances in ticks of exactly 1/SIM_HZ seconds however fast
+or slow frames are drawn; the renderer interpolates between the last two
+ticks with alpha. Speeds in both game modes are tuned in pixels per tick at
+SIM_HZ = 60 (the frame rate they were originally locked to).
+
+    sim = FixedTimestep()
+    while running:
+        for _ in sim.steps():
+            update()                  # one tick of sim.dt seconds
+        draw(sim.alpha)               # 0..1 of the way to the next tick
+        clock.tick(RENDER_FPS)
+"""
+import time
+
+SIM_HZ = 60
+# After a long stall (window drag, breakpoint) run at most this many ticks
+# in one frame and drop the rest, rather than freezing to catch up
+MAX_STEPS_PER_FRAME = 5
+
+
+class FixedTimestep:
+    def __init__(self, hz=SIM_HZ, max_steps=MAX_STEPS_PER_FRAME, clock=time.perf_counter):
+        self.hz = hz
+        self.dt = 1.0 / hz
+        self.max_steps = max_steps
+        self.clock = clock
+        self.ticks = 0
+        # The first frame runs one tick, so there is a state to draw
+        self.accumulator = self.dt
+        self._last = None
+
+    @property
+    def time(self):
+        """Simulated seconds at the end of the current tick."""
+        return self.ticks * self.dt
+
+    @property
+    def alpha(self):
+        """How far the drawn frame is between the last tick and the next."""
+        return min(self.accumulator / self.dt, 1.0)
+
+    def advance(self):
+        """Number of ticks due for the time that passed since the last call."""
+        now = self.clock()
+        if self._last is not None:
+            self.accumulator += now - self._last
+        self._last = now
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.dt
+        return steps
+
+    def steps(self):
+        """Yield once per tick due, counting each one as it starts."""
+        for _ in range(self.advance()):
+            self.ticks += 1
+            yield self.ticks
+
+
+def lerp(previous, current, alpha):
+    return previous + (current - previous) * alpha
@@ -0,0 +1,262 @@
+"""Per-phase frame timing for the game loops, with an overlay and exports.
+
+A FrameProfiler names the phases of one loop (events, simulation, each
+kind of drawing, the flip, the wait for the next frame). The loop calls
+begin_frame() at the top, mark(phase) after each phase (the time since the
+previous mark is added to that phase, so a phase can be marked several
+times a frame, e.g. once per tick) and end_frame() after the clock tick.
+
+The timings (time.perf_counter_ns) go into a preallocated ring buffer of
+the last capacity frames, an array("q") written in place: recording never
+allocates a container or grows anything, and costs under a microsecond
+per mark. Time after the last mark counts toward the frame but no phase.
+
+F3 toggles an overlay with a graph of recent frame times (against the
+frame budget) and the mean time of each phase; F4 saves the buffer to
+profiler.path (.json with a summary and environment, or .csv).
+
+    profiler = FrameProfiler("game", ("events", "sim", "draw", "flip", "wait"))
+    while True:
+        profiler.begin_frame()
+        for event in pygame.event.get():
+            if profiler.handle_event(event):
+                continue
+            ...
+        profiler.mark("events")
+        ...
+        profiler.draw(screen)
+        pygame.display.flip()
+        profiler.mark("flip")
+        clock.tick(60)
+        profiler.mark("wait")
+        profiler.end_frame()
+
+    python frame_profiler.py game-profile.json   # summarize a saved profile
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import sys
+import time
+from array import array
+from time import perf_counter_ns
+
+import numpy as np
+import pygame
+
+import assets
+
+DEFAULT_CAPACITY = 3600     # frames kept: a minute at 60 fps
+TOGGLE_KEY = pygame.K_F3
+EXPORT_KEY = pygame.K_F4
+PERCENTILES = (50, 95, 99)
+
+# --- Overlay ---
+OVERLAY_HZ = 4              # the overlay is redrawn this often, and blitted every frame
+OVERLAY_FONT = "Orbitron-Regular.ttf"
+OVERLAY_FONT_SIZE = 11
+OVERLAY_MARGIN = 10
+PAD = 8
+GRAPH_FRAMES = 120          # one 2-pixel bar per frame
+GRAPH_HEIGHT = 60           # twice the frame budget
+AVERAGE_FRAMES = 60         # the phase bars show the mean over these
+LABEL_WIDTH = 86
+BAR_WIDTH = 120             # a whole frame budget
+ROW_HEIGHT = 14
+PANEL_COLOR = (0, 0, 0, 180)
+TEXT_COLOR = (230, 230, 230)
+OK_COLOR = (80, 200, 120)
+SLOW_COLOR = (230, 70, 50)
+BUDGET_COLOR = (255, 220, 50)
+PHASE_COLORS = ((90, 160, 255), (255, 160, 60), (120, 220, 120), (220, 100, 220),
+                (255, 220, 80), (80, 220, 220), (240, 110, 110), (170, 170, 255),
+                (200, 200, 200), (140, 140, 140))
+
+
+class FrameProfiler:
+    """Times the phases of each frame of one loop into a ring buffer."""
+
+    def __init__(self, label, phases, fps=60, capacity=DEFAULT_CAPACITY, path=None):
+        self.label = label
+        self.phases = tuple(phases)
+        self.columns = {name: i for i, name in enumerate(self.phases)}
+        self.width = len(self.phases) + 1       # the phases, then the whole frame
+        self.budget_ns = 10 ** 9 // fps
+        self.capacity = capacity
+        self.times = array("q", bytes(8 * capacity * self.width))
+        self.view = np.frombuffer(self.times, np.int64).reshape(capacity, self.width)
+        self._zeros = array("q", bytes(8 * self.width))
+        self.frames = 0         # frames recorded; the buffer holds the last capacity
+        self.row = 0            # offset of the frame being timed in times
+        self.start = self.last = 0
+        self.path = path or f"{label}-profile.json"
+        self.visible = False
+        self._overlay = None
+        self._overlay_time = 0
+
+    # --- Recording ---
+    def begin_frame(self):
+        self.row = row = (self.frames % self.capacity) * self.width
+        self.times[row:row + self.width] = self._zeros
+        self.start = self.last = perf_counter_ns()
+
+    def mark(self, phase):
+        """Add the time since the last mark (or begin_frame) to phase."""
+        now = perf_counter_ns()
+        self.times[self.row + self.columns[phase]] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        self.times[self.row + self.width - 1] = perf_counter_ns() - self.start
+        self.frames += 1
+
+    # --- Reading ---
+    def history(self, n=None):
+        """The last n (default all kept) frames in order, as (frames, phases + 1) ns."""
+        kept = min(self.frames, self.capacity)
+        n = kept if n is None else min(n, kept)
+        end = self.frames % self.capacity
+        if n <= end:
+            return self.view[end - n:end]
+        return np.concatenate((self.view[self.capacity - (n - end):], self.view[:end]))
+
+    def summary(self):
+        """{phase or "frame": {"mean", "p50", "p95", "p99", "max"}} in ms."""
+        return summarize(self.phases, self.history() / 1e6)
+
+    def save(self, path=None):
+        """Write the kept frames to path (default self.path): .csv, else JSON."""
+        path = path or self.path
+        frames_ms = self.history() / 1e6
+        first = self.frames - len(frames_ms)
+        columns = self.phases + ("frame",)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            if os.path.splitext(path)[1].lower() == ".csv":
+                writer = csv.writer(f)
+                writer.writerow(("index",) + tuple(f"{name}_ms" for name in columns))
+                for i, row in enumerate(frames_ms, first):
+                    writer.writerow([i] + [f"{ms:.4f}" for ms in row])
+            else:
+                json.dump({
+                    "label": self.label,
+                    "saved": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                    "platform": platform.platform(),
+                    "python": platform.python_version(),
+                    "pygame": pygame.version.ver,
+                    "video_driver": pygame.display.get_driver() if pygame.display.get_init() else None,
+                    "budget_ms": self.budget_ns / 1e6,
+                    "first_frame": first,
+                    "columns": columns,
+                    "summary": summarize(self.phases, frames_ms),
+                    "frames_ms": np.round(frames_ms, 4).tolist(),
+                }, f, indent=2)
+        return path
+
+    # --- Overlay ---
+    def handle_event(self, event):
+        """F3 toggles the overlay, F4 saves; True if the event was one of those."""
+        if event.type != pygame.KEYDOWN or event.key not in (TOGGLE_KEY, EXPORT_KEY):
+            return False
+        if event.key == TOGGLE_KEY:
+            self.visible = not self.visible
+            self._overlay = None
+        else:
+            try:
+                print(f"Saved {min(self.frames, self.capacity)} frames to {self.save()}")
+            except OSError as e:
+                print(f"Could not save the frame profile: {e}")
+        return True
+
+    def draw(self, surface):
+        """Blit the overlay to surface's top right if shown; returns its rect (or None)."""
+        if not self.visible or not self.frames:
+            return None
+        now = perf_counter_ns()
+        if self._overlay is None or now - self._overlay_time >= 10 ** 9 // OVERLAY_HZ:
+            self._overlay = self._render_overlay()
+            self._overlay_time = now
+        rect = self._overlay.get_rect(topright=(surface.get_width() - OVERLAY_MARGIN, OVERLAY_MARGIN))
+        surface.blit(self._overlay, rect)
+        return rect
+
+    def _render_overlay(self):
+        font = assets.font(OVERLAY_FONT, OVERLAY_FONT_SIZE)
+        budget = self.budget_ns / 1e6
+        recent = self.history(GRAPH_FRAMES) / 1e6
+        totals = recent[:, -1]
+        means = recent[-AVERAGE_FRAMES:, :-1].mean(axis=0)
+
+        width = 2 * PAD + max(2 * GRAPH_FRAMES, LABEL_WIDTH + BAR_WIDTH + 40)
+        height = 2 * PAD + ROW_HEIGHT + GRAPH_HEIGHT + 6 + ROW_HEIGHT * len(self.phases)
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill(PANEL_COLOR)
+
+        header = f"{self.label}  p50 {np.median(totals):.1f}  max {totals.max():.1f} ms"
+        panel.blit(font.render(header, True, TEXT_COLOR), (PAD, PAD))
+
+        # Frame times, newest on the right; the line is the frame budget
+        bottom = PAD + ROW_HEIGHT + GRAPH_HEIGHT
+        scale = GRAPH_HEIGHT / (2 * budget)
+        left = PAD + 2 * (GRAPH_FRAMES - len(totals))
+        for i, ms in enumerate(totals):
+            bar = max(1, min(int(ms * scale), GRAPH_HEIGHT))
+            panel.fill(SLOW_COLOR if ms > budget else OK_COLOR, (left + 2 * i, bottom - bar, 2, bar))
+        budget_y = bottom - int(budget * scale)
+        pygame.draw.line(panel, BUDGET_COLOR, (PAD, budget_y), (PAD + 2 * GRAPH_FRAMES - 1, budget_y))
+
+        # Mean time of each phase, as a share of the budget
+        y = bottom + 6
+        for i, (name, ms) in enumerate(zip(self.phases, means)):
+            panel.blit(font.render(name, True, TEXT_COLOR), (PAD, y))
+            bar = min(int(ms / budget * BAR_WIDTH), BAR_WIDTH)
+            if bar:
+                panel.fill(PHASE_COLORS[i % len(PHASE_COLORS)], (PAD + LABEL_WIDTH, y + 2, bar, ROW_HEIGHT - 4))
+            panel.blit(font.render(f"{ms:.2f}", True, TEXT_COLOR), (PAD + LABEL_WIDTH + BAR_WIDTH + 6, y))
+            y += ROW_HEIGHT
+        return panel
+
+
+def summarize(phases, frames_ms):
+    """Per-column mean, percentiles and max of (frames, phases + 1) ms."""
+    summary = {}
+    for name, column in zip(tuple(phases) + ("frame",), np.asarray(frames_ms).T):
+        if not len(column):
+            continue
+        stats = {"mean": float(column.mean())}
+        stats.update((f"p{p}", float(v)) for p, v in zip(PERCENTILES, np.percentile(column, PERCENTILES)))
+        stats["max"] = float(column.max())
+        summary[name] = stats
+    return summary
+
+
+def load(path):
+    """(phases, (frames, phases + 1) ms array) from a saved .json or .csv profile."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if os.path.splitext(path)[1].lower() == ".csv":
+            rows = list(csv.reader(f))
+            columns = [name[:-len("_ms")] for name in rows[0][1:]]
+            frames_ms = np.array([[float(v) for v in row[1:]] for row in rows[1:]]).reshape(-1, len(columns))
+        else:
+            data = json.load(f)
+            columns = data["columns"]
+            frames_ms = np.array(data["frames_ms"], float).reshape(-1, len(columns))
+    return columns[:-1], frames_ms
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize saved frame profiles (F4 in either game mode)")
+    parser.add_argument("profiles", nargs="+", help=".json or .csv files")
+    args = parser.parse_args(argv)
+    for path in args.profiles:
+        phases, frames_ms = load(path)
+        print(f"{path}: {len(frames_ms)} frames (ms)")
+        for name, stats in summarize(phases, frames_ms).items():
+            print(f"  {name:<12} mean {stats['mean']:7.3f}  " +
+                  "  ".join(f"p{p} {stats[f'p{p}']:7.3f}" for p in PERCENTILES) + f"  max {stats['max']:7.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
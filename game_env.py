@@ -0,0 +1,187 @@
+"""reset()/step() environments over the Game Mode simulation.
+
+For automated players, load and soak tests: no pygame, no display, no frame
+clock, just game_sim ticks as fast as the CPU allows.
+
+    env = GameEnv()
+    obs = env.reset(seed=1)
+    while True:
+        obs, reward, done, info = env.step((x, y))   # or None for no click
+        if done:
+            break
+
+An observation is a (meteors, 4) float array of x, y, radius, hp. The
+reward is the score gained on the tick. VecGameEnv steps a batch of games
+with one call (resetting the ones that end), and soak() runs a bot over
+many games on a process pool:
+
+    python game_env.py --games 64 --ticks 20000 --workers 4
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from game_sim import SPAWN_INTERVAL, GameState
+from meteors import HP, RADIUS, X, Y
+from waves import load_waves
+
+OBSERVATION_FIELDS = (X, Y, RADIUS, HP)
+
+
+def game_seed(seed, index):
+    """Seed of game index in a run seeded with seed (independent of workers)."""
+    return int(np.random.SeedSequence([seed, index]).generate_state(1, np.uint64)[0] >> 1)
+
+
+class GameEnv:
+    """One game. The game ends on a game over or after max_ticks ticks.
+
+    waves is a wave definition (see waves.py; the classic rules if None).
+    """
+
+    def __init__(self, spawn_interval=SPAWN_INTERVAL, max_ticks=None, waves=None):
+        self.spawn_interval = spawn_interval
+        self.max_ticks = max_ticks
+        self.waves = waves
+        self.state = None
+
+    def observation(self):
+        """(meteors, 4) array of x, y, radius, hp (a copy; ticks don't change it)."""
+        meteors = self.state.meteors
+        return meteors.data[OBSERVATION_FIELDS, :meteors.count].T.copy()
+
+    def reset(self, seed=None):
+        self.state = GameState(seed, self.spawn_interval, self.waves)
+        return self.observation()
+
+    def step(self, action=None):
+        """Apply action (None, a click (x, y), or a list of clicks) for one tick."""
+        state = self.state
+        if action is None:
+            clicks = ()
+        elif len(action) and np.ndim(action[0]) == 0:
+            clicks = (action,)
+        else:
+            clicks = action
+        score = state.score
+        destroyed = state.tick(clicks)
+        truncated = self.max_ticks is not None and state.ticks >= self.max_ticks
+        info = {"ticks": state.ticks, "score": state.score, "destroyed": destroyed,
+                "game_over": state.game_over}
+        return self.observation(), state.score - score, state.game_over or truncated, info
+
+
+class VecGameEnv:
+    """num_envs games stepped together.
+
+    step() takes one action per game and returns a list of observations and
+    arrays of rewards and done flags. A game that ends is reset at once with
+    the next seed (its final info is kept under "final" in its info dict).
+    """
+
+    def __init__(self, num_envs, spawn_interval=SPAWN_INTERVAL, max_ticks=None, seed=0, waves=None):
+        self.envs = [GameEnv(spawn_interval, max_ticks, waves) for _ in range(num_envs)]
+        self.seed = seed
+        self.games_started = 0
+
+    def __len__(self):
+        return len(self.envs)
+
+    def _next_seed(self):
+        seed = game_seed(self.seed, self.games_started)
+        self.games_started += 1
+        return seed
+
+    def reset(self):
+        return [env.reset(self._next_seed()) for env in self.envs]
+
+    def step(self, actions):
+        observations, infos = [], []
+        rewards = np.zeros(len(self.envs), np.int64)
+        dones = np.zeros(len(self.envs), bool)
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            obs, rewards[i], dones[i], info = env.step(action)
+            if dones[i]:
+                info = {"final": {**info, "seed": env.state.seed}}
+                obs = env.reset(self._next_seed())
+            observations.append(obs)
+            infos.append(info)
+        return observations, rewards, dones, infos
+
+
+# --- Bots and soak runs ---
+def lowest_meteor_bot(observation, rng, reaction=0.2):
+    """Click the meteor nearest the Earth on about reaction of the ticks."""
+    if not len(observation) or rng.random() >= reaction:
+        return None
+    x, y = observation[int(np.argmax(observation[:, 1])), :2]
+    return x, y
+
+
+def _soak_chunk(task):
+    """Play games [start, stop) of a soak run to the end; one row per game."""
+    seed, start, stop, max_ticks, spawn_interval, reaction, waves = task
+    env = GameEnv(spawn_interval, max_ticks, waves)
+    rows = []
+    for index in range(start, stop):
+        obs = env.reset(game_seed(seed, index))
+        rng = random.Random(env.state.seed)
+        done = False
+        while not done:
+            obs, _, done, info = env.step(lowest_meteor_bot(obs, rng, reaction))
+        rows.append((index, env.state.seed, info["ticks"], info["score"], info["game_over"]))
+    return rows
+
+
+def soak(games, max_ticks, seed=0, workers=None, spawn_interval=SPAWN_INTERVAL, reaction=0.2, waves=None):
+    """Run the bot through games games of up to max_ticks ticks each.
+
+    Returns (index, seed, ticks, score, game_over) per game, in game order;
+    the results do not depend on the worker count.
+    """
+    workers = workers or os.cpu_count() or 1
+    n_chunks = min(games, workers * 4)
+    bounds = np.linspace(0, games, n_chunks + 1).astype(int)
+    tasks = [(seed, lo, hi, max_ticks, spawn_interval, reaction, waves)
+             for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+    rows = []
+    if workers == 1 or len(tasks) == 1:
+        for task in tasks:
+            rows.extend(_soak_chunk(task))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            for part in pool.map(_soak_chunk, tasks):
+                rows.extend(part)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak-test the Game Mode simulation with a bot, headlessly")
+    parser.add_argument("--games", type=int, default=32)
+    parser.add_argument("--ticks", type=int, default=20_000, help="longest game, in ticks")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spawn-interval", type=float, default=SPAWN_INTERVAL, help="seconds")
+    parser.add_argument("--reaction", type=float, default=0.2, help="share of ticks the bot clicks on")
+    parser.add_argument("--waves", metavar="PATH", help="wave file (default: the classic rules)")
+    args = parser.parse_args(argv)
+    waves = load_waves(args.waves) if args.waves else None
+
+    start = time.perf_counter()
+    rows = soak(args.games, args.ticks, args.seed, args.workers, args.spawn_interval, args.reaction, waves)
+    elapsed = time.perf_counter() - start
+
+    ticks = np.array([row[2] for row in rows])
+    scores = np.array([row[3] for row in rows])
+    lost = sum(row[4] for row in rows)
+    print(f"{len(rows)} games, {ticks.sum():,} ticks in {elapsed:.2f} s ({ticks.sum() / elapsed:,.0f} ticks/s)")
+    print(f"  ticks per game: mean {ticks.mean():,.0f}  max {ticks.max():,}   "
+          f"score: mean {scores.mean():,.0f}  max {scores.max():,}   game overs: {lost}")
+
+
+if __name__ == "__main__":
+    main()
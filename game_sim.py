@@ -0,0 +1,177 @@
+"""Game Mode rules without pygame: spawning, homing meteors, clicks, score.
+
+GameState is the whole simulation of one game. It advances in fixed ticks
+(fixed_step.SIM_HZ) and draws every random number from its own seeded
+random.Random, so a seed plus the clicks applied at each tick replays a
+game exactly (see replay.py). Game_Mode draws it; nothing here needs a
+display.
+
+When meteors spawn comes from a wave definition (waves.py); the default is
+waves.classic(), the original one-meteor-every-2-seconds rules.
+
+    state = GameState(seed=1)
+    while not state.game_over:
+        destroyed = state.tick(clicks)   # [(x, y, radius), ...]
+"""
+import math
+import random
+
+import numpy as np
+
+from fixed_step import SIM_HZ
+from meteors import MeteorStore
+from spatial_hash import SpatialHash
+from waves import WaveScheduler, classic
+
+# Playfield (screen pixels)
+WIDTH, HEIGHT = 900, 600
+EARTH_RADIUS = 300
+EARTH_X, EARTH_Y = WIDTH // 2, HEIGHT + 80
+
+# Asteroid types: (hp, radius)
+SMALL = (1, 24)
+MEDIUM = (2, 36)
+BIG = (3, 48)
+TYPES = {"small": SMALL, "medium": MEDIUM, "big": BIG}     # as named in wave files
+# A BIG meteor that runs into another meteor breaks into these
+SPLIT_INTO = (MEDIUM, SMALL)
+
+SPAWN_INTERVAL = 2.0    # simulated seconds between meteors
+SPAWN_MARGIN = 40       # meteors enter at least this far from the sides
+METEOR_SPIN = 2         # fastest spin, degrees per tick
+POINTS_PER_METEOR = 10
+# Below this many meteors, testing BIG ones against all others directly is
+# cheaper than going through the spatial hash
+DIRECT_COLLISION_LIMIT = 64
+
+
+class GameState:
+    """One game. waves is a wave definition dict (waves.classic(spawn_interval) if None)."""
+
+    def __init__(self, seed=None, spawn_interval=SPAWN_INTERVAL, waves=None):
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+        self.seed = seed
+        self.spawn_interval = spawn_interval
+        self.waves = waves
+        self.schedule = WaveScheduler(classic(spawn_interval) if waves is None else waves)
+        self.rng = random.Random(seed)
+        self.meteors = MeteorStore()
+        # Meteor centres hashed on a grid; cells fit any two touching
+        # meteors, so clicks and collisions only look at neighbouring cells
+        self.grid = SpatialHash(cell_size=2 * BIG[1])
+        self.ticks = 0
+        self.score = 0
+        self.game_over = False
+
+    @property
+    def time(self):
+        """Simulated seconds at the end of the last tick."""
+        return self.ticks / SIM_HZ
+
+    def tick(self, clicks=()):
+        """Advance one tick, applying the clicks (x, y) first.
+
+        Returns the meteors destroyed by clicks as (x, y, radius). Sets
+        game_over when a meteor reaches the Earth.
+        """
+        self.ticks += 1
+        elapsed_time = self.time
+        meteors, rng = self.meteors, self.rng
+
+        # Spawn
+        rows = []
+        for wave, times in self.schedule.due(elapsed_time):
+            for _ in range(times):
+                self._spawn(wave, elapsed_time, rows)
+        if len(rows) == 1:
+            meteors.add(*rows[0])
+        elif rows:
+            meteors.add_many(rows)
+
+        # Clicks hit the topmost (last drawn) meteor under the cursor
+        destroyed = []
+        for mx, my in clicks:
+            self.grid.update(meteors.x, meteors.y)
+            hits = self.grid.query_point(mx, my, meteors.x, meteors.y, meteors.radius)
+            if len(hits):
+                i = hits[0]
+                meteors.hp[i] -= 1
+                if meteors.hp[i] <= 0:
+                    destroyed.append((meteors.x[i], meteors.y[i], meteors.radius[i]))
+                    meteors.remove(i)
+                    self.score += POINTS_PER_METEOR
+
+        # Move meteors (all at once), then drop any that left the screen
+        hit_earth = meteors.home(EARTH_X, EARTH_Y, EARTH_RADIUS)
+        if hit_earth.any():
+            if self.schedule.invulnerable:
+                meteors.remove_where(hit_earth)
+            else:
+                self.game_over = True
+        meteors.cull(WIDTH, HEIGHT)
+
+        # Meteor-meteor collisions
+        self._break_up_big_meteors()
+        return destroyed
+
+    def _pick_type(self, wave, t):
+        names, weights = wave.types_at(t)
+        if weights is not None:
+            name = self.rng.choices(names, weights)[0]
+        else:
+            # A single type draws no random number
+            name = names[0] if len(names) == 1 else self.rng.choice(names)
+        return TYPES[name]
+
+    def _spawn(self, wave, t, rows):
+        """Append one spawn of wave at time t to rows (MeteorStore.add arguments)."""
+        rng = self.rng
+        low, high = wave.speed[0], wave.speed[1] + t * wave.speed_ramp
+        if wave.formation is None:
+            for _ in range(wave.count):
+                x = rng.randint(SPAWN_MARGIN, WIDTH - SPAWN_MARGIN) if wave.x is None else wave.x
+                hp, radius = self._pick_type(wave, t)
+                speed = rng.uniform(low, high)
+                rows.append((x, 0, speed, hp, radius, rng.uniform(0, 360), rng.uniform(-METEOR_SPIN, METEOR_SPIN)))
+            return
+        # A formation enters together at one speed, centred on x
+        center = rng.randint(SPAWN_MARGIN, WIDTH - SPAWN_MARGIN) if wave.x is None else wave.x
+        speed = rng.uniform(low, high)
+        half = (wave.count - 1) / 2
+        for i in range(wave.count):
+            offset = i - half
+            x = min(max(center + offset * wave.spacing, 0), WIDTH)
+            y = (half - abs(offset)) * wave.spacing / 2 if wave.formation == "v" else 0
+            hp, radius = self._pick_type(wave, t)
+            rows.append((x, y, speed, hp, radius, rng.uniform(0, 360), rng.uniform(-METEOR_SPIN, METEOR_SPIN)))
+
+    def _break_up_big_meteors(self):
+        """Split every BIG meteor touching another meteor into SPLIT_INTO.
+
+        The fragments sit side by side across the meteor's path and keep
+        its speed and spin.
+        """
+        meteors = self.meteors
+        big = np.flatnonzero(meteors.radius == BIG[1])
+        if not len(big):
+            return
+        x, y, radius = meteors.x, meteors.y, meteors.radius
+        if len(meteors) <= DIRECT_COLLISION_LIMIT:
+            dx, dy, reach = x[big, None] - x, y[big, None] - y, radius[big, None] + radius
+            touching = dx * dx + dy * dy < reach * reach
+            touching[np.arange(len(big)), big] = False      # not with itself
+            broken = big[touching.any(axis=1)]
+        else:
+            self.grid.update(x, y)
+            broken = np.unique(self.grid.overlapping(big, x, y, radius)[0])
+        # Highest index first: swap-remove only moves meteors from above
+        for i in broken[::-1]:
+            m = meteors.get(i)
+            meteors.remove(i)
+            dx, dy = EARTH_X - m["x"], EARTH_Y - m["y"]
+            dist = math.hypot(dx, dy) or 1
+            side_x, side_y = -dy / dist, dx / dist
+            for sign, (hp, radius) in zip((-1, 1), SPLIT_INTO):
+                meteors.add(m["x"] + sign * side_x * radius, m["y"] + sign * side_y * radius, m["speed"], hp, radius,
+                            m["angle"], m["spin"])
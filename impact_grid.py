@@ -0,0 +1,158 @@
+import math
+import os
+
+import numpy as np
+
+import atmospheric_entry
+from impact_model import DENSITIES, TNT_EQUIVALENT, simulate_impacts
+
+# --- Grid layout (matches the Exploration Mode slider ranges) ---
+BASE_DIR = os.path.dirname(__file__)
+GRID_PATH = os.path.join(BASE_DIR, "assets", "cache", "impact_grid.npz")
+ENTRY_GRID_PATH = os.path.join(BASE_DIR, "assets", "cache", "impact_grid_entry.npz")
+GRID_VERSION = 1
+
+DIAMETER_RANGE = (50, 10000)   # m, log-spaced nodes
+VELOCITY_RANGE = (5, 70)       # km/s, log-spaced nodes
+ANGLE_RANGE = (0, 90)          # degrees, linear nodes
+GRID_SHAPE = (48, 27, 46)      # diameter x velocity x angle
+
+MATERIALS = list(DENSITIES)
+LOCATIONS = ["Land", "Ocean"]
+OUTPUTS = ["mass", "energy", "effective_energy", "crater"]
+ENTRY_OUTPUTS = OUTPUTS + ["airburst_altitude", "airburst_energy"]
+
+# Each output is raised to this power, interpolated linearly in degrees
+# between two angle nodes, then taken back. crater ~ E^(1/4), so crater^4
+# blends like the energy does rather than as its fourth root.
+ANGLE_POWER = {"mass": 1, "energy": 1, "effective_energy": 1, "crater": 4,
+               "airburst_altitude": 1, "airburst_energy": 1}
+
+
+def _axes():
+    d = np.geomspace(*DIAMETER_RANGE, GRID_SHAPE[0])
+    v = np.geomspace(*VELOCITY_RANGE, GRID_SHAPE[1])
+    a = np.linspace(*ANGLE_RANGE, GRID_SHAPE[2])
+    return d, v, a
+
+
+def _model_key(entry):
+    """Changes whenever the physics constants or grid layout change."""
+    key = (GRID_VERSION, sorted(DENSITIES.items()), TNT_EQUIVALENT,
+           DIAMETER_RANGE, VELOCITY_RANGE, ANGLE_RANGE, GRID_SHAPE)
+    if entry:
+        key += (sorted((k, v) for k, v in vars(atmospheric_entry).items() if k.isupper()),)
+    return repr(key)
+
+
+def _locate(value, lo, n, log):
+    """Cell index and fraction for value on an evenly spaced (or log-spaced) axis."""
+    lo_v, hi_v = lo
+    value = min(max(value, lo_v), hi_v)
+    if log:
+        t = math.log(value / lo_v) / math.log(hi_v / lo_v)
+    else:
+        t = (value - lo_v) / (hi_v - lo_v)
+    t *= n - 1
+    i = min(int(t), n - 2)
+    return i, t - i
+
+
+class ImpactGrid:
+    """Precomputed impact results over the slider ranges.
+
+    tables[output] has shape (material, location, diameter, velocity, angle).
+    lookup() does a fixed amount of work: bilinear in log space over
+    diameter/velocity (exact for the power laws in impact_model), then linear
+    along the angle axis. With entry=True the tables hold simulate_impacts(...,
+    entry=True) results; those are not power laws, so near the airburst /
+    ground impact boundary the preview is rougher than the exact result.
+    """
+
+    def __init__(self, tables, entry=False):
+        self.tables = tables
+        self.entry = entry
+
+    @classmethod
+    def build(cls, entry=False):
+        outputs = ENTRY_OUTPUTS if entry else OUTPUTS
+        d, v, a = _axes()
+        dd, vv, aa = np.meshgrid(d, v, a, indexing="ij")
+        tables = {key: np.empty((len(MATERIALS), len(LOCATIONS)) + GRID_SHAPE, dtype=np.float64)
+                  for key in outputs}
+        for mi, material in enumerate(MATERIALS):
+            for li, location in enumerate(LOCATIONS):
+                result = simulate_impacts(dd, vv, aa, material, location, entry)
+                for key in outputs:
+                    tables[key][mi, li] = result[key]
+        return cls(tables, entry)
+
+    def save(self, path=GRID_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so a crash never leaves a truncated cache behind
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(tmp_path, model_key=np.array(_model_key(self.entry)), **self.tables)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=GRID_PATH, entry=False):
+        """Load a saved grid, or None if missing or built for another model."""
+        try:
+            with np.load(path) as data:
+                if str(data["model_key"]) != _model_key(entry):
+                    return None
+                return cls({key: data[key] for key in (ENTRY_OUTPUTS if entry else OUTPUTS)}, entry)
+        except (OSError, KeyError, ValueError):
+            return None
+
+    @classmethod
+    def load_or_build(cls, path=GRID_PATH, entry=False):
+        grid = cls.load(path, entry)
+        if grid is None:
+            grid = cls.build(entry)
+            try:
+                grid.save(path)
+            except OSError as e:
+                print(f"Warning: could not save impact grid to {path}: {e}")
+        return grid
+
+    def lookup(self, diameter, velocity, angle, material, location):
+        """Interpolated simulate_impacts() result for one scenario (floats)."""
+        mi = MATERIALS.index(material) if material in MATERIALS else MATERIALS.index("Rock")
+        li = LOCATIONS.index(location) if location in LOCATIONS else LOCATIONS.index("Ocean")
+        i, fd = _locate(diameter, DIAMETER_RANGE, GRID_SHAPE[0], log=True)
+        j, fv = _locate(velocity, VELOCITY_RANGE, GRID_SHAPE[1], log=True)
+        k, fa = _locate(angle, ANGLE_RANGE, GRID_SHAPE[2], log=False)
+        weights = ((1 - fd) * (1 - fv), (1 - fd) * fv, fd * (1 - fv), fd * fv)
+
+        result = {}
+        for key in self.tables:
+            cell = self.tables[key][mi, li, i:i + 2, j:j + 2, k:k + 2]
+            slabs = []
+            for ak in (0, 1):
+                corners = (cell[0, 0, ak], cell[0, 1, ak], cell[1, 0, ak], cell[1, 1, ak])
+                if min(corners) > 0:
+                    value = math.exp(sum(w * math.log(c) for w, c in zip(weights, corners)))
+                else:
+                    value = sum(w * c for w, c in zip(weights, corners))
+                slabs.append(value ** ANGLE_POWER[key])
+            blended = slabs[0] + (slabs[1] - slabs[0]) * fa
+            result[key] = float(blended ** (1 / ANGLE_POWER[key]))
+        return result
+
+
+# Grids already loaded by this process, by (path, entry)
+_loaded = {}
+
+
+def load_impact_grid(path=None, entry=False):
+    """Grid for live previews; built and cached on disk on first use.
+
+    Loaded once per process (Exploration Mode may be entered many times).
+    """
+    if path is None:
+        path = ENTRY_GRID_PATH if entry else GRID_PATH
+    key = (path, entry)
+    if key not in _loaded:
+        _loaded[key] = ImpactGrid.load_or_build(path, entry)
+    return _loaded[key]
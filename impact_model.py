@@ -0,0 +1,170 @@
+import math
+import numpy as np
+
+from atmospheric_entry import AIRBURST, GROUND, simulate_entry
+
+# --- Constants ---
+DENSITIES = {"Iron": 7800, "Rock": 3000, "Ice": 900}
+DEFAULT_DENSITY = 3000
+TNT_EQUIVALENT = 4.184e9
+CRATER_SCALE = 1.2          # km per Mt^(1/4) of angle-scaled energy
+
+# Risk thresholds: energy in Mt, diameter in m, angle in degrees
+CLIMATE_ENERGY = 5000
+FIRES_ENERGY = 1000
+TSUNAMI_DIAMETER = 100
+SHALLOW_ANGLE = 20
+STEEP_ANGLE = 70
+STEEP_ENERGY = 50
+
+
+# --- Batch impact engine ---
+def material_densities(material):
+    """Density (kg/m^3) for a material name or an array of names."""
+    if isinstance(material, str):
+        return float(DENSITIES.get(material, DEFAULT_DENSITY))
+    material = np.asarray(material)
+    if material.dtype.kind in "iuf":
+        # Already densities (e.g. from a catalog column)
+        return material.astype(np.float64)
+    # One vectorized comparison per known material; unknown names fall back
+    # to the default density like DENSITIES.get() does for scalars
+    density = np.full(material.shape, DEFAULT_DENSITY, dtype=np.float64)
+    for name, value in DENSITIES.items():
+        density[material == name] = value
+    return density
+
+def simulate_impacts(diameter, velocity, angle, material, location, entry=False):
+    """Evaluate many impact scenarios in one pass.
+
+    Every argument may be a scalar or an array; they are broadcast together.
+    material may also be given as densities and location as a boolean
+    "on land" mask.
+    Returns a dict of float64 arrays: mass (kg), energy (Mt TNT),
+    effective_energy (Mt TNT, scaled by impact angle) and crater (km, 0 for
+    ocean impacts).
+
+    With entry=True every body is first flown through the atmosphere
+    (atmospheric_entry.simulate_entry). energy stays the energy at entry,
+    effective_energy and crater use what reaches the ground (0 for bodies
+    that burst or skip out), and two more arrays are returned:
+    airburst_altitude (km, 0 if none) and airburst_energy (Mt, 0 if none).
+    """
+    diameter = np.asarray(diameter, dtype=np.float64)
+    velocity = np.asarray(velocity, dtype=np.float64)
+    angle = np.asarray(angle, dtype=np.float64)
+    density = material_densities(material)
+    if isinstance(location, str):
+        on_land = location == "Land"
+    else:
+        location = np.asarray(location)
+        # A boolean array is taken as a precomputed "on land" mask
+        on_land = location if location.dtype == bool else location == "Land"
+
+    # Each quantity is computed once and reused by the next stage
+    mass = (4 / 3) * math.pi * (diameter / 2) ** 3 * density
+    energy = 0.5 * mass * (velocity * 1000) ** 2 / TNT_EQUIVALENT
+    if not entry:
+        effective_energy = energy * np.sin(np.radians(angle))
+        crater = np.where(on_land, effective_energy ** (1 / 4) * CRATER_SCALE, 0.0)
+        return {
+            "mass": mass,
+            "energy": energy,
+            "effective_energy": effective_energy,
+            "crater": crater,
+        }
+
+    # Atmospheric entry stage: the crater comes from the body that is left
+    flight = simulate_entry(diameter, velocity, angle, density)
+    final_energy = 0.5 * flight["mass"] * (flight["velocity"] * 1000) ** 2 / TNT_EQUIVALENT
+    ground = flight["outcome"] == GROUND
+    burst = flight["outcome"] == AIRBURST
+    effective_energy = np.where(ground, final_energy * np.sin(np.radians(flight["angle"])), 0.0)
+    crater = np.where(on_land, effective_energy ** (1 / 4) * CRATER_SCALE, 0.0)
+    return {
+        "mass": np.broadcast_to(mass, crater.shape),
+        "energy": np.broadcast_to(energy, crater.shape),
+        "effective_energy": effective_energy,
+        "crater": crater,
+        "airburst_altitude": np.where(burst, flight["altitude"] / 1000, 0.0),
+        "airburst_energy": np.where(burst, final_energy, 0.0),
+    }
+
+
+# --- Risk assessment ---
+# Checked in this order; "localized" applies when nothing else does.
+RISK_MESSAGES = {
+    "climate": "Potential global climate impact - The impact could throw dust and smoke into the sky, blocking sunlight for months. This might cause food shortages and big changes to the world’s climate.",
+    "fires": "Massive fires & regional shockwaves - The heat and force from the strike could set huge areas on fire. Strong shockwaves could knock down buildings and flatten forests.",
+    "tsunami": "Tsunami risk - If it lands in the sea, giant waves could form and travel far. These tsunamis could flood coastal cities and cause massive destruction.",
+    "shallow": "Shallow impact - A low-angle hit would scatter rock and debris across the land. This could damage towns nearby and fill the air with dust.",
+    "steep": "High-angle - A steep impact would shake the ground like a huge earthquake. Buildings and roads could be destroyed even far from the strike.",
+    "localized": "Localized impact - The asteroid would cause only small, local effects. Most of the world would not be affected.",
+}
+
+
+def risk_flags(diameter, angle, location, energy):
+    """Boolean array per RISK_MESSAGES code for many scenarios at once.
+
+    energy is the (non angle-scaled) impact energy in Mt, as returned in
+    simulate_impacts()["energy"].
+    """
+    diameter = np.asarray(diameter)
+    angle = np.asarray(angle)
+    energy = np.asarray(energy)
+    location = np.asarray(location)
+    on_land = location if location.dtype == bool else location == "Land"
+    on_ocean = ~on_land if location.dtype == bool else location == "Ocean"
+
+    flags = {
+        "climate": energy > CLIMATE_ENERGY,
+        "fires": energy > FIRES_ENERGY,
+        "tsunami": on_ocean & (diameter > TSUNAMI_DIAMETER),
+        "shallow": on_land & (angle < SHALLOW_ANGLE),
+        "steep": on_land & (angle > STEEP_ANGLE) & (energy > STEEP_ENERGY),
+    }
+    any_risk = np.zeros(np.broadcast(diameter, angle, energy, location).shape, dtype=bool)
+    for flag in flags.values():
+        any_risk = any_risk | flag
+    flags["localized"] = ~any_risk
+    return flags
+
+
+# --- Scalar versions (one scenario; used by the pygame UI) ---
+# Plain math on the same constants as the batch engine: a NumPy round trip
+# costs far more than the arithmetic for a single scenario
+def calculate_mass(diameter, material):
+    radius = diameter / 2
+    volume = (4 / 3) * math.pi * radius ** 3
+    return volume * DENSITIES.get(material, DEFAULT_DENSITY)
+
+def impact_energy(diameter, velocity, material):
+    mass = calculate_mass(diameter, material)
+    return 0.5 * mass * (velocity * 1000) ** 2 / TNT_EQUIVALENT
+
+def estimate_crater_size(diameter, velocity, angle, material, location, entry=False):
+    if entry:
+        # The entry stage only exists batched
+        result = simulate_impacts(diameter, velocity, angle, material, location, entry)
+        return float(result["crater"]), float(result["effective_energy"])
+    effective_energy = impact_energy(diameter, velocity, material) * math.sin(math.radians(angle))
+    crater = effective_energy ** (1 / 4) * CRATER_SCALE if location == "Land" else 0.0
+    return crater, effective_energy
+
+def assess_risks(diameter, velocity, angle, material, location, energy=None):
+    """RISK_MESSAGES for one scenario, in order (risk_flags for many)."""
+    if energy is None:
+        energy = impact_energy(diameter, velocity, material)
+    codes = []
+    if energy > CLIMATE_ENERGY:
+        codes.append("climate")
+    if energy > FIRES_ENERGY:
+        codes.append("fires")
+    if location == "Ocean" and diameter > TSUNAMI_DIAMETER:
+        codes.append("tsunami")
+    if location == "Land":
+        if angle < SHALLOW_ANGLE:
+            codes.append("shallow")
+        if angle > STEEP_ANGLE and energy > STEEP_ENERGY:
+            codes.append("steep")
+    return [RISK_MESSAGES[code] for code in codes or ["localized"]]
@@ -3,13 +3,18 @@ import os
 import subprocess
 import sys
 import base64
+import urllib.error
+import urllib.request
 
 # --- Paths ---
 BASE_DIR = os.path.dirname(__file__)
-GAME_MODE_PATH = os.path.join(BASE_DIR, "game_mode.py")
-EXPLORATION_MODE_PATH = os.path.join(BASE_DIR, "exploration_mode.py")
+SCENES_PATH = os.path.join(BASE_DIR, "scenes.py")
 BG_IMAGE_PATH = os.path.join(BASE_DIR, "assets","images", "starry_background.jpg")
 
+# Both modes run in one long-lived pygame process (scenes.py); the buttons
+# send it commands on this localhost port, starting it on first use
+SCENES_PORT = 8766
+
 # --- Colors ---
 NEON_BLUE_ACCENT_COLOR = "#00BFFF"
 NEON_BLUE_SHADOW_RGBA = "rgba(0, 191, 255, 0.7)"
@@ -29,6 +34,17 @@ def get_base64_image(image_path):
         st.error(f"Error reading background image: {e}")
         return None
 
+# --- Launch a mode in the scenes process ---
+def show_scene(scene):
+    request = urllib.request.Request(f"http://127.0.0.1:{SCENES_PORT}/scene/{scene}", method="POST")
+    try:
+        urllib.request.urlopen(request, timeout=2).close()
+    except urllib.error.HTTPError as e:
+        st.error(f"Failed to launch: {e}")
+    except urllib.error.URLError:
+        # Not running yet (or closed): start it on this scene
+        subprocess.Popen([sys.executable, SCENES_PATH, scene, "--listen", str(SCENES_PORT)])
+
 # --- IMPORTANT CHANGE 1: Uncommented and activated the actual image loading ---
 bg_base64 = get_base64_image(BG_IMAGE_PATH)
 
@@ -169,7 +185,7 @@ with col1:
         # st.button is now inside the center column
         if st.button("🚀 Launch Game Mode", key="game", use_container_width=True):
             try:
-                subprocess.Popen([sys.executable, GAME_MODE_PATH])
+                show_scene("game_menu")
             except Exception as e:
                 st.error(f"Failed to launch: {e}")
 
@@ -192,7 +208,7 @@ with col2:
         # st.button is now inside the center column
         if st.button("🔭 Launch Exploration Mode", key="explore", use_container_width=True):
             try:
-                subprocess.Popen([sys.executable, EXPLORATION_MODE_PATH])
+                show_scene("exploration")
             except Exception as e:
                 st.error(f"Failed to launch: {e}")
 
@@ -0,0 +1,143 @@
+"""Struct-of-arrays store for the meteors in Game Mode.
+
+Every meteor field is a row of one float64 array (fields x capacity), with
+the live meteors packed in the first count columns. Movement, Earth
+collision and culling are single vectorized passes over those rows, and
+removing a meteor moves the last one into its slot (swap-remove), so
+nothing is O(n) per meteor.
+
+Order is not kept: removing meteor i puts the last meteor at index i.
+Indices are only valid until the next removal.
+
+    meteors = MeteorStore()
+    meteors.add(x, y, speed, hp, radius)
+    hit = meteors.home(earth_x, earth_y, earth_radius)
+    for x, y in zip(meteors.x, meteors.y): ...
+"""
+import numpy as np
+
+FIELDS = ("x", "y", "prev_x", "prev_y", "speed", "hp", "radius", "angle", "spin")
+X, Y, PREV_X, PREV_Y, SPEED, HP, RADIUS, ANGLE, SPIN = range(len(FIELDS))
+DEFAULT_CAPACITY = 256
+
+
+def _column(row):
+    def get(self):
+        return self.data[row, :self.count]
+
+    def set(self, values):
+        self.data[row, :self.count] = values
+
+    return property(get, set, doc=f"{FIELDS[row]} of every live meteor (a view)")
+
+
+class MeteorStore:
+    """Meteors as NumPy columns; the arrays double when full."""
+
+    x = _column(X)
+    y = _column(Y)
+    prev_x = _column(PREV_X)        # position at the previous tick (drawing interpolates)
+    prev_y = _column(PREV_Y)
+    speed = _column(SPEED)          # pixels per tick
+    hp = _column(HP)
+    radius = _column(RADIUS)
+    angle = _column(ANGLE)          # degrees (not wrapped)
+    spin = _column(SPIN)            # degrees per tick
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.data = np.zeros((len(FIELDS), capacity))
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def add(self, x, y, speed, hp, radius, angle=0.0, spin=0.0):
+        """Append a meteor (standing still at x, y); returns its index."""
+        if self.count == self.data.shape[1]:
+            grown = np.zeros((len(FIELDS), 2 * self.data.shape[1]))
+            grown[:, :self.count] = self.data[:, :self.count]
+            self.data = grown
+        i = self.count
+        self.data[:, i] = (x, y, x, y, speed, hp, radius, angle, spin)
+        self.count += 1
+        return i
+
+    def add_many(self, rows):
+        """Append meteors given as rows of add() arguments (all seven fields)."""
+        block = np.array(rows, dtype=float).T
+        n = block.shape[1]
+        if self.count + n > self.data.shape[1]:
+            grown = np.zeros((len(FIELDS), max(2 * self.data.shape[1], self.count + n)))
+            grown[:, :self.count] = self.data[:, :self.count]
+            self.data = grown
+        x, y, speed, hp, radius, angle, spin = block
+        new = self.data[:, self.count:self.count + n]
+        new[X], new[Y], new[PREV_X], new[PREV_Y] = x, y, x, y
+        new[SPEED], new[HP], new[RADIUS], new[ANGLE], new[SPIN] = speed, hp, radius, angle, spin
+        self.count += n
+
+    def get(self, i):
+        """Meteor i as a dict of field values."""
+        return dict(zip(FIELDS, self.data[:, i].tolist()))
+
+    def remove(self, i):
+        """Remove meteor i by moving the last meteor into its slot."""
+        last = self.count - 1
+        if i != last:
+            self.data[:, i] = self.data[:, last]
+        self.count = last
+
+    def remove_where(self, mask):
+        """Remove every meteor where mask is true, in one pass; returns how many."""
+        mask = np.asarray(mask)
+        if not mask.any():
+            return 0
+        keep = np.flatnonzero(~mask)
+        removed = self.count - len(keep)
+        self.data[:, :len(keep)] = self.data[:, keep]
+        self.count = len(keep)
+        return removed
+
+    def home(self, target_x, target_y, target_radius):
+        """Move (and spin) every meteor one tick straight toward the target.
+
+        Returns a bool mask of meteors that were touching the target (a
+        circle of target_radius) before the move. A meteor at the very
+        centre of the target stays put.
+        """
+        # Whole-row operations on (2, n) blocks: with few meteors the cost
+        # is the number of NumPy calls, not their length
+        n = self.count
+        data = self.data
+        pos = data[X:Y + 1, :n]
+        data[PREV_X:PREV_Y + 1, :n] = pos
+        delta = np.array(((target_x,), (target_y,))) - pos
+        dx, dy = delta
+        dist = np.sqrt(dx * dx + dy * dy)
+        # A meteor already at the target (dist 0) has delta 0 and stays put
+        pos += delta * (data[SPEED, :n] / np.maximum(dist, 1e-300))
+        data[ANGLE, :n] += data[SPIN, :n]
+        return dist < target_radius + data[RADIUS, :n]
+
+    def cull(self, width, height):
+        """Remove meteors entirely outside the (0, 0, width, height) screen."""
+        n = self.count
+        if not n:
+            return 0
+        pos, r = self.data[X:Y + 1, :n], self.data[RADIUS, :n]
+        (min_x, min_y), (max_x, max_y) = pos.min(axis=1), pos.max(axis=1)
+        if min_x >= 0 and min_y >= 0 and max_x <= width and max_y <= height:
+            return 0    # every centre is on screen
+        outside = ((pos + r < 0) | (pos - r > ((width,), (height,)))).any(axis=0)
+        return self.remove_where(outside)
+
+    def interpolated(self, alpha):
+        """x, y and angle of every meteor, alpha of the way from the previous tick."""
+        n = self.count
+        prev_x, prev_y = self.data[PREV_X, :n], self.data[PREV_Y, :n]
+        return (prev_x + (self.data[X, :n] - prev_x) * alpha,
+                prev_y + (self.data[Y, :n] - prev_y) * alpha,
+                self.data[ANGLE, :n] - self.data[SPIN, :n] * (1 - alpha))
@@ -0,0 +1,312 @@
+"""Offline small-body catalog with a memory-mapped columnar index.
+
+ingest() turns a local catalog dump (SBDB-style CSV, JSON/JSONL records or a
+saved NeoWs browse page) into one .npy file per column plus sorted indexes
+on diameter, velocity and the hazard flag. NeoCatalog opens them with
+mmap_mode="r", so range queries only touch the pages they need and results
+feed straight into impact_model.simulate_impacts.
+
+    python neo_catalog.py ingest sbdb_dump.csv catalog/
+    python neo_catalog.py query catalog/ --diameter 100 500 --velocity 20 --hazardous
+"""
+import argparse
+import array
+import csv
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+from impact_model import DENSITIES, simulate_impacts
+
+CATALOG_VERSION = 1
+MATERIALS = list(DENSITIES)
+DEFAULT_ALBEDO = 0.14  # typical NEO geometric albedo for H -> diameter
+
+# Accepted spellings per field, first match wins
+DIAMETER_KM_FIELDS = ("diameter", "diameter_km")
+DIAMETER_M_FIELDS = ("diameter_m",)
+VELOCITY_FIELDS = ("velocity", "v_rel", "v_inf", "velocity_kms", "relative_velocity_kms")
+HAZARD_FIELDS = ("hazardous", "pha", "is_potentially_hazardous_asteroid")
+NAME_FIELDS = ("full_name", "name", "designation", "des", "id")
+
+
+# --- Record normalization ---
+def _first(record, fields):
+    for field in fields:
+        value = record.get(field)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _flag(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().upper() in ("Y", "YES", "TRUE", "1")
+
+
+def _neows_fields(record):
+    """Flatten the nested fields of a NeoWs near_earth_object."""
+    flat = dict(record)
+    estimated = record.get("estimated_diameter", {}).get("meters")
+    if estimated:
+        # Geometric mean of the min/max estimate
+        flat["diameter_m"] = math.sqrt(estimated["estimated_diameter_min"] * estimated["estimated_diameter_max"])
+    approaches = record.get("close_approach_data") or []
+    earth = [a for a in approaches if a.get("orbiting_body", "Earth") == "Earth"]
+    if earth:
+        flat["velocity"] = float(earth[0]["relative_velocity"]["kilometers_per_second"])
+    if "absolute_magnitude_h" in record:
+        flat["H"] = record["absolute_magnitude_h"]
+    return flat
+
+
+def normalize(record):
+    """(name, diameter m, velocity km/s, hazardous, material index) for one record."""
+    if "estimated_diameter" in record or "close_approach_data" in record:
+        record = _neows_fields(record)
+
+    diameter = _float(_first(record, DIAMETER_M_FIELDS))
+    if math.isnan(diameter):
+        diameter = _float(_first(record, DIAMETER_KM_FIELDS)) * 1000
+    if math.isnan(diameter):
+        # Estimate from absolute magnitude: D(km) = 1329 / sqrt(albedo) * 10^(-H/5)
+        h = _float(record.get("H"))
+        albedo = _float(record.get("albedo"))
+        if not albedo > 0:
+            albedo = DEFAULT_ALBEDO
+        diameter = 1329 / math.sqrt(albedo) * 10 ** (-h / 5) * 1000
+
+    velocity = _float(_first(record, VELOCITY_FIELDS))
+    hazardous = _flag(_first(record, HAZARD_FIELDS) or False)
+
+    # Composition from object kind / spectral class when the dump has it
+    kind = str(record.get("kind") or "")
+    spectral = str(record.get("spec_B") or record.get("spec_T") or record.get("spectral_type") or "")
+    if kind.startswith("c"):
+        material = "Ice"
+    elif spectral.upper().startswith("M"):
+        material = "Iron"
+    else:
+        material = "Rock"
+
+    name = str(_first(record, NAME_FIELDS) or "").strip()
+    return name, diameter, velocity, hazardous, MATERIALS.index(material)
+
+
+def read_records(path):
+    """Yield raw record dicts from a CSV, JSONL or JSON dump."""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, newline="", encoding="utf-8") as f:
+        if ext == ".csv":
+            yield from csv.DictReader(f)
+        elif ext in (".jsonl", ".ndjson"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            data = json.load(f)
+            if isinstance(data, dict):
+                # NeoWs browse/feed pages or SBDB API {"fields": [...], "data": [[...]]}
+                if "near_earth_objects" in data:
+                    objects = data["near_earth_objects"]
+                    if isinstance(objects, dict):  # feed: {date: [objects]}
+                        objects = [o for day in objects.values() for o in day]
+                    yield from objects
+                elif "fields" in data and "data" in data:
+                    for row in data["data"]:
+                        yield dict(zip(data["fields"], row))
+                else:
+                    raise ValueError(f"Unrecognized catalog JSON layout in {path}")
+            else:
+                yield from data
+
+
+# --- Ingestion ---
+def ingest(records, out_dir):
+    """Write normalized records to out_dir as columnar .npy files + indexes.
+
+    records is any iterable of dicts (see read_records). Returns the row count.
+    """
+    names = bytearray()
+    name_offsets = array.array("q", [0])
+    diameter = array.array("d")
+    velocity = array.array("d")
+    hazardous = array.array("b")
+    material = array.array("B")
+
+    for record in records:
+        name, d, v, h, m = normalize(record)
+        names += name.encode("utf-8")
+        name_offsets.append(len(names))
+        diameter.append(d)
+        velocity.append(v)
+        hazardous.append(h)
+        material.append(m)
+
+    os.makedirs(out_dir, exist_ok=True)
+    columns = {
+        "diameter": np.frombuffer(diameter, dtype=np.float64),
+        "velocity": np.frombuffer(velocity, dtype=np.float64),
+        "hazardous": np.frombuffer(hazardous, dtype=np.int8).astype(bool),
+        "material": np.frombuffer(material, dtype=np.uint8),
+        "name_offsets": np.frombuffer(name_offsets, dtype=np.int64),
+        "names": np.frombuffer(bytes(names), dtype=np.uint8),
+    }
+    # Sorted indexes: row order plus the values in that order for searchsorted
+    # (NaNs sort last and are never inside a finite range)
+    for key in ("diameter", "velocity"):
+        order = np.argsort(columns[key], kind="stable")
+        columns[f"{key}_order"] = order
+        columns[f"{key}_sorted"] = columns[key][order]
+    # Hazardous rows first, in row order
+    columns["hazard_order"] = np.argsort(~columns["hazardous"], kind="stable")
+
+    for key, values in columns.items():
+        np.save(os.path.join(out_dir, f"{key}.npy"), values)
+    meta = {
+        "version": CATALOG_VERSION,
+        "rows": len(diameter),
+        "hazardous": int(columns["hazardous"].sum()),
+        "materials": MATERIALS,
+    }
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return len(diameter)
+
+
+# --- Queries ---
+class NeoCatalog:
+    """Memory-mapped view of an ingested catalog directory."""
+
+    def __init__(self, path):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != CATALOG_VERSION:
+            raise ValueError(f"{path} was ingested with catalog version {self.meta.get('version')}, "
+                             f"expected {CATALOG_VERSION}; re-run ingest")
+        self.path = path
+        self._columns = {}
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def column(self, key):
+        if key not in self._columns:
+            self._columns[key] = np.load(os.path.join(self.path, f"{key}.npy"), mmap_mode="r")
+        return self._columns[key]
+
+    def _range_rows(self, key, lo, hi):
+        """Unsorted row ids with lo <= value <= hi via the sorted index."""
+        values = self.column(f"{key}_sorted")
+        start = 0 if lo is None else np.searchsorted(values, lo, side="left")
+        stop = np.searchsorted(values, math.inf if hi is None else hi, side="right")
+        return self.column(f"{key}_order")[start:stop]
+
+    def query(self, diameter=None, velocity=None, hazardous=None):
+        """Row ids (ascending) matching every given constraint.
+
+        diameter (m) and velocity (km/s) are (lo, hi) tuples, either bound
+        may be None; hazardous is True/False/None. The most selective
+        index drives the scan and the rest are checked on its candidates.
+        """
+        candidates = []
+        if diameter is not None:
+            candidates.append(("diameter", self._range_rows("diameter", *diameter)))
+        if velocity is not None:
+            candidates.append(("velocity", self._range_rows("velocity", *velocity)))
+        if hazardous is not None:
+            n_hazardous = self.meta["hazardous"]
+            order = self.column("hazard_order")
+            candidates.append(("hazardous", order[:n_hazardous] if hazardous else order[n_hazardous:]))
+        if not candidates:
+            return np.arange(len(self))
+
+        candidates.sort(key=lambda c: len(c[1]))
+        driver, rows = candidates[0]
+        rows = np.sort(rows)
+        keep = np.ones(len(rows), dtype=bool)
+        for key, bounds in (("diameter", diameter), ("velocity", velocity)):
+            if bounds is not None and key != driver:
+                values = self.column(key)[rows]
+                lo, hi = bounds
+                if lo is not None:
+                    keep &= values >= lo
+                keep &= values <= (math.inf if hi is None else hi)
+        if hazardous is not None and driver != "hazardous":
+            keep &= self.column("hazardous")[rows] == hazardous
+        return rows[keep]
+
+    def names(self, rows):
+        offsets = self.column("name_offsets")
+        blob = self.column("names")
+        return [bytes(blob[offsets[r]:offsets[r + 1]]).decode("utf-8") for r in rows]
+
+    def impact_inputs(self, rows, angle=45.0, location="Land"):
+        """simulate_impacts() arguments for the given rows."""
+        densities = np.array([DENSITIES[m] for m in self.meta["materials"]], dtype=np.float64)
+        return {
+            "diameter": self.column("diameter")[rows],
+            "velocity": self.column("velocity")[rows],
+            "angle": angle,
+            "material": densities[self.column("material")[rows]],
+            "location": location,
+        }
+
+    def simulate(self, rows, angle=45.0, location="Land", entry=False):
+        return simulate_impacts(**self.impact_inputs(rows, angle, location), entry=entry)
+
+
+# --- Command line ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline NEO catalog ingestion and queries")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_ingest = sub.add_parser("ingest", help="build a columnar catalog from a CSV/JSON dump")
+    p_ingest.add_argument("source")
+    p_ingest.add_argument("catalog")
+    p_query = sub.add_parser("query", help="range query + impact model on the matches")
+    p_query.add_argument("catalog")
+    p_query.add_argument("--diameter", nargs=2, type=float, metavar=("MIN_M", "MAX_M"))
+    p_query.add_argument("--velocity", nargs=2, type=float, metavar=("MIN_KMS", "MAX_KMS"),
+                         help="use inf for no upper bound")
+    p_query.add_argument("--hazardous", action="store_true")
+    p_query.add_argument("--angle", type=float, default=45.0)
+    p_query.add_argument("--location", default="Land")
+    p_query.add_argument("--show", type=int, default=10, help="matches to print")
+    p_query.add_argument("--entry", action="store_true", help="simulate atmospheric entry first")
+    args = parser.parse_args(argv)
+
+    if args.command == "ingest":
+        start = time.perf_counter()
+        rows = ingest(read_records(args.source), args.catalog)
+        print(f"Ingested {rows:,} objects into {args.catalog} in {time.perf_counter() - start:.2f} s")
+        return 0
+
+    catalog = NeoCatalog(args.catalog)
+    start = time.perf_counter()
+    rows = catalog.query(diameter=args.diameter, velocity=args.velocity,
+                         hazardous=True if args.hazardous else None)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"{len(rows):,} of {len(catalog):,} objects match ({elapsed_ms:.2f} ms)")
+    if len(rows):
+        result = catalog.simulate(rows, args.angle, args.location, args.entry)
+        inputs = catalog.impact_inputs(rows[:args.show])
+        for i, name in enumerate(catalog.names(rows[:args.show])):
+            print(f"  {name or rows[i]}: {inputs['diameter'][i]:.0f} m, {inputs['velocity'][i]:.1f} km/s, "
+                  f"{result['effective_energy'][i]:.3g} Mt, crater {result['crater'][i]:.1f} km")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
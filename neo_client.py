@@ -0,0 +1,218 @@
+"""Pooled, cached client for NASA NeoWs-style asteroid lookups.
+
+All requests go through one requests.Session with a sized connection pool.
+Responses are cached on disk; fresh entries (younger than the TTL) are
+served without any request, stale ones are revalidated with If-None-Match
+so an unchanged object costs a 304. 429/503 answers back off using
+Retry-After (or exponential backoff) before retrying.
+
+    python neo_client.py fetch --pages 5 -o neos.jsonl   # then: neo_catalog.py ingest
+    python neo_client.py bench                           # against the local stub
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+NEOWS_URL = "https://api.nasa.gov/neo/rest/v1"
+BASE_DIR = os.path.dirname(__file__)
+CACHE_DIR = os.path.join(BASE_DIR, "assets", "cache", "neows")
+DEFAULT_TTL = 24 * 3600
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+class NeoWsClient:
+    def __init__(self, base_url=NEOWS_URL, api_key=None, cache_dir=CACHE_DIR, ttl=DEFAULT_TTL,
+                 pool_size=8, max_retries=5, backoff=0.5, timeout=10):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key or os.environ.get("NASA_API_KEY", "DEMO_KEY")
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.pool_size = pool_size
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "requests": 0, "retries": 0}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    # --- Disk cache ---
+    def _cache_path(self, path, params):
+        # The API key is not part of the identity of a response
+        key = json.dumps([self.base_url, path, sorted(params.items())])
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _read_cache(self, cache_path):
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, cache_path, entry):
+        tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, cache_path)
+
+    # --- HTTP ---
+    def _request(self, path, params, headers):
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        for attempt in range(self.max_retries + 1):
+            self._count("requests")
+            response = self.session.get(url, params={**params, "api_key": self.api_key},
+                                        headers=headers, timeout=self.timeout)
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                break
+            self._count("retries")
+            retry_after = response.headers.get("Retry-After")
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                delay = self.backoff * 2 ** attempt
+            # Jitter keeps concurrent workers from retrying in lockstep
+            time.sleep(delay * random.uniform(1.0, 1.25))
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    def get_json(self, path, params=None):
+        """GET path (relative to base_url) as JSON, through the disk cache."""
+        params = dict(params or {})
+        if not self.cache_dir:
+            self._count("misses")
+            return self._request(path, params, {}).json()
+
+        cache_path = self._cache_path(path, params)
+        entry = self._read_cache(cache_path)
+        now = time.time()
+        if entry is not None and now - entry["fetched_at"] < self.ttl:
+            self._count("hits")
+            return entry["body"]
+
+        headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else {}
+        response = self._request(path, params, headers)
+        if response.status_code == 304:
+            self._count("revalidated")
+            entry["fetched_at"] = now
+        else:
+            self._count("misses")
+            entry = {"etag": response.headers.get("ETag"), "fetched_at": now, "body": response.json()}
+        self._write_cache(cache_path, entry)
+        return entry["body"]
+
+    # --- NeoWs endpoints ---
+    def lookup(self, asteroid_id):
+        return self.get_json(f"neo/{asteroid_id}")
+
+    def browse_page(self, page, size=20):
+        return self.get_json("neo/browse", {"page": page, "size": size})
+
+    def browse(self, pages=None, size=20, workers=None):
+        """near_earth_objects from browse pages 0..pages-1 (all if None).
+
+        The first page gives total_pages; the rest are fetched concurrently.
+        """
+        first = self.browse_page(0, size)
+        total_pages = first["page"]["total_pages"]
+        pages = total_pages if pages is None else min(pages, total_pages)
+        objects = list(first["near_earth_objects"])
+        with ThreadPoolExecutor(max_workers=workers or self.pool_size) as pool:
+            for body in pool.map(lambda p: self.browse_page(p, size), range(1, pages)):
+                objects.extend(body["near_earth_objects"])
+        return objects
+
+    def lookup_many(self, asteroid_ids, workers=None):
+        with ThreadPoolExecutor(max_workers=workers or self.pool_size) as pool:
+            return list(pool.map(self.lookup, asteroid_ids))
+
+
+# --- Command line ---
+def _bench(args):
+    """Cold / warm / revalidation passes against the local stub."""
+    import shutil
+    import tempfile
+    from neo_stub_server import start_stub_server
+
+    server, base_url = start_stub_server(total_objects=args.pages * 20, rate_limit=args.rate_limit,
+                                         latency=args.latency)
+    cache_dir = tempfile.mkdtemp(prefix="neows-bench-")
+    try:
+        with NeoWsClient(base_url, cache_dir=cache_dir, pool_size=args.workers) as client:
+            passes = [("cold", None), ("warm", None), ("revalidate", 0)]
+            for name, ttl in passes:
+                if ttl is not None:
+                    client.ttl = ttl
+                before = dict(client.stats)
+                start = time.perf_counter()
+                objects = client.browse(size=20, workers=args.workers)
+                elapsed = time.perf_counter() - start
+                delta = {k: client.stats[k] - before[k] for k in client.stats}
+                lookups = delta["hits"] + delta["misses"] + delta["revalidated"]
+                print(f"{name:>10}: {len(objects)} objects, {args.pages} pages in {elapsed * 1000:.0f} ms "
+                      f"({args.pages / elapsed:,.0f} pages/s)  hit rate {delta['hits'] / lookups:.0%}  "
+                      f"304s {delta['revalidated']}  requests {delta['requests']}  retries {delta['retries']}")
+        print(f"stub saw {server.stats}")
+    finally:
+        server.shutdown()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NeoWs client")
+    parser.add_argument("--base-url", default=NEOWS_URL)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_fetch = sub.add_parser("fetch", help="download browse pages as JSONL (for neo_catalog.py ingest)")
+    p_fetch.add_argument("--pages", type=int, default=5)
+    p_fetch.add_argument("--workers", type=int, default=8)
+    p_fetch.add_argument("-o", "--output", required=True)
+    p_bench = sub.add_parser("bench", help="throughput and cache hit rates against the local stub")
+    p_bench.add_argument("--pages", type=int, default=100)
+    p_bench.add_argument("--workers", type=int, default=8)
+    p_bench.add_argument("--rate-limit", type=int, default=None)
+    p_bench.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        _bench(args)
+        return 0
+
+    with NeoWsClient(args.base_url, pool_size=args.workers) as client:
+        objects = client.browse(pages=args.pages, workers=args.workers)
+        with open(args.output, "w", encoding="utf-8") as f:
+            for obj in objects:
+                f.write(json.dumps(obj) + "\n")
+        print(f"Wrote {len(objects)} objects to {args.output} ({client.stats})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""Local NeoWs-compatible stub server for offline tests and benchmarks.
+
+Serves deterministic synthetic objects in the NASA NeoWs JSON layout:
+
+    GET /neo/rest/v1/neo/browse?page=N&size=M
+    GET /neo/rest/v1/neo/<id>
+
+Responses carry an ETag and honour If-None-Match (304). An optional
+requests-per-second limit answers 429 with Retry-After, like the real API.
+
+    python neo_stub_server.py --port 8765 --objects 5000 --rate-limit 200
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+API_PREFIX = "/neo/rest/v1"
+FIRST_ID = 2000000
+
+
+def make_object(index, base_url=""):
+    """Synthetic near_earth_object; the same index always gives the same object."""
+    rng = random.Random(index)
+    neo_id = str(FIRST_ID + index)
+    h = round(rng.uniform(14, 28), 2)
+    d_max_km = 1329 / 0.25 ** 0.5 * 10 ** (-h / 5)
+    d_min_km = d_max_km * 0.447
+    return {
+        "id": neo_id,
+        "neo_reference_id": neo_id,
+        "name": f"({2000 + index % 30} {chr(65 + index % 26)}{chr(65 + index // 26 % 26)}{index})",
+        "absolute_magnitude_h": h,
+        "estimated_diameter": {
+            "kilometers": {"estimated_diameter_min": d_min_km, "estimated_diameter_max": d_max_km},
+            "meters": {"estimated_diameter_min": d_min_km * 1000, "estimated_diameter_max": d_max_km * 1000},
+        },
+        "is_potentially_hazardous_asteroid": h < 22 and rng.random() < 0.4,
+        "close_approach_data": [{
+            "close_approach_date": f"20{rng.randint(25, 99)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+            "relative_velocity": {"kilometers_per_second": f"{rng.uniform(5, 40):.6f}"},
+            "miss_distance": {"kilometers": f"{rng.uniform(1e5, 7e7):.1f}"},
+            "orbiting_body": "Earth",
+        }],
+        "links": {"self": f"{base_url}{API_PREFIX}/neo/{neo_id}"},
+    }
+
+
+class _RateLimiter:
+    """Fixed one-second windows, like the X-RateLimit headers of the real API."""
+
+    def __init__(self, per_second):
+        self.per_second = per_second
+        self.lock = threading.Lock()
+        self.window = int(time.monotonic())
+        self.count = 0
+
+    def allow(self):
+        with self.lock:
+            now = int(time.monotonic())
+            if now != self.window:
+                self.window, self.count = now, 0
+            self.count += 1
+            return self.count <= self.per_second, max(self.per_second - self.count, 0)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so client pooling matters
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=None, headers=None):
+        payload = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        server = self.server
+        with server.stats_lock:
+            server.stats["requests"] += 1
+        if server.latency:
+            time.sleep(server.latency)
+
+        headers = {}
+        if server.limiter is not None:
+            allowed, remaining = server.limiter.allow()
+            headers["X-RateLimit-Limit"] = str(server.limiter.per_second)
+            headers["X-RateLimit-Remaining"] = str(remaining)
+            if not allowed:
+                with server.stats_lock:
+                    server.stats["rate_limited"] += 1
+                headers["Retry-After"] = "1"
+                return self._send(429, {"error": {"code": "OVER_RATE_LIMIT"}}, headers)
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        base_url = f"http://{self.headers.get('Host', '')}"
+        if url.path == f"{API_PREFIX}/neo/browse":
+            size = min(int(query.get("size", ["20"])[0]), 20)
+            page = int(query.get("page", ["0"])[0])
+            total_pages = -(-server.total_objects // size)
+            start = page * size
+            objects = [make_object(i, base_url) for i in range(start, min(start + size, server.total_objects))]
+            body = {
+                "page": {"size": size, "total_elements": server.total_objects,
+                         "total_pages": total_pages, "number": page},
+                "near_earth_objects": objects,
+            }
+        elif url.path.startswith(f"{API_PREFIX}/neo/"):
+            try:
+                index = int(url.path.rsplit("/", 1)[1]) - FIRST_ID
+            except ValueError:
+                index = -1
+            if not 0 <= index < server.total_objects:
+                return self._send(404, {"error": "not found"}, headers)
+            body = make_object(index, base_url)
+        else:
+            return self._send(404, {"error": "not found"}, headers)
+
+        etag = '"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest() + '"'
+        headers["ETag"] = etag
+        if self.headers.get("If-None-Match") == etag:
+            with server.stats_lock:
+                server.stats["not_modified"] += 1
+            return self._send(304, None, headers)
+        self._send(200, body, headers)
+
+
+def start_stub_server(port=0, total_objects=2000, rate_limit=None, latency=0.0):
+    """Start the stub on a daemon thread; returns (server, base_url).
+
+    rate_limit is requests per second (None for unlimited), latency adds a
+    fixed delay per request to mimic a remote API. Call server.shutdown()
+    when done.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.daemon_threads = True
+    server.total_objects = total_objects
+    server.limiter = _RateLimiter(rate_limit) if rate_limit else None
+    server.latency = latency
+    server.stats = {"requests": 0, "not_modified": 0, "rate_limited": 0}
+    server.stats_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}{API_PREFIX}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NeoWs-compatible stub server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--objects", type=int, default=2000)
+    parser.add_argument("--rate-limit", type=int, default=None, help="requests per second")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added per request")
+    args = parser.parse_args(argv)
+    server, base_url = start_stub_server(args.port, args.objects, args.rate_limit, args.latency)
+    print(f"NeoWs stub serving {args.objects} objects at {base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
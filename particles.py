@@ -0,0 +1,211 @@
+"""Array-backed particle bursts for explosions.
+
+Positions, velocities, ages, lifetimes and heat (starting brightness) of
+every particle live in NumPy arrays allocated once, with the live particles
+packed at the front; a tick updates them all with a few vectorized ops and
+drops the dead ones in one compaction.
+
+Particles are drawn additively (BLEND_RGB_ADD) from a fire palette: black
+adds nothing, and a particle fades by getting darker. Up to SPLAT_THRESHOLD
+visible particles are drawn with Surface.blits of pre-baked sprite frames
+(one per brightness level, shrinking as they cool). Above that the per-blit
+cost dominates (~1 us each, so 50k blits alone take longer than a frame),
+and particles are instead summed into a heat buffer with np.bincount, one
+SPLAT_CELL-sized square each, mapped through the same palette and added to
+the screen in a single blit.
+
+    particles = ParticleSystem()
+    particles.emit(x, y, burst_size(energy), speed=6)
+    for _ in sim.steps():
+        particles.update()            # one tick
+    particles.draw(screen, sim.alpha)
+"""
+import math
+from itertools import repeat
+
+import numpy as np
+import pygame
+
+DEFAULT_CAPACITY = 50_000
+FIRE_COLORS = ((200, 40, 0), (255, 140, 0), (255, 220, 50))  # red, orange, yellow
+SPRITE_FRAMES = 16        # brightness levels baked as sprites
+SPRITE_RADIUS = 3         # pixels, at full brightness
+SPLAT_THRESHOLD = 2_000   # more visible particles than this are splatted
+SPLAT_CELL = 2            # splatted particles are SPLAT_CELL x SPLAT_CELL pixels
+DRAG = 0.93               # share of velocity kept per tick
+GRAVITY = 0.03            # pixels per tick^2, downwards
+
+
+def fire_palette(colors=FIRE_COLORS):
+    """256 RGB entries ramping from black through colors (hottest last)."""
+    stops = np.array([(0, 0, 0)] + [tuple(c) for c in colors], dtype=np.float64)
+    x = np.linspace(0, len(stops) - 1, 256)
+    i = np.minimum(x.astype(int), len(stops) - 2)
+    t = (x - i)[:, None]
+    ramp = stops[i] * (1 - t) + stops[i + 1] * t
+    return [tuple(c) for c in np.rint(ramp).astype(int).tolist()]
+
+
+def burst_size(energy, per_decade=1_500, floor=-4.0, minimum=200, maximum=DEFAULT_CAPACITY):
+    """Particles for an impact of energy megatons: per_decade per factor of
+    ten above 10**floor Mt, within [minimum, maximum]."""
+    decades = math.log10(energy) - floor if energy > 0 else 0.0
+    return int(min(max(per_decade * decades, minimum), maximum))
+
+
+class ParticleSystem:
+    """A fixed-capacity pool of additive, fading particles.
+
+    Speeds are pixels per tick and lifetimes are ticks, like the rest of the
+    fixed-timestep simulation. Emitting into a full pool drops the overflow.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, colors=FIRE_COLORS, drag=DRAG, gravity=GRAVITY, seed=None):
+        self.capacity = capacity
+        self.drag = drag
+        self.gravity = gravity
+        self.rng = np.random.default_rng(seed)
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), np.float32)
+        self.prev = np.zeros((capacity, 2), np.float32)   # position at the previous tick
+        self.vel = np.zeros((capacity, 2), np.float32)
+        self.age = np.zeros(capacity, np.float32)
+        self.life = np.ones(capacity, np.float32)
+        self.heat = np.zeros(capacity, np.float32)        # starting brightness, 0..1
+        self.palette = fire_palette(colors)
+        self.sprites = None
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y, count, speed=4.0, life=30, heat=1.0):
+        """Burst count particles out of (x, y) in all directions.
+
+        Each gets up to speed pixels per tick, 50-100% of life ticks and
+        70-100% of heat. Returns how many were emitted.
+        """
+        if self.count + count > self.capacity:
+            self._compact(self.age[:self.count] < self.life[:self.count])
+        start = self.count
+        count = max(0, min(int(count), self.capacity - start))
+        if not count:
+            return 0
+        end = start + count
+        rng = self.rng
+        angle = rng.uniform(0, 2 * np.pi, count)
+        # sqrt keeps the burst filled rather than bunched at its edge
+        magnitude = speed * np.sqrt(rng.random(count))
+        self.pos[start:end] = (x, y)
+        self.prev[start:end] = (x, y)
+        self.vel[start:end, 0] = np.cos(angle) * magnitude
+        self.vel[start:end, 1] = np.sin(angle) * magnitude
+        self.age[start:end] = 0
+        self.life[start:end] = life * rng.uniform(0.5, 1.0, count)
+        self.heat[start:end] = heat * rng.uniform(0.7, 1.0, count)
+        self.count = end
+        return count
+
+    def update(self):
+        """Advance every particle by one tick.
+
+        Dead particles (age >= life) stay in place, drawn as nothing, until
+        a quarter of the pool is dead; then they are dropped in one pass.
+        """
+        n = self.count
+        if not n:
+            return
+        pos, vel, age = self.pos[:n], self.vel[:n], self.age[:n]
+        self.prev[:n] = pos
+        pos += vel
+        vel *= self.drag
+        vel[:, 1] += self.gravity
+        age += 1
+        alive = age < self.life[:n]
+        if 4 * (n - np.count_nonzero(alive)) >= n:
+            self._compact(alive)
+
+    def _compact(self, alive):
+        keep = np.flatnonzero(alive)
+        for array in (self.pos, self.prev, self.vel, self.age, self.life, self.heat):
+            array[:len(keep)] = array[keep]
+        self.count = len(keep)
+
+    # --- Drawing ---
+    def _positions(self, alpha):
+        """x and y of every particle, alpha of the way from prev to pos."""
+        n = self.count
+        prev, pos = self.prev[:n], self.pos[:n]
+        return (prev[:, 0] + (pos[:, 0] - prev[:, 0]) * alpha,
+                prev[:, 1] + (pos[:, 1] - prev[:, 1]) * alpha)
+
+    def bounds(self, alpha=1.0):
+        """Rect covering what draw(surface, alpha) would touch, or None."""
+        if not self.count:
+            return None
+        x, y = self._positions(alpha)
+        x0, x1, y0, y1 = x.min(), x.max(), y.min(), y.max()
+        pad = max(SPRITE_RADIUS, SPLAT_CELL) + 1
+        return pygame.Rect(int(x0) - pad, int(y0) - pad, int(x1 - x0) + 2 * pad + 1, int(y1 - y0) + 2 * pad + 1)
+
+    def _bake_sprites(self):
+        sprites = []
+        size = 2 * SPRITE_RADIUS + 1
+        for level in range(SPRITE_FRAMES):
+            brightness = (level + 1) / SPRITE_FRAMES
+            sprite = pygame.Surface((size, size))
+            radius = max(1, round(SPRITE_RADIUS * brightness))
+            pygame.draw.circle(sprite, self.palette[int(255 * brightness)], (SPRITE_RADIUS, SPRITE_RADIUS), radius)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert()
+            sprites.append(sprite)
+        self.sprites = np.empty(SPRITE_FRAMES, dtype=object)
+        self.sprites[:] = sprites
+
+    def draw(self, surface, alpha=1.0):
+        """Draw the particles interpolated alpha of the way to the current tick.
+
+        Only particles inside the surface's clip rect are drawn.
+        """
+        if not self.count:
+            return
+        n = self.count
+        x, y = self._positions(alpha)
+        brightness = self.heat[:n] * (1 - self.age[:n] / self.life[:n])
+        clip = surface.get_clip().inflate(2 * SPRITE_RADIUS, 2 * SPRITE_RADIUS)
+        visible = brightness > 0
+        if x.min() < clip.left or x.max() >= clip.right:
+            visible &= (x >= clip.left) & (x < clip.right)
+        if y.min() < clip.top or y.max() >= clip.bottom:
+            visible &= (y >= clip.top) & (y < clip.bottom)
+        if not visible.all():
+            x, y, brightness = x[visible], y[visible], brightness[visible]
+        if not len(x):
+            return
+        if len(x) <= SPLAT_THRESHOLD:
+            self._draw_sprites(surface, x, y, brightness)
+        else:
+            self._draw_splat(surface, x, y, brightness)
+
+    def _draw_sprites(self, surface, x, y, brightness):
+        if self.sprites is None:
+            self._bake_sprites()
+        level = np.minimum((brightness * SPRITE_FRAMES).astype(np.intp), SPRITE_FRAMES - 1)
+        topleft = zip((x - SPRITE_RADIUS).astype(np.int32).tolist(), (y - SPRITE_RADIUS).astype(np.int32).tolist())
+        surface.blits(zip(self.sprites[level].tolist(), topleft, repeat(None), repeat(pygame.BLEND_RGB_ADD)),
+                      doreturn=False)
+
+    def _draw_splat(self, surface, x, y, brightness):
+        clip = surface.get_clip()
+        # Cell coordinates, kept inside the clip rect (truncation is floor there)
+        cx = (np.clip(x, clip.left, clip.right - 1) * (1 / SPLAT_CELL)).astype(np.int32)
+        cy = (np.clip(y, clip.top, clip.bottom - 1) * (1 / SPLAT_CELL)).astype(np.int32)
+        x0, y0 = int(cx.min()), int(cy.min())
+        width, height = int(cx.max()) - x0 + 1, int(cy.max()) - y0 + 1
+        index = (cy - y0) * width + (cx - x0)
+        heat = np.bincount(index, weights=brightness * 255, minlength=width * height)
+        pixels = np.minimum(heat, 255).astype(np.uint8)
+        layer = pygame.image.frombuffer(pixels, (width, height), "P")
+        layer.set_palette(self.palette)
+        layer = layer.convert(surface)
+        layer = pygame.transform.scale(layer, (width * SPLAT_CELL, height * SPLAT_CELL))
+        surface.blit(layer, (x0 * SPLAT_CELL, y0 * SPLAT_CELL), special_flags=pygame.BLEND_RGB_ADD)
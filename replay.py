@@ -0,0 +1,159 @@
+"""Recorded Game Mode sessions: a compact binary log and headless playback.
+
+A game is fully determined by its GameState seed, the spawn interval, the
+wave definition and the clicks applied at each tick, so that is all a
+replay stores, plus the tick count, score and outcome at the end to check
+playback against. Playback runs game_sim directly (no pygame, no display,
+no frame clock), as fast as the CPU allows.
+
+File layout, little-endian:
+    header  4s magic, H version, q seed, d spawn interval (seconds)
+    waves   I length, then the wave definition as UTF-8 JSON (length 0:
+            the classic rules); not in version 1 files
+    click   I tick, H x, H y                    8 bytes per click
+    footer  I END, I ticks, q score, ? game over
+
+    python Game_Mode.py --record last.mmr      # last-1.mmr, last-2.mmr, ...
+    python replay.py last-*.mmr                 # exit status 1 on a mismatch
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+
+from game_sim import SPAWN_INTERVAL, GameState
+
+MAGIC = b"MMRP"
+VERSION = 2
+HEADER = struct.Struct("<4sHqd")
+WAVES = struct.Struct("<I")
+CLICK = struct.Struct("<IHH")
+FOOTER = struct.Struct("<IIq?")
+END = 0xFFFFFFFF
+SEED_RANGE = (-2 ** 63, 2 ** 63)    # what the header's q holds
+
+
+class Replay:
+    """Seed, settings and click log of one game (clicks are (tick, x, y))."""
+
+    def __init__(self, seed, spawn_interval=SPAWN_INTERVAL, clicks=None, ticks=0, score=0, game_over=False,
+                 waves=None):
+        self.seed = seed
+        self.spawn_interval = spawn_interval
+        self.waves = waves
+        self.clicks = list(clicks or [])
+        self.ticks = ticks
+        self.score = score
+        self.game_over = game_over
+
+    @classmethod
+    def start(cls, state):
+        """An empty replay for a game about to be played from state."""
+        return cls(state.seed, state.spawn_interval, waves=state.waves)
+
+    def record(self, tick, clicks):
+        """Log the clicks applied on tick."""
+        self.clicks.extend((tick, int(x), int(y)) for x, y in clicks)
+
+    def finish(self, state):
+        """Note how the game ended, for playback to check against."""
+        self.ticks, self.score, self.game_over = state.ticks, state.score, state.game_over
+
+    def new_state(self):
+        return GameState(self.seed, self.spawn_interval, self.waves)
+
+    # --- Binary format ---
+    def to_bytes(self):
+        # Keys keep their order: weighted meteor types are drawn in file order
+        waves = b"" if self.waves is None else json.dumps(self.waves).encode("utf-8")
+        parts = [HEADER.pack(MAGIC, VERSION, self.seed, self.spawn_interval), WAVES.pack(len(waves)), waves]
+        parts.extend(CLICK.pack(*click) for click in self.clicks)
+        parts.append(FOOTER.pack(END, self.ticks, self.score, self.game_over))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size + FOOTER.size:
+            raise ValueError("replay is truncated")
+        magic, version, seed, spawn_interval = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a replay file")
+        if version not in (1, VERSION):
+            raise ValueError(f"unsupported replay version {version}")
+        start, waves = HEADER.size, None
+        if version >= 2:
+            if len(data) < start + WAVES.size + FOOTER.size:
+                raise ValueError("replay is truncated")
+            (length,) = WAVES.unpack_from(data, start)
+            start += WAVES.size
+            if length:
+                waves = json.loads(data[start:start + length].decode("utf-8"))
+            start += length
+        end, ticks, score, game_over = FOOTER.unpack_from(data, len(data) - FOOTER.size)
+        body = data[start:len(data) - FOOTER.size]
+        if end != END or len(body) % CLICK.size:
+            raise ValueError("replay is truncated or corrupt")
+        return cls(seed, spawn_interval, CLICK.iter_unpack(body), ticks, score, game_over, waves)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def int64(text):
+    """argparse type for --seed: an int that fits a replay header."""
+    value = int(text)
+    if not SEED_RANGE[0] <= value < SEED_RANGE[1]:
+        raise argparse.ArgumentTypeError(f"seed must be between -2**63 and 2**63 - 1, got {value}")
+    return value
+
+
+def numbered_path(path, number):
+    """path with number before its extension: last.mmr, 2 -> last-2.mmr."""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}-{number}{ext}"
+
+
+def play(replay):
+    """Run the recorded game headlessly; returns the final GameState."""
+    state = replay.new_state()
+    clicks = replay.clicks
+    i = 0
+    while state.ticks < replay.ticks and not state.game_over:
+        tick = state.ticks + 1
+        j = i
+        while j < len(clicks) and clicks[j][0] == tick:
+            j += 1
+        state.tick([(x, y) for _, x, y in clicks[i:j]])
+        i = j
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play Game Mode replays headlessly and check their scores")
+    parser.add_argument("replays", nargs="+", help="replay files (from Game_Mode.py --record)")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for path in args.replays:
+        replay = Replay.load(path)
+        start = time.perf_counter()
+        state = play(replay)
+        elapsed = time.perf_counter() - start
+        ok = (state.ticks, state.score, state.game_over) == (replay.ticks, replay.score, replay.game_over)
+        failed += not ok
+        print(f"{path}: seed {replay.seed}, {len(replay.clicks)} clicks, {state.ticks} ticks, "
+              f"score {state.score} (recorded {replay.score}), "
+              f"{state.ticks / max(elapsed, 1e-9):,.0f} ticks/s  {'OK' if ok else 'MISMATCH'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""Both modes as scenes of one long-lived pygame process.
+
+Launching a mode as a new interpreter pays for Python, pygame and asset
+loading on every launch. Here the Game Mode screens and Exploration Mode
+run as scenes of one process instead: fonts, images and the impact grid
+are loaded once (see assets), and switching mode reuses the window.
+
+A scene is a function that takes the SceneManager, runs until its screen is
+done and returns the name of the next scene (None when there is none).
+Closing the window or pressing Quit ends the scene. A process started with
+--listen then hides the window and waits for the next command; otherwise it
+exits.
+
+Commands come over HTTP on localhost (from the Streamlit hub):
+
+    POST /scene/<name>   show scene name, interrupting the current one
+    GET  /status         {"scene": the scene showing, or null}
+    POST /quit           end the process
+
+    python scenes.py exploration
+    python scenes.py game_menu --listen 8766
+"""
+import argparse
+import json
+import queue
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pygame
+
+from replay import int64
+
+DEFAULT_PORT = 8766
+QUIT = "quit"   # request that ends SceneManager.run
+
+
+# --- Scenes ---
+def game_menu(manager):
+    import Game_Mode
+    try:
+        Game_Mode.start_screen()
+    except Game_Mode.QuitGame:
+        return None
+    return "game"
+
+
+def game(manager):
+    import Game_Mode
+    try:
+        manager.score = Game_Mode.run_game(manager.seed)
+    except Game_Mode.QuitGame:
+        return None
+    return "game_over"
+
+
+def game_over(manager):
+    import Game_Mode
+    try:
+        Game_Mode.game_over_screen(manager.score)
+    except Game_Mode.QuitGame:
+        return None
+    return "game_menu"
+
+
+def exploration(manager):
+    import Exploration_Mode
+    # Hold one mode's Earth frames at a time, not both
+    game_mode = sys.modules.get("Game_Mode")
+    if game_mode is not None:
+        game_mode.free_caches()
+    Exploration_Mode.main()
+    return None
+
+
+SCENES = {"game_menu": game_menu, "game": game, "game_over": game_over, "exploration": exploration}
+
+
+class SceneManager:
+    """Runs scenes one after another; request() switches from any thread."""
+
+    def __init__(self, scenes=SCENES, seed=None):
+        self.scenes = scenes
+        self.seed = seed        # Game Mode meteors (random if None)
+        self.score = 0          # last Game Mode score, for game_over
+        self.current = None     # name of the scene running
+        self.requests = queue.Queue()
+        # request() posts its QUIT event and run() clears stale ones under
+        # this lock, so an interrupt never lands in the following scene
+        self.lock = threading.Lock()
+
+    def request(self, name):
+        """Show scene name (or QUIT) next, ending the current scene now."""
+        if name != QUIT and name not in self.scenes:
+            raise KeyError(f"no scene {name!r}")
+        with self.lock:
+            self.requests.put(name)
+            if self.current is not None:
+                pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    def run(self, first=None, wait=False):
+        """Run scenes from first until there is none to show.
+
+        With wait, the window is closed and the manager waits for a
+        request instead of returning; only a QUIT request ends it.
+        """
+        name = first
+        while True:
+            with self.lock:
+                self.current = None
+                if pygame.display.get_init():
+                    pygame.event.clear(pygame.QUIT)
+                try:
+                    name = self.requests.get_nowait()    # a request beats the scene's own next
+                except queue.Empty:
+                    pass
+            if name is None:
+                if not wait:
+                    return
+                if pygame.display.get_init():
+                    pygame.display.quit()
+                name = self.requests.get()
+            if name == QUIT:
+                return
+            with self.lock:
+                self.current = name
+            name = self.scenes[name](self)
+
+
+# --- Control server ---
+class ControlHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/status":
+            return self._send(200, {"scene": self.server.manager.current})
+        self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        manager = self.server.manager
+        if self.path == "/quit":
+            manager.request(QUIT)
+            return self._send(202, {"scene": None})
+        if self.path.startswith("/scene/"):
+            name = self.path[len("/scene/"):]
+            try:
+                manager.request(name)
+            except KeyError as e:
+                return self._send(404, {"error": e.args[0]})
+            return self._send(202, {"scene": name})
+        self._send(404, {"error": "not found"})
+
+
+def start_control_server(manager, port=DEFAULT_PORT):
+    """Serve manager's commands on localhost on a daemon thread; returns the server."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), ControlHandler)
+    server.daemon_threads = True
+    server.manager = manager
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the game modes as scenes of one process")
+    parser.add_argument("scene", nargs="?", choices=SCENES, help="scene to show first (default game_menu, "
+                                                                 "or none with --listen)")
+    parser.add_argument("--listen", type=int, nargs="?", const=DEFAULT_PORT, metavar="PORT",
+                        help=f"take commands on this localhost port (default {DEFAULT_PORT}) and stay running")
+    parser.add_argument("--seed", type=int64, help="play the same meteors every game")
+    args = parser.parse_args(argv)
+
+    manager = SceneManager(seed=args.seed)
+    server = None
+    if args.listen is not None:
+        try:
+            server = start_control_server(manager, args.listen)
+        except OSError as e:
+            print(f"Could not listen on port {args.listen}: {e}")
+            return 1
+    try:
+        manager.run(args.scene or (None if server else "game_menu"), wait=server is not None)
+    finally:
+        if server is not None:
+            server.shutdown()
+        pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
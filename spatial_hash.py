@@ -0,0 +1,114 @@
+"""Uniform-grid spatial hash over point sets held in NumPy arrays.
+
+Items are ids 0..n-1 (indices into parallel x/y arrays, as in MeteorStore).
+The grid keeps the ids sorted by cell key; the cells of item i's
+neighbourhood are then contiguous runs found with searchsorted.
+
+update() is incremental: it starts from the previous order, with ids that
+no longer exist dropped and new ids appended, so the stable sort sees
+nearly sorted input (only the items that crossed a cell boundary are out of
+place) and runs in close to linear time.
+
+Queries assume cell_size is at least the largest radius (points) or the
+largest sum of two radii (pairs), so only neighbouring cells can hold hits.
+"""
+import numpy as np
+
+# Cell coordinates are offset and packed into one int64 key
+_OFFSET = 1 << 20
+_STRIDE = 1 << 21
+_HALF_NEIGHBOURS = ((1, -1), (1, 0), (1, 1), (0, 1))
+# The 3x3 block of cells around a cell, as column vectors of offsets
+_BLOCK_DX = np.repeat(np.arange(-1, 2), 3)[:, None]
+_BLOCK_DY = np.tile(np.arange(-1, 2), 3)[:, None]
+
+
+class SpatialHash:
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.order = np.empty(0, np.intp)      # ids sorted by cell key
+        self.sorted_keys = np.empty(0, np.int64)
+        self.keys = np.empty(0, np.int64)      # cell key of each id
+
+    def __len__(self):
+        return len(self.order)
+
+    def _cells(self, x, y):
+        return ((np.asarray(x) // self.cell_size).astype(np.int64),
+                (np.asarray(y) // self.cell_size).astype(np.int64))
+
+    @staticmethod
+    def _key(cx, cy):
+        return (cx + _OFFSET) * _STRIDE + (cy + _OFFSET)
+
+    def update(self, x, y):
+        """Re-hash items 0..len(x)-1 at their current positions."""
+        n = len(x)
+        self.keys = self._key(*self._cells(x, y))
+        order = self.order
+        if len(order) != n or (n and order.max() >= n):
+            order = order[order < n]
+            present = np.zeros(n, bool)
+            present[order] = True
+            order = np.concatenate([order, np.flatnonzero(~present)])
+        order = order[np.argsort(self.keys[order], kind="stable")]
+        self.order = order
+        self.sorted_keys = self.keys[order]
+
+    def _ids_in(self, keys):
+        """Ids in the cells with the given keys, and the key index each came from."""
+        lo = np.searchsorted(self.sorted_keys, keys, side="left")
+        hi = np.searchsorted(self.sorted_keys, keys, side="right")
+        counts = hi - lo
+        total = counts.sum()
+        source = np.repeat(np.arange(len(keys)), counts)
+        # Position within each run: 0, 1, ... counts[k] - 1
+        within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return self.order[lo[source] + within], source
+
+    def query_point(self, px, py, x, y, radius):
+        """Ids whose circle contains (px, py), topmost (highest id) first."""
+        if not len(self.order):
+            return self.order
+        cx, cy = self._cells(px, py)
+        ids, _ = self._ids_in(self._key(cx + _BLOCK_DX[:, 0], cy + _BLOCK_DY[:, 0]))
+        ids = ids[(x[ids] - px) ** 2 + (y[ids] - py) ** 2 < radius[ids] ** 2]
+        return np.sort(ids)[::-1]
+
+    def pairs(self, x, y, radius):
+        """(first, second) id arrays of every pair of overlapping circles."""
+        if len(self.order) < 2:
+            return np.empty(0, np.intp), np.empty(0, np.intp)
+        # Same cell: each run against itself, keeping each pair once
+        first, second = [], []
+        ids, source = self._ids_in(self.sorted_keys)
+        mine = self.order[source]
+        once = mine < ids
+        first.append(mine[once])
+        second.append(ids[once])
+        # Neighbouring cells: half of them, so every pair of cells is seen once
+        cx, cy = np.divmod(self.sorted_keys, _STRIDE)
+        for dx, dy in _HALF_NEIGHBOURS:
+            ids, source = self._ids_in(self._key(cx - _OFFSET + dx, cy - _OFFSET + dy))
+            first.append(self.order[source])
+            second.append(ids)
+        first, second = np.concatenate(first), np.concatenate(second)
+        touching = (x[first] - x[second]) ** 2 + (y[first] - y[second]) ** 2 < (radius[first] + radius[second]) ** 2
+        return first[touching], second[touching]
+
+    def overlapping(self, ids, x, y, radius):
+        """(first, second) pairs of overlapping circles with first in ids.
+
+        Cheaper than pairs() when only a few items matter (each is checked
+        against its 3x3 block of cells). A pair of two items both in ids is
+        returned both ways round.
+        """
+        ids = np.asarray(ids, np.intp)
+        if not len(ids) or not len(self.order):
+            return np.empty(0, np.intp), np.empty(0, np.intp)
+        cx, cy = self._cells(x[ids], y[ids])
+        second, source = self._ids_in(self._key(cx + _BLOCK_DX, cy + _BLOCK_DY).ravel())
+        first = np.tile(ids, 9)[source]
+        touching = ((first != second) & ((x[first] - x[second]) ** 2 + (y[first] - y[second]) ** 2
+                                         < (radius[first] + radius[second]) ** 2))
+        return first[touching], second[touching]
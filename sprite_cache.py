@@ -0,0 +1,174 @@
+"""Pre-rendered rotation frames for sprites that spin every frame.
+
+Rotating a large image with pygame.transform.rotate (and masking the result)
+allocates and fills fresh surfaces every frame. RotationCache renders each
+angle once, into a surface of fixed size, and afterwards drawing is a single
+blit of a stored frame. SpriteAtlas does the same for small sprites shown at
+a few sizes (meteors), keeping the whole rotated frame, and hands back
+(surface, position) items for drawing many of them with Surface.blits.
+An atlas made with colorkey=True stores opaque, colour-keyed frames (hard
+edges, RLE-accelerated) instead of per-pixel alpha: blending is what makes
+thousands of overlapping sprites expensive, and such frames skip it.
+
+Frames are rendered lazily the first time an angle is shown (or all at once
+with prerender()). The angular step is widened if the full set of frames
+would not fit in max_bytes, with a warning giving the step actually used
+(a 350 x 350 globe at 0.2 degrees would need about 880 MB). clear() drops
+the frames, e.g. while another mode holds its own.
+"""
+import numpy as np
+import pygame
+
+DEFAULT_STEP = 0.2                   # degrees between stored frames
+DEFAULT_MAX_BYTES = 160 * 1024 ** 2  # per cache
+DEFAULT_ATLAS_STEPS = 120            # rotation frames per atlas size
+COLORKEY = (255, 0, 255)             # transparent colour of colour-keyed frames
+COLORKEY_ALPHA = 128                 # pixels at least this opaque are kept
+
+
+class RotationCache:
+    """Rotated copies of a sprite about its center.
+
+    mask     optional surface the size of the image, multiplied into every
+             frame (BLEND_RGBA_MULT), e.g. a white disc to keep a globe round
+    clip     optional Rect (in image coordinates) of the part that is ever
+             visible; only that part is stored
+    """
+
+    def __init__(self, image, step=DEFAULT_STEP, mask=None, clip=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.image = image
+        self.mask = mask
+        self.clip = pygame.Rect(clip) if clip is not None else image.get_rect()
+        self.frame_bytes = self.clip.width * self.clip.height * 4
+        count = max(1, round(360 / step))
+        if count * self.frame_bytes > max_bytes:
+            needed = count * self.frame_bytes
+            count = max(1, max_bytes // self.frame_bytes)
+            print(f"Warning: {self.clip.width}x{self.clip.height} rotation frames are {360 / count:.2f} degrees "
+                  f"apart, not {step}: {step} would need {needed / 1024 ** 2:.0f} MB "
+                  f"(max_bytes is {max_bytes / 1024 ** 2:.0f} MB)")
+        self.count = count
+        self.step = 360 / count
+        self.frames = [None] * count
+        self.rendered = 0
+
+    @property
+    def nbytes(self):
+        return self.rendered * self.frame_bytes
+
+    def index(self, angle):
+        return int(round(angle / self.step)) % self.count
+
+    def _render(self, i):
+        width, height = self.image.get_size()
+        rotated = pygame.transform.rotate(self.image, i * self.step)
+        frame = pygame.Surface(self.clip.size, pygame.SRCALPHA)
+        frame.blit(rotated, rotated.get_rect(center=(width // 2 - self.clip.x, height // 2 - self.clip.y)))
+        if self.mask is not None:
+            frame.blit(self.mask, (-self.clip.x, -self.clip.y), special_flags=pygame.BLEND_RGBA_MULT)
+        if pygame.display.get_surface() is not None:
+            frame = frame.convert_alpha()
+        self.frames[i] = frame
+        self.rendered += 1
+        return frame
+
+    def frame(self, angle):
+        i = self.index(angle)
+        return self.frames[i] or self._render(i)
+
+    def prerender(self):
+        for i in range(self.count):
+            if self.frames[i] is None:
+                self._render(i)
+
+    def clear(self):
+        """Drop every rendered frame; they are rendered again when next shown."""
+        self.frames = [None] * self.count
+        self.rendered = 0
+
+    def blit(self, dest, angle, center):
+        """Draw the sprite rotated by angle with its center at center."""
+        width, height = self.image.get_size()
+        return dest.blit(self.frame(angle), (center[0] - width // 2 + self.clip.x,
+                                             center[1] - height // 2 + self.clip.y))
+
+
+class SpriteAtlas:
+    """An image scaled to size x size for each of sizes, at steps rotations.
+
+    Each frame is as big as pygame.transform.rotate makes it (the corners
+    are kept), and is drawn centred on the sprite's position. With colorkey,
+    pixels less than COLORKEY_ALPHA opaque become transparent and the rest
+    opaque.
+    """
+
+    def __init__(self, image, sizes, steps=DEFAULT_ATLAS_STEPS, colorkey=False):
+        self.image = image
+        self.sizes = tuple(sorted(set(sizes)))
+        self.steps = steps
+        self.colorkey = colorkey
+        self.step = 360 / steps
+        self.frames = np.empty((len(self.sizes), steps), dtype=object)
+        self.offsets = np.zeros((len(self.sizes), steps, 2), np.int32)  # frame centre
+        self.scaled = [None] * len(self.sizes)
+        self.rendered = 0
+
+    def _render(self, s, a):
+        if self.scaled[s] is None:
+            size = self.sizes[s]
+            self.scaled[s] = pygame.transform.smoothscale(self.image, (size, size))
+        frame = pygame.transform.rotate(self.scaled[s], a * self.step)
+        if self.colorkey:
+            frame = _colorkeyed(frame)
+        elif pygame.display.get_surface() is not None:
+            frame = frame.convert_alpha()
+        self.frames[s, a] = frame
+        self.offsets[s, a] = (frame.get_width() // 2, frame.get_height() // 2)
+        self.rendered += 1
+        return frame
+
+    def prerender(self):
+        for s in range(len(self.sizes)):
+            for a in range(self.steps):
+                if self.frames[s, a] is None:
+                    self._render(s, a)
+
+    def _indices(self, sizes, angles):
+        s = np.searchsorted(self.sizes, sizes)
+        a = np.rint(np.asarray(angles) / self.step).astype(np.intp) % self.steps
+        return s, a
+
+    def frame(self, size, angle):
+        s, a = self._indices(size, angle)
+        return self.frames[s, a] or self._render(s, a)
+
+    def blit(self, dest, size, angle, center):
+        """Draw one sprite centred on center."""
+        frame = self.frame(size, angle)
+        return dest.blit(frame, frame.get_rect(center=(int(center[0]), int(center[1]))))
+
+    def items(self, sizes, angles, x, y):
+        """(frame, topleft) for each sprite, ready for Surface.blits.
+
+        sizes must be sizes the atlas holds; angles are in degrees and x, y
+        the sprite centres (all arrays of the same length).
+        """
+        s, a = self._indices(sizes, angles)
+        if self.rendered < self.frames.size:
+            for i, j in {(i, j) for i, j in zip(s.tolist(), a.tolist()) if self.frames[i, j] is None}:
+                self._render(i, j)
+        offsets = self.offsets[s, a]
+        left = (np.asarray(x) - offsets[:, 0]).astype(np.int32).tolist()
+        top = (np.asarray(y) - offsets[:, 1]).astype(np.int32).tolist()
+        return zip(self.frames[s, a].tolist(), zip(left, top))
+
+
+def _colorkeyed(frame):
+    """An opaque copy of frame, with its (nearly) transparent pixels keyed out."""
+    rgb = pygame.surfarray.array3d(frame)
+    rgb[pygame.surfarray.array_alpha(frame) < COLORKEY_ALPHA] = COLORKEY
+    opaque = pygame.surfarray.make_surface(rgb)
+    if pygame.display.get_surface() is not None:
+        opaque = opaque.convert()
+    opaque.set_colorkey(COLORKEY, pygame.RLEACCEL)
+    return opaque
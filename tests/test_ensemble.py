@@ -0,0 +1,53 @@
+import threading
+
+import numpy as np
+import pytest
+
+from ensemble import run_ensemble
+from impact_model import simulate_impacts
+
+SCENARIO = (500, 25, 45, "Rock", "Land")
+
+
+def test_sample_count_and_band_order():
+    bands = run_ensemble(*SCENARIO, n_samples=25_000, chunk_size=10_000, workers=1, seed=0)
+    assert bands["n"] == 25_000
+    for key in ("energy", "effective_energy", "crater"):
+        band = bands[key]
+        values = [band["min"]] + [band["percentiles"][q] for q in sorted(band["percentiles"])] + [band["max"]]
+        assert values == sorted(values)
+        assert band["min"] <= band["mean"] <= band["max"]
+
+
+def test_zero_spread_is_the_exact_result():
+    spread = {"diameter": 0, "velocity": 0, "angle": 0}
+    bands = run_ensemble(*SCENARIO, n_samples=1000, spread=spread, workers=1, seed=0)
+    exact = simulate_impacts(*SCENARIO)
+    for key in ("energy", "effective_energy", "crater"):
+        assert bands[key]["mean"] == pytest.approx(float(exact[key]))
+        assert bands[key]["percentiles"][50] == pytest.approx(float(exact[key]), rel=1e-3)
+
+
+def test_result_does_not_depend_on_worker_count():
+    serial = run_ensemble(*SCENARIO, n_samples=20_000, chunk_size=5_000, workers=1, seed=3)
+    pooled = run_ensemble(*SCENARIO, n_samples=20_000, chunk_size=5_000, workers=2, seed=3)
+    assert serial == pooled
+
+
+def test_mixed_materials_and_locations():
+    bands = run_ensemble(500, 25, 45, {"Iron": 0.5, "Ice": 0.5}, {"Land": 0.25, "Ocean": 0.75},
+                         n_samples=10_000, workers=1, seed=0)
+    assert bands["n"] == 10_000
+    assert bands["crater"]["min"] == 0      # ocean impacts leave no crater
+    assert np.isfinite(bands["crater"]["max"])
+
+
+def test_cancelled_run_returns_none():
+    cancel = threading.Event()
+    cancel.set()
+    assert run_ensemble(*SCENARIO, n_samples=10_000, workers=1, cancel=cancel) is None
+
+
+def test_bad_sample_count():
+    with pytest.raises(ValueError, match="n_samples"):
+        run_ensemble(*SCENARIO, n_samples=0)
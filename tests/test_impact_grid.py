@@ -0,0 +1,40 @@
+import math
+
+import numpy as np
+import pytest
+
+from impact_grid import DIAMETER_RANGE, LOCATIONS, MATERIALS, VELOCITY_RANGE, ImpactGrid
+from impact_model import simulate_impacts
+
+
+@pytest.fixture(scope="module")
+def grid():
+    return ImpactGrid.build()
+
+
+def test_lookup_is_close_to_the_exact_model(grid):
+    rng = np.random.default_rng(0)
+    worst = {}
+    for _ in range(2000):
+        scenario = (float(np.exp(rng.uniform(*np.log(DIAMETER_RANGE)))), float(rng.uniform(*VELOCITY_RANGE)),
+                    float(rng.uniform(0, 90)), str(rng.choice(MATERIALS)), str(rng.choice(LOCATIONS)))
+        looked_up, exact = grid.lookup(*scenario), simulate_impacts(*scenario)
+        for key, value in looked_up.items():
+            if exact[key]:
+                worst[key] = max(worst.get(key, 0), abs(value / float(exact[key]) - 1))
+    assert worst["mass"] < 1e-12 and worst["energy"] < 1e-12
+    assert worst["effective_energy"] < 5e-4
+    assert worst["crater"] < 1e-4
+
+
+def test_lookup_is_exact_on_grid_nodes(grid):
+    for angle in (0, 90):
+        looked_up = grid.lookup(DIAMETER_RANGE[0], VELOCITY_RANGE[1], angle, "Iron", "Land")
+        exact = simulate_impacts(DIAMETER_RANGE[0], VELOCITY_RANGE[1], angle, "Iron", "Land")
+        for key, value in looked_up.items():
+            assert value == pytest.approx(float(exact[key]), rel=1e-9, abs=1e-12)
+
+
+def test_ocean_has_no_crater(grid):
+    assert grid.lookup(1000, 20, 45, "Rock", "Ocean")["crater"] == 0
+    assert math.isfinite(grid.lookup(1000, 20, 45, "Rock", "Land")["crater"])
@@ -0,0 +1,133 @@
+import math
+
+import numpy as np
+import pytest
+
+import impact_model
+from impact_model import (RISK_MESSAGES, assess_risks, calculate_mass, estimate_crater_size, impact_energy,
+                          risk_flags, simulate_impacts)
+
+MATERIALS = ("Iron", "Rock", "Ice", "Unobtainium")
+LOCATIONS = ("Land", "Ocean")
+
+
+# --- The original Exploration Mode formulas, kept as the reference ---
+def baseline_mass(diameter, material):
+    radius = diameter / 2
+    volume = (4/3) * math.pi * (radius**3)
+    density = {"Iron": 7800, "Rock": 3000, "Ice": 900}.get(material, 3000)
+    return volume * density
+
+
+def baseline_energy(diameter, velocity, material):
+    mass = baseline_mass(diameter, material)
+    velocity_m_s = velocity * 1000
+    energy_joules = 0.5 * mass * (velocity_m_s**2)
+    return energy_joules / 4.184e9
+
+
+def baseline_crater(diameter, velocity, angle, material, location):
+    energy = baseline_energy(diameter, velocity, material)
+    angle_factor = math.sin(math.radians(angle))
+    effective_energy = energy * angle_factor
+    crater_diameter = (effective_energy ** (1/4)) * 1.2 if location == "Land" else 0
+    return crater_diameter, effective_energy
+
+
+def baseline_risks(diameter, velocity, angle, material, location):
+    energy = baseline_energy(diameter, velocity, material)
+    risks = []
+    if energy > 5000:
+        risks.append(RISK_MESSAGES["climate"])
+    if energy > 1000:
+        risks.append(RISK_MESSAGES["fires"])
+    if location == "Ocean" and diameter > 100:
+        risks.append(RISK_MESSAGES["tsunami"])
+    if location == "Land":
+        if angle < 20:
+            risks.append(RISK_MESSAGES["shallow"])
+        if angle > 70 and energy > 50:
+            risks.append(RISK_MESSAGES["steep"])
+    if not risks:
+        risks.append(RISK_MESSAGES["localized"])
+    return risks
+
+
+def scenarios(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        yield (float(np.exp(rng.uniform(math.log(1), math.log(20000)))), float(rng.uniform(1, 80)),
+               float(rng.uniform(0, 90)), str(rng.choice(MATERIALS)), str(rng.choice(LOCATIONS)))
+
+
+# Inputs right on the risk thresholds
+EDGE_CASES = [
+    (100, 20, 20, "Rock", "Ocean"),
+    (100.0001, 20, 20, "Rock", "Ocean"),
+    (500, 20, 70, "Rock", "Land"),
+    (500, 20, 70.0001, "Rock", "Land"),
+    (10, 5, 0, "Ice", "Land"),
+    (10, 5, 90, "Ice", "Ocean"),
+]
+
+
+@pytest.mark.parametrize("scenario", list(scenarios(200)) + EDGE_CASES)
+def test_scalar_functions_match_baseline(scenario):
+    diameter, velocity, angle, material, location = scenario
+    assert calculate_mass(diameter, material) == pytest.approx(baseline_mass(diameter, material), rel=1e-12)
+    assert impact_energy(diameter, velocity, material) == pytest.approx(
+        baseline_energy(diameter, velocity, material), rel=1e-12)
+    crater, effective = estimate_crater_size(*scenario)
+    expected_crater, expected_effective = baseline_crater(*scenario)
+    assert crater == pytest.approx(expected_crater, rel=1e-12)
+    assert effective == pytest.approx(expected_effective, rel=1e-12)
+    assert assess_risks(*scenario) == baseline_risks(*scenario)
+
+
+def test_scalar_functions_match_batch_engine():
+    rows = list(scenarios())
+    columns = [np.array(column) for column in zip(*rows)]
+    batch = simulate_impacts(*columns)
+    for i, row in enumerate(rows):
+        diameter, velocity, angle, material, location = row
+        assert calculate_mass(diameter, material) == pytest.approx(batch["mass"][i], rel=1e-12)
+        assert impact_energy(diameter, velocity, material) == pytest.approx(batch["energy"][i], rel=1e-12)
+        crater, effective = estimate_crater_size(*row)
+        assert crater == pytest.approx(batch["crater"][i], rel=1e-12)
+        assert effective == pytest.approx(batch["effective_energy"][i], rel=1e-12)
+
+
+def test_scalar_crater_with_entry_matches_batch_engine():
+    for row in list(scenarios(50, seed=1)):
+        crater, effective = estimate_crater_size(*row, entry=True)
+        batch = simulate_impacts(*row, entry=True)
+        assert crater == pytest.approx(float(batch["crater"]), rel=1e-12)
+        assert effective == pytest.approx(float(batch["effective_energy"]), rel=1e-12)
+
+
+def test_risk_flags_match_baseline_messages():
+    rows = list(scenarios()) + EDGE_CASES
+    diameter, velocity, angle, material, location = (np.array(column) for column in zip(*rows))
+    energy = simulate_impacts(diameter, velocity, angle, material, location)["energy"]
+    flags = risk_flags(diameter, angle, location, energy)
+    for i, row in enumerate(rows):
+        messages = [RISK_MESSAGES[code] for code in RISK_MESSAGES if flags[code][i]]
+        assert messages == baseline_risks(*row)
+
+
+def test_risk_flags_accept_a_land_mask():
+    diameter, angle, energy = np.array([150, 150]), np.array([10, 10]), np.array([10, 10])
+    by_name = risk_flags(diameter, angle, np.array(["Land", "Ocean"]), energy)
+    by_mask = risk_flags(diameter, angle, np.array([True, False]), energy)
+    for code in RISK_MESSAGES:
+        assert by_name[code].tolist() == by_mask[code].tolist()
+
+
+def test_assess_risks_reuses_given_energy():
+    energy = impact_energy(300, 20, "Iron")
+    assert assess_risks(300, 20, 45, "Iron", "Land", energy=energy) == assess_risks(300, 20, 45, "Iron", "Land")
+
+
+def test_unknown_material_uses_default_density():
+    assert impact_model.material_densities("Unobtainium") == impact_model.DEFAULT_DENSITY
+    assert calculate_mass(10, "Unobtainium") == calculate_mass(10, "Rock")
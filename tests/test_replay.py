@@ -0,0 +1,106 @@
+import argparse
+import os
+
+import pytest
+
+import replay
+from game_sim import GameState
+from replay import HEADER, MAGIC, Replay, int64, numbered_path, play
+from waves import load_waves
+
+WEIGHTED_WAVES = {"waves": [{"every": 0.4, "types": {"big": 1, "small": 3, "medium": 2}, "speed": [2, 3]}]}
+
+
+def record_game(seed, waves=None, max_ticks=3000):
+    """Play a game, clicking the newest meteor every 20 ticks; returns (replay, final state)."""
+    state = GameState(seed, waves=waves)
+    recording = Replay.start(state)
+    while state.ticks < max_ticks and not state.game_over:
+        meteors = state.meteors
+        clicks = []
+        if state.ticks % 20 == 0 and len(meteors):
+            clicks.append((meteors.x[-1], meteors.y[-1]))
+        recording.record(state.ticks + 1, clicks)
+        state.tick(clicks)
+    recording.finish(state)
+    return recording, state
+
+
+def outcome(state):
+    return state.ticks, state.score, state.game_over
+
+
+@pytest.mark.parametrize("waves", [None, WEIGHTED_WAVES], ids=["classic", "weighted"])
+def test_save_load_play_round_trip(tmp_path, waves):
+    recording, state = record_game(1234, waves)
+    assert recording.clicks and state.score > 0
+    path = tmp_path / "game.mmr"
+    recording.save(path)
+
+    loaded = Replay.load(path)
+    assert (loaded.seed, loaded.spawn_interval, loaded.waves) == (recording.seed, recording.spawn_interval, waves)
+    assert [tuple(click) for click in loaded.clicks] == recording.clicks
+    assert outcome(play(loaded)) == outcome(state) == (loaded.ticks, loaded.score, loaded.game_over)
+
+
+def test_weighted_types_keep_their_order():
+    loaded = Replay.from_bytes(Replay(5, waves=WEIGHTED_WAVES).to_bytes())
+    assert list(loaded.waves["waves"][0]["types"]) == ["big", "small", "medium"]
+
+
+def test_wave_file_replays(tmp_path):
+    waves = load_waves(os.path.join(os.path.dirname(replay.__file__), "assets", "waves", "assault.json"))
+    recording, state = record_game(99, waves, max_ticks=1500)
+    path = tmp_path / "assault.mmr"
+    recording.save(path)
+    assert outcome(play(Replay.load(path))) == outcome(state)
+
+
+def test_version_1_files_still_load():
+    recording, state = record_game(42, max_ticks=600)
+    data = recording.to_bytes()
+    # Version 1: the same header and body, without the waves section
+    v1 = HEADER.pack(MAGIC, 1, recording.seed, recording.spawn_interval) + data[HEADER.size + replay.WAVES.size:]
+    loaded = Replay.from_bytes(v1)
+    assert loaded.waves is None
+    assert outcome(play(loaded)) == outcome(state)
+
+
+@pytest.mark.parametrize("seed", [-2 ** 63, 2 ** 63 - 1])
+def test_extreme_seeds_round_trip(seed):
+    assert Replay.from_bytes(Replay(seed).to_bytes()).seed == seed
+
+
+@pytest.mark.parametrize("data, message", [
+    (b"MMRP", "truncated"),
+    (b"XXXX" + bytes(64), "not a replay"),
+    (HEADER.pack(MAGIC, 9, 0, 2.0) + bytes(32), "version 9"),
+])
+def test_bad_files_are_rejected(data, message):
+    with pytest.raises(ValueError, match=message):
+        Replay.from_bytes(data)
+
+
+def test_int64_rejects_seeds_a_replay_cannot_store():
+    assert int64(str(2 ** 63 - 1)) == 2 ** 63 - 1
+    for text in (str(2 ** 63), str(-2 ** 63 - 1)):
+        with pytest.raises(argparse.ArgumentTypeError):
+            int64(text)
+
+
+def test_numbered_path():
+    assert numbered_path("last.mmr", 2) == "last-2.mmr"
+    assert numbered_path("runs/last", 1) == "runs/last-1"
+
+
+def test_cli_reports_mismatch(tmp_path, capsys):
+    recording, _ = record_game(7, max_ticks=600)
+    good, bad = tmp_path / "good.mmr", tmp_path / "bad.mmr"
+    recording.save(good)
+    recording.score += 1
+    recording.save(bad)
+    assert replay.main([str(good)]) == 0
+    assert replay.main([str(good), str(bad)]) == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[-2].startswith(f"{good}: ") and lines[-2].endswith("OK")
+    assert lines[-1].startswith(f"{bad}: ") and lines[-1].endswith("MISMATCH")
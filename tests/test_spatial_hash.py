@@ -0,0 +1,70 @@
+import numpy as np
+
+from spatial_hash import SpatialHash
+
+CELL = 96
+
+
+def random_circles(rng, n):
+    return rng.uniform(-500, 1500, n), rng.uniform(-500, 1000, n), rng.choice([24.0, 36.0, 48.0], n)
+
+
+def brute_pairs(x, y, radius):
+    pairs = set()
+    for i in range(len(x)):
+        for j in range(i + 1, len(x)):
+            if (x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2 < (radius[i] + radius[j]) ** 2:
+                pairs.add((i, j))
+    return pairs
+
+
+def as_set(first, second):
+    return {(min(a, b), max(a, b)) for a, b in zip(first.tolist(), second.tolist())}
+
+
+def test_pairs_match_brute_force_as_items_move_and_go():
+    rng = np.random.default_rng(0)
+    x, y, radius = random_circles(rng, 400)
+    grid = SpatialHash(CELL)
+    for step in range(5):
+        grid.update(x, y)
+        first, second = grid.pairs(x, y, radius)
+        assert len(first) == len(as_set(first, second))     # each pair once
+        assert as_set(first, second) == brute_pairs(x, y, radius)
+        # Move everything a little, drop some items and add others
+        keep = rng.random(len(x)) > 0.1
+        x, y, radius = x[keep] + rng.normal(0, 30, keep.sum()), y[keep] + rng.normal(0, 30, keep.sum()), radius[keep]
+        nx, ny, nr = random_circles(rng, 40)
+        x, y, radius = np.concatenate([x, nx]), np.concatenate([y, ny]), np.concatenate([radius, nr])
+
+
+def test_query_point_matches_brute_force():
+    rng = np.random.default_rng(1)
+    x, y, radius = random_circles(rng, 500)
+    grid = SpatialHash(CELL)
+    grid.update(x, y)
+    for px, py in rng.uniform(-500, 1500, (200, 2)):
+        hits = grid.query_point(px, py, x, y, radius)
+        expected = np.flatnonzero((x - px) ** 2 + (y - py) ** 2 < radius ** 2)[::-1]
+        assert hits.tolist() == expected.tolist()
+
+
+def test_overlapping_matches_pairs_for_chosen_ids():
+    rng = np.random.default_rng(2)
+    x, y, radius = random_circles(rng, 300)
+    grid = SpatialHash(CELL)
+    grid.update(x, y)
+    ids = rng.choice(len(x), 30, replace=False)
+    first, second = grid.overlapping(ids, x, y, radius)
+    assert set(first.tolist()) <= set(ids.tolist())
+    expected = {pair for pair in brute_pairs(x, y, radius) if pair[0] in ids or pair[1] in ids}
+    assert as_set(first, second) == expected
+
+
+def test_empty_grid():
+    grid = SpatialHash(CELL)
+    empty = np.empty(0)
+    grid.update(empty, empty)
+    assert len(grid) == 0
+    assert len(grid.query_point(0, 0, empty, empty, empty)) == 0
+    assert all(len(a) == 0 for a in grid.pairs(empty, empty, empty))
@@ -0,0 +1,56 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+import pytest  # noqa: E402
+
+from impact_model import RISK_MESSAGES  # noqa: E402
+from text_cache import TextCache, wrap_text  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def font():
+    pygame.font.init()
+    return pygame.font.Font(None, 18)
+
+
+def greedy_wrap(text, font, width):
+    """The original wrapper: grow each line a word at a time, measuring the whole line."""
+    lines, line = [], ""
+    for word in text.split(" "):
+        candidate = f"{line}{word} " if word else f"{line} "
+        if line and font.size((line + word).rstrip())[0] >= width:
+            lines.append(line)
+            candidate = f"{word} "
+        line = candidate
+    if line.strip():
+        lines.append(line)
+    return [line.rstrip() for line in lines]
+
+
+@pytest.mark.parametrize("width", [120, 200, 250, 400])
+@pytest.mark.parametrize("code", list(RISK_MESSAGES))
+def test_wrap_matches_greedy_wrapping(font, code, width):
+    text = RISK_MESSAGES[code]
+    lines = wrap_text(text, font, width)
+    assert "".join(lines) == text
+    assert [line.rstrip() for line in lines] == greedy_wrap(text, font, width)
+    assert all(font.size(line.rstrip())[0] < width for line in lines)
+
+
+def test_long_word_is_cut(font):
+    word = "x" * 200
+    lines = wrap_text(f"{word} end", font, 100)
+    assert "".join(lines) == f"{word} end"
+    assert len(lines) > 2
+    assert all(font.size(line.rstrip())[0] < 100 for line in lines)
+
+
+def test_cache_reuses_surfaces(font):
+    cache = TextCache(max_items=2)
+    first = cache.render(font, "hello", (255, 255, 255))
+    assert cache.render(font, "hello", (255, 255, 255)) is first
+    cache.render(font, "a", (255, 255, 255))
+    cache.render(font, "b", (255, 255, 255))
+    assert cache.render(font, "hello", (255, 255, 255)) is not first
@@ -0,0 +1,74 @@
+import json
+import os
+
+import pytest
+
+from game_sim import GameState
+from waves import WaveScheduler, classic, load_waves
+
+WAVES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "waves")
+
+
+def spec(**entry):
+    return {"waves": [entry]}
+
+
+@pytest.mark.parametrize("entry, message", [
+    ({"rate": 1, "max_rate": 0}, "max_rate must be positive"),
+    ({"rate": 1, "max_rate": -2}, "max_rate must be positive"),
+    ({"rate": 1, "rate_ramp": -1}, "rate_ramp must not be negative"),
+    ({"every": "x"}, "every must be a number, got 'x'"),
+    ({"rate": "fast"}, "rate must be a number, got 'fast'"),
+    ({"at": [1]}, "at must be a number"),
+    ({"every": 0}, "every must be positive"),
+    ({"rate": -1}, "rate must be positive"),
+    ({"every": 1, "rate": 1}, "every or rate, not both"),
+    ({"count": 0}, "count must be at least 1"),
+    ({"formation": "circle"}, "unknown formation"),
+    ({"types": ["huge"]}, "unknown meteor type"),
+    ({"types": []}, "at least one meteor type"),
+    ({"speed": [1]}, r"speed is \[min, max\]"),
+])
+def test_bad_waves_are_rejected(entry, message):
+    with pytest.raises(ValueError, match=message):
+        WaveScheduler(spec(**entry))
+
+
+def test_numeric_strings_are_accepted():
+    wave = WaveScheduler(spec(every="0.5", at="2")).waves[0]
+    assert (wave.every, wave.at) == (0.5, 2.0)
+
+
+def test_rate_ramps_up_to_max_rate():
+    wave = WaveScheduler(spec(rate=1, rate_ramp=0.5, max_rate=2)).waves[0]
+    assert wave.interval(0) == 1
+    assert wave.interval(1) == pytest.approx(1 / 1.5)
+    assert wave.interval(100) == 0.5
+
+
+def test_due_fires_in_time_order_until_done():
+    schedule = WaveScheduler({"waves": [{"at": 1, "every": 1, "until": 3}, {"at": 2.5}]})
+    assert [(wave.at, times) for wave, times in schedule.due(2.0)] == [(1.0, 2)]
+    assert [(wave.at, times) for wave, times in schedule.due(10.0)] == [(2.5, 1)]
+    assert schedule.done
+
+
+@pytest.mark.parametrize("name", sorted(os.listdir(WAVES_DIR)))
+def test_shipped_wave_files_load(name):
+    load_waves(os.path.join(WAVES_DIR, name))
+
+
+def test_load_waves_checks_the_file(tmp_path):
+    path = tmp_path / "bad.json"
+    path.write_text(json.dumps(spec(rate=1, max_rate=0)), encoding="utf-8")
+    with pytest.raises(ValueError, match="max_rate"):
+        load_waves(path)
+
+
+def test_classic_waves_are_the_default():
+    default, explicit = GameState(3), GameState(3, waves=classic())
+    for _ in range(3000):
+        default.tick()
+        explicit.tick()
+    assert default.meteors.data[:, :len(default.meteors)].tolist() == \
+        explicit.meteors.data[:, :len(explicit.meteors)].tolist()
@@ -0,0 +1,102 @@
+"""Cached text rendering and word wrapping for pygame fonts.
+
+font.render allocates and rasterises a new surface on every call, and
+measuring growing prefixes to find line breaks costs O(n^2) font.size calls
+per paragraph. TextCache keeps rendered surfaces (LRU, bounded by a byte
+budget) and wrapped layouts, so redrawing unchanged text is just blits.
+"""
+import re
+
+from result_cache import LRUCache
+
+DEFAULT_MAX_BYTES = 16 * 1024 ** 2
+DEFAULT_MAX_ITEMS = 4096
+# Past this fraction of the width, a candidate line is measured exactly
+EXACT_FRACTION = 0.85
+
+# A word with the whitespace after it (or a run of leading whitespace)
+_TOKENS = re.compile(r"\S+\s*|\s+")
+
+
+def wrap_text(text, font, width):
+    """Split text into lines that fit width, breaking at spaces.
+
+    Greedy, in one pass: every word is measured once, and the line width is
+    estimated as the sum of its words. Only near the end of a line (where
+    kerning makes the estimate unreliable) is the candidate line measured
+    exactly, so breaks match measuring the whole line. Lines keep their
+    trailing space, so "".join(lines) == text. A single word wider than the
+    line is cut.
+    """
+    lines = []
+    line, line_width = "", 0
+    for token in _TOKENS.findall(text):
+        word = token.rstrip()
+        word_width = font.size(word)[0] if word else 0
+        if line and line_width + word_width >= width * EXACT_FRACTION:
+            exact = font.size(line + word)[0]
+            if exact >= width:
+                lines.append(line)
+                line, line_width = "", 0
+            else:
+                line_width = exact - word_width
+        if not line and word_width >= width:
+            # A word too wide even for a line of its own: cut it where it
+            # leaves the line. Only the word is measured; the space after
+            # it stays with the last piece
+            space = token[len(word):]
+            while word_width >= width:
+                i = 1
+                while i < len(word) and font.size(word[:i + 1])[0] < width:
+                    i += 1
+                lines.append(word[:i])
+                word = word[i:]
+                word_width = font.size(word)[0] if word else 0
+            token = word + space
+            if not token:
+                continue
+        line += token
+        line_width += font.size(token)[0] if token != word else word_width
+    if line:
+        lines.append(line)
+    return lines
+
+
+def surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+class TextCache:
+    """Rendered text surfaces and wrapped layouts, keyed on font and text."""
+
+    def __init__(self, max_items=DEFAULT_MAX_ITEMS, max_bytes=DEFAULT_MAX_BYTES):
+        self.surfaces = LRUCache(max_items, max_bytes=max_bytes, sizeof=surface_bytes)
+        self.layouts = LRUCache(max_items)
+
+    def render(self, font, text, color, aa=True, background=None):
+        """font.render(text, aa, color[, background]), rendered once.
+
+        With a background, the surface is colour-keyed on it (as the
+        draw_text helpers did). Callers must not draw onto the result.
+        """
+        key = (font, text, tuple(color), aa, None if background is None else tuple(background))
+        surface = self.surfaces.get(key)
+        if surface is None:
+            if background is None:
+                surface = font.render(text, aa, color)
+            else:
+                surface = font.render(text, aa, color, background)
+                surface.set_colorkey(background)
+            self.surfaces.put(key, surface)
+        return surface
+
+    def wrap(self, font, text, width):
+        """wrap_text(text, font, width), computed once per (font, text, width)."""
+        return self.layouts.get_or_compute((font, text, width), lambda: wrap_text(text, font, width))
+
+    def paragraph(self, font, text, color, width, aa=True):
+        """Rendered lines of text wrapped to width."""
+        return [self.render(font, line, color, aa) for line in self.wrap(font, text, width)]
+
+    def stats(self):
+        return {"surfaces": self.surfaces.stats(), "layouts": self.layouts.stats()}
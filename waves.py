@@ -0,0 +1,187 @@
+"""Wave definitions for Game Mode: when meteors spawn, read from JSON.
+
+A wave file is a list of spawn entries. WaveScheduler keeps the next spawn
+time of each entry in a heap (heapq); each tick, due() hands back every
+entry that is due, with how many times it fired since the last tick, so
+rates far above one spawn per tick work. What spawns (positions, sizes,
+speeds, from the game's seeded random.Random) is up to game_sim.
+
+    {
+      "invulnerable": false,
+      "waves": [
+        {"at": 2, "every": 2, "types": ["small", "medium"], "speed": [1, 1.5], "speed_ramp": 0.03},
+        {"at": 20, "every": 10, "count": 6, "types": {"small": 3, "big": 1}},
+        {"at": 45, "formation": "v", "count": 7, "spacing": 70, "types": ["medium"]}
+      ]
+    }
+
+Entry fields (all optional):
+    at          seconds of the first spawn (default 0)
+    every       seconds between spawns, or
+    rate        spawns per second, growing by rate_ramp per second up to
+                max_rate; with neither, the entry fires once
+    until       no spawns at or after this time
+    count       meteors per spawn (default 1)
+    formation   "line" or "v": the count meteors enter together, spacing
+                pixels apart, at one speed (otherwise each is placed alone)
+    x           entry column (random by default)
+    types       sizes to pick from: a list ("small", "medium", "big"; equal
+                odds), a {size: weight} dict, or [[from_seconds, list or
+                dict], ...] to change them over time
+    speed       [min, max] pixels per tick; max grows by speed_ramp per second
+
+"invulnerable": true makes meteors that reach the Earth vanish instead of
+ending the game, for stress runs (assets/waves/swarm.json).
+"""
+import heapq
+import json
+import math
+
+TYPE_NAMES = ("small", "medium", "big")
+FORMATIONS = ("line", "v")
+DEFAULT_SPEED = (1.0, 1.5)
+DEFAULT_SPACING = 60
+
+
+def _parse_types(types):
+    """(names, weights or None) from a list or a {name: weight} dict."""
+    if isinstance(types, dict):
+        names, weights = list(types), [float(w) for w in types.values()]
+    else:
+        names, weights = list(types), None
+    if not names:
+        raise ValueError("a wave needs at least one meteor type")
+    for name in names:
+        if name not in TYPE_NAMES:
+            raise ValueError(f"unknown meteor type {name!r} (expected one of {', '.join(TYPE_NAMES)})")
+    return names, weights
+
+
+def _number(entry, field, default=None):
+    """entry[field] as a float (default if absent); ValueError if not a number."""
+    value = entry.get(field)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be a number, got {value!r}") from None
+
+
+class Wave:
+    """One entry of a wave file."""
+
+    def __init__(self, entry):
+        self.at = _number(entry, "at", 0.0)
+        self.every = _number(entry, "every")
+        self.rate = _number(entry, "rate")
+        self.rate_ramp = _number(entry, "rate_ramp", 0.0)
+        self.max_rate = _number(entry, "max_rate", math.inf)
+        self.until = _number(entry, "until")
+        self.count = int(entry.get("count", 1))
+        self.formation = entry.get("formation")
+        self.spacing = _number(entry, "spacing", DEFAULT_SPACING)
+        self.x = _number(entry, "x")
+        self.speed = tuple(entry.get("speed", DEFAULT_SPEED))
+        self.speed_ramp = _number(entry, "speed_ramp", 0.0)
+        types = entry.get("types", ["small"])
+        if isinstance(types, list) and types and isinstance(types[0], list):
+            # [[from_seconds, types], ...]: later phases win
+            self.phases = sorted((float(start), _parse_types(names)) for start, names in types)
+        else:
+            self.phases = [(-math.inf, _parse_types(types))]
+
+        if self.every is not None and self.rate is not None:
+            raise ValueError("a wave takes every or rate, not both")
+        if self.every is not None and not self.every > 0:
+            raise ValueError(f"every must be positive, got {self.every}")
+        if self.rate is not None and not self.rate > 0:
+            raise ValueError(f"rate must be positive, got {self.rate}")
+        # The interval must stay positive and finite as the rate ramps
+        if not self.rate_ramp >= 0:
+            raise ValueError(f"rate_ramp must not be negative, got {self.rate_ramp}")
+        if not self.max_rate > 0:
+            raise ValueError(f"max_rate must be positive, got {self.max_rate}")
+        if self.count < 1:
+            raise ValueError(f"count must be at least 1, got {self.count}")
+        if self.formation is not None and self.formation not in FORMATIONS:
+            raise ValueError(f"unknown formation {self.formation!r} (expected one of {', '.join(FORMATIONS)})")
+        if len(self.speed) != 2:
+            raise ValueError("speed is [min, max]")
+
+    @property
+    def repeats(self):
+        return self.every is not None or self.rate is not None
+
+    def interval(self, t):
+        """Seconds from a spawn at time t to the next."""
+        if self.every is not None:
+            return self.every
+        return 1 / min(self.rate + self.rate_ramp * t, self.max_rate)
+
+    def types_at(self, t):
+        """(names, weights or None) in effect at time t."""
+        current = self.phases[0][1]
+        for start, types in self.phases:
+            if start > t:
+                break
+            current = types
+        return current
+
+
+class WaveScheduler:
+    """The spawn timeline of one game, built from a wave definition (a dict)."""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.waves = [Wave(entry) for entry in spec.get("waves", [])]
+        self.invulnerable = bool(spec.get("invulnerable", False))
+        # (next spawn time, wave index); the index breaks ties in file order
+        self.heap = [(wave.at, i) for i, wave in enumerate(self.waves)
+                     if wave.until is None or wave.at < wave.until]
+        heapq.heapify(self.heap)
+
+    def due(self, now):
+        """(wave, times fired) for every wave due at or before now, in time order."""
+        heap, fired = self.heap, []
+        while heap and heap[0][0] <= now:
+            t, i = heapq.heappop(heap)
+            wave = self.waves[i]
+            times = 0
+            while t <= now:
+                times += 1
+                t = t + wave.interval(t) if wave.repeats else math.inf
+                if wave.until is not None and t >= wave.until:
+                    t = math.inf
+            fired.append((wave, times))
+            if t != math.inf:
+                heapq.heappush(heap, (t, i))
+        return fired
+
+    @property
+    def done(self):
+        """True once no wave will fire again."""
+        return not self.heap
+
+
+def classic(spawn_interval=2.0):
+    """The original Game Mode rules as a wave definition.
+
+    One meteor every spawn_interval seconds: small only for the first 15 s,
+    then small or medium, and any size from 30 s on, getting faster.
+    """
+    return {"waves": [{
+        "at": spawn_interval,
+        "every": spawn_interval,
+        "types": [[0, ["small"]], [15, ["small", "medium"]], [30, ["small", "medium", "big"]]],
+        "speed": [1, 1.5],
+        "speed_ramp": 0.03,
+    }]}
+
+
+def load_waves(path):
+    """Read and check a wave file; returns the definition dict."""
+    with open(path, encoding="utf-8") as f:
+        spec = json.load(f)
+    WaveScheduler(spec)     # raises ValueError if anything is off
+    return spec